@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark Whisper inference configurations on the deployed Modal app.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path so we can import our package
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from podcast_transcription.config import supported_whisper_models
+from podcast_transcription.modal_client import (
+    BATCH_SIZE,
+    CHUNK_LENGTH_S,
+    DEFAULT_MODEL_NAME,
+    GPU_CONFIG,
+    benchmark_remote,
+    check_ready,
+    ping_model,
+)
+
+DEFAULT_AUDIO_URL = "https://pub-ebe9e51393584bf5b5bea84a67b343c2.r2.dev/examples_english_english.wav"
+
+
+def parse_config(value: str) -> dict:
+    """
+    'CHUNK:BATCH[:vad]', eg. '30:16' or '30:16:vad'. A chunk length of 0 means
+    sequential long-form decoding; ':vad' only transcribes detected speech.
+    """
+    parts = value.split(":")
+    vad = parts[2:] == ["vad"]
+    if vad:
+        parts.pop()
+    try:
+        chunk_length_s, batch_size = (int(part) for part in parts)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected CHUNK:BATCH[:vad], eg. 30:16, got '{value}'") from None
+    return {"chunk_length_s": chunk_length_s, "batch_size": batch_size, "vad": vad}
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(
+        description="Report the real-time factor (inference time / audio duration) of inference configs",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s
+  %(prog)s --audio-url https://example.com/episode.mp3 --config 0:1 --config 30:8 --config 30:32
+  %(prog)s --audio-url https://example.com/episode.mp3 --config 30:32 --config 30:32:vad
+        """
+    )
+    parser.add_argument(
+        "--audio-url",
+        default=DEFAULT_AUDIO_URL,
+        help="Audio to transcribe; use a long episode for representative numbers"
+    )
+    parser.add_argument(
+        "--config", "-c",
+        dest="configs",
+        action="append",
+        type=parse_config,
+        help=f"CHUNK:BATCH[:vad] to benchmark, repeatable (default: 0:1, {CHUNK_LENGTH_S}:8 and "
+             f"{CHUNK_LENGTH_S}:{BATCH_SIZE}, the {GPU_CONFIG} default)"
+    )
+    parser.add_argument(
+        "--model", "-m",
+        choices=list(supported_whisper_models),
+        default=DEFAULT_MODEL_NAME,
+        help=f"Whisper model to benchmark (default: {DEFAULT_MODEL_NAME})"
+    )
+    parser.add_argument(
+        "--language", "-l",
+        default="en",
+        help="Language code for transcription (default: en)"
+    )
+    args = parser.parse_args()
+    configs = args.configs or [
+        {"chunk_length_s": 0, "batch_size": 1, "vad": False},
+        {"chunk_length_s": CHUNK_LENGTH_S, "batch_size": 8, "vad": False},
+        {"chunk_length_s": CHUNK_LENGTH_S, "batch_size": BATCH_SIZE, "vad": False},
+    ]
+
+    if not check_ready():
+        print("❌ The Modal app is not deployed. Run: python scripts/deploy.py")
+        return 1
+
+    setup_seconds = ping_model(args.model).get("setup_seconds")
+    if setup_seconds:
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in setup_seconds.items())
+        print(f"🧊 Container setup: {phases} ({sum(setup_seconds.values()):.2f}s total)")
+
+    print(f"⏱️  Benchmarking {len(configs)} configs of {args.model} on {GPU_CONFIG}")
+    # Run the first config twice so CUDA warm-up doesn't count against it.
+    results = benchmark_remote(args.audio_url, [configs[0], *configs], language=args.language,
+                               model=args.model)[1:]
+
+    print(f"\n{'chunk_length_s':>14} {'batch_size':>10} {'vad':>5} {'seconds':>9} {'RTF':>8} {'speedup':>8}")
+    baseline = results[0]["seconds"]
+    for result in results:
+        speedup = baseline / result["seconds"] if result["seconds"] else float("inf")
+        vad = "yes" if result["vad"] else "no"
+        print(f"{result['chunk_length_s']:>14} {result['batch_size']:>10} {vad:>5} {result['seconds']:>9.2f} "
+              f"{result['rtf']:>8.4f} {speedup:>7.1f}x")
+    print(f"\n📏 Audio duration: {results[0]['audio_seconds']:.0f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from podcast_transcription import PodcastTranscriptionPipeline
+from podcast_transcription.config import AUTO_MODEL, DEFAULT_LATENCY_BUDGET, DEFAULT_MODEL, supported_whisper_models
+from podcast_transcription.output_formats import DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS
+from podcast_transcription.local_backend import TEST_MODEL_NAME
+from podcast_transcription.pipeline import BACKENDS, LOCAL_BACKEND, MODAL_BACKEND, default_model
+
+def print_segments(episode: dict, chunks: list) -> None:
+    """Print streamed segments as they arrive."""
+    title = episode.get('title', 'Unknown Episode')[:40]
+    for start, end, text in chunks:
+        print(f"💬 [{start:7.1f}s] {title}: {text.strip()}")
 
 def main():
     """Main CLI function."""
@@ -21,14 +31,23 @@ def main():
 Examples:
   %(prog)s "Super Data Science" --max-episodes 1
   %(prog)s "Taskmaster Podcast" --max-episodes 3 --filter "Series 19"
+  %(prog)s "Super Data Science" --max-episodes 10 --max-concurrency 10
+  %(prog)s "Super Data Science" "Radio Ambulante" --max-episodes 2 --max-concurrency 4
   %(prog)s "What Did You Do Yesterday" --language en --auto-stop
   %(prog)s "Radio Ambulante" --language es --output-dir spanish_podcasts
+  %(prog)s "https://feeds.example.com/show.xml" --max-episodes 2
+  %(prog)s "Super Data Science" --max-episodes 50 --model base.en
+  %(prog)s "Super Data Science" --model auto --latency-budget 120
+  %(prog)s "Super Data Science" --max-episodes 1 --stream --output-format jsonl
         """
     )
     
     parser.add_argument(
-        "podcast_name",
-        help="Name of the podcast to search for and transcribe"
+        "podcast_names",
+        nargs="+",
+        metavar="podcast_name",
+        help="Name of the podcast to search for and transcribe, or the URL of its RSS feed. "
+             "Several names are processed together."
     )
     
     parser.add_argument(
@@ -56,6 +75,67 @@ Examples:
         help="Output directory for transcription files (default: transcriptions)"
     )
     
+    parser.add_argument(
+        "--output-format",
+        choices=list(OUTPUT_FORMATS),
+        default=DEFAULT_OUTPUT_FORMAT,
+        help=f"Output profile for transcription files (default: {DEFAULT_OUTPUT_FORMAT})"
+    )
+    
+    parser.add_argument(
+        "--model", "-m",
+        choices=[*supported_whisper_models, AUTO_MODEL, TEST_MODEL_NAME],
+        help=f"Whisper model, or 'auto' to pick the largest that fits --latency-budget per episode "
+             f"(default: {DEFAULT_MODEL.name}, or {default_model(LOCAL_BACKEND)} with --backend local). "
+             f"'{TEST_MODEL_NAME}' is a tiny offline test model for --backend local"
+    )
+    
+    parser.add_argument(
+        "--latency-budget",
+        type=float,
+        default=DEFAULT_LATENCY_BUDGET,
+        help=f"Seconds of inference allowed per episode with --model auto (default: {DEFAULT_LATENCY_BUDGET})"
+    )
+    
+    parser.add_argument(
+        "--backend",
+        choices=list(BACKENDS),
+        default=MODAL_BACKEND,
+        help="Transcribe on the Modal app, or 'local' on this machine's CPU with int8 weights (default: modal)"
+    )
+    
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Only send speech to Whisper, skipping silence and music beds"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print segments as they are transcribed; with --output-format jsonl they are also "
+             "appended to the file as they arrive"
+    )
+    
+    parser.add_argument(
+        "--max-concurrency", "-j",
+        type=int,
+        default=1,
+        help="Maximum number of episodes to transcribe at the same time (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="Re-transcribe episodes even if a cached transcription exists"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run: skip saved episodes and re-attach to in-flight Modal calls"
+    )
+    
     parser.add_argument(
         "--auto-stop",
         action="store_true",
@@ -63,32 +143,61 @@ Examples:
     )
     
     args = parser.parse_args()
+    args.model = args.model or default_model(args.backend)
     
     print("🎙️  Podcast Transcription Pipeline")
     print("=" * 40)
-    print(f"📺 Podcast: {args.podcast_name}")
+    print(f"📺 Podcast: {', '.join(args.podcast_names)}")
     print(f"📊 Max episodes: {args.max_episodes}")
     if args.episode_filter:
         print(f"🔍 Filter: {args.episode_filter}")
     print(f"🌍 Language: {args.language}")
     print(f"📁 Output dir: {args.output_dir}")
+    print(f"🗂️  Output format: {args.output_format}")
+    if args.model == AUTO_MODEL:
+        print(f"🧭 Model: auto, within {args.latency_budget:.0f}s per episode")
+    else:
+        print(f"🧠 Model: {args.model}")
+    if args.backend != MODAL_BACKEND:
+        print(f"🖥️  Backend: {args.backend}")
+    if args.vad:
+        print("🔇 Voice activity detection: Enabled")
+    if args.stream:
+        print("⏩ Streaming: Enabled")
+    if args.max_concurrency > 1:
+        print(f"⚡ Max concurrency: {args.max_concurrency}")
+    if args.force_refresh:
+        print("🔄 Force refresh: Enabled")
+    if args.resume:
+        print("⏯️  Resume: Enabled")
     if args.auto_stop:
         print("🛑 Auto-stop: Enabled")
     print()
     
     try:
         # Initialize pipeline
-        pipeline = PodcastTranscriptionPipeline(output_dir=args.output_dir)
+        pipeline = PodcastTranscriptionPipeline(
+            output_dir=args.output_dir, output_format=args.output_format,
+            model=args.model, latency_budget=args.latency_budget, vad=args.vad,
+            backend=args.backend, stream=args.stream,
+            on_segments=print_segments if args.stream else None
+        )
         
-        # Process podcast
-        files = pipeline.process_podcast(
-            podcast_name=args.podcast_name,
+        # Process podcasts; several names share one event loop and connection pool
+        results = pipeline.process_podcasts(
+            podcast_names=args.podcast_names,
             max_episodes=args.max_episodes,
             episode_filter=args.episode_filter,
             language=args.language,
-            auto_stop=args.auto_stop
+            auto_stop=args.auto_stop,
+            max_concurrency=args.max_concurrency,
+            force_refresh=args.force_refresh,
+            resume=args.resume
         )
-        
+        files = [file_path for paths in results.values() for file_path in paths]
+        # Podcasts that weren't found, or had nothing transcribed, map to no files.
+        missing = [name for name in args.podcast_names if not results.get(name)]
+
         if files:
             print(f"\n🎉 Success! Transcribed {len(files)} episode(s)")
             print("📄 Files created:")
@@ -98,11 +207,15 @@ Examples:
         else:
             print("\n❌ No episodes were successfully transcribed")
             return 1
-            
+        if missing:
+            print(f"\n❌ No episodes transcribed for: {', '.join(missing)}")
+            return 1
+
         return 0
         
     except KeyboardInterrupt:
         print("\n👋 Transcription cancelled by user")
+        print("💡 Re-run with --resume to pick up where this run left off")
         return 1
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
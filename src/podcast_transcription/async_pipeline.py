@@ -0,0 +1,574 @@
+"""
+asyncio-native podcast transcription pipeline.
+
+Discovery, audio pre-checks, audio prefetching, remote inference and saving
+run as separate stages joined by bounded queues. Episodes from one podcast are
+already being transcribed while the next podcast is still being looked up,
+upcoming episodes' audio is downloaded on Modal while earlier ones are on the
+GPU, and files are written while other episodes are still being transcribed.
+All stages share one event loop and one aiohttp connection pool.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import functools
+import pathlib
+from typing import Awaitable, Callable, Optional
+
+import aiohttp
+import modal
+
+from . import job_journal
+from .config import get_logger
+from .job_journal import JobJournal
+from .modal_client import (
+    RAW_AUDIO_BUDGET,
+    stream_transcription_async,
+    submit_prefetch_async,
+    submit_transcription_async,
+    whisper_model_id,
+)
+from .output_formats import JsonlTranscriptionWriter
+from .pipeline import LOCAL_BACKEND, TRANSCRIPTION_TIMEOUT, PodcastTranscriptionPipeline
+from .rss_discovery import episode_to_dict, fetch_feed, is_feed_url
+from .podcast_discovery import (
+    USER_AGENT,
+    episode_guid_hash,
+    get_podcast_details_async,
+    podchaser_session,
+)
+
+logger = get_logger(__name__)
+
+# Connections shared by Podchaser queries and audio pre-checks.
+HTTP_CONNECTION_LIMIT = 32
+PRECHECK_CONCURRENCY = 8
+PRECHECK_TIMEOUT = 30
+# Bounds how far discovery can run ahead of inference.
+QUEUE_SIZE = 16
+# Episodes whose audio may be downloaded ahead of the ones being transcribed.
+PREFETCH_DEPTH = 2
+
+
+@dataclasses.dataclass
+class _Job:
+    # Key into the results, usually the podcast name.
+    group: str
+    index: int
+    podcast_title: str
+    episode: dict
+    key: str
+    journal: Optional[JobJournal]
+    # Latest journal entry for this episode when resuming, else empty.
+    progress: dict
+    transcription_data: Optional[dict] = None
+    # Pending `prefetch_audio` call, holding one of the run's prefetch slots.
+    prefetch: Optional[modal.FunctionCall] = None
+    # Output file that streamed segments are appended to, opened on the first segments.
+    writer: Optional[JsonlTranscriptionWriter] = None
+
+
+@dataclasses.dataclass
+class _Run:
+    language: str
+    force_refresh: bool
+    precheck_queue: asyncio.Queue
+    prefetch_queue: asyncio.Queue
+    inference_queue: asyncio.Queue
+    save_queue: asyncio.Queue
+    results: dict[str, dict[int, pathlib.Path]]
+    failed: dict[str, list[str]]
+    # Audio being fetched or transcribed at once; limits lookahead and cache use.
+    prefetch_slots: asyncio.Semaphore
+    http: Optional[aiohttp.ClientSession] = None
+
+
+class AsyncPodcastTranscriptionPipeline:
+    """
+    asyncio counterpart of `PodcastTranscriptionPipeline`.
+
+    Storage (output dir, transcription cache, journals, output profile) is
+    shared with the wrapped sync pipeline, which in turn runs its multi-episode
+    methods through this class.
+
+    Up to `prefetch_depth` episodes beyond those being transcribed have their
+    audio downloaded into the raw-audio cache on Modal ahead of time, evicting
+    old audio beyond `audio_cache_budget` bytes. 0 disables prefetching, as
+    does the pipeline's local backend.
+    """
+
+    def __init__(self, pipeline: Optional[PodcastTranscriptionPipeline] = None, max_concurrency: int = 1,
+                 precheck_concurrency: int = PRECHECK_CONCURRENCY, queue_size: int = QUEUE_SIZE,
+                 prefetch_depth: int = PREFETCH_DEPTH, audio_cache_budget: int = RAW_AUDIO_BUDGET):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if prefetch_depth < 0:
+            raise ValueError(f"prefetch_depth can't be negative, got {prefetch_depth}")
+        self.pipeline = pipeline or PodcastTranscriptionPipeline()
+        self.max_concurrency = max_concurrency
+        self.precheck_concurrency = precheck_concurrency
+        self.queue_size = queue_size
+        self.prefetch_depth = prefetch_depth
+        self.audio_cache_budget = audio_cache_budget
+        self._modal_lock = asyncio.Lock()
+        # None until checked, then whether the app could be started.
+        self._modal_ready: Optional[bool] = None
+
+    async def _ensure_modal_app_running(self) -> None:
+        """Deploy/probe the Modal app once, the first time an episode actually needs it."""
+        async with self._modal_lock:
+            if self._modal_ready is None:
+                self._modal_ready = await asyncio.to_thread(self.pipeline.ensure_modal_app_running)
+        if not self._modal_ready:
+            raise RuntimeError("Failed to start Modal app")
+
+    async def transcribe_episode(self, episode: dict, language: str = 'en',
+                                 force_refresh: bool = False, journal: Optional[JobJournal] = None,
+                                 call_id: Optional[str] = None, audio_path: Optional[str] = None,
+                                 on_segments: Optional[Callable[[list], None]] = None) -> Optional[dict]:
+        """
+        Async counterpart of `PodcastTranscriptionPipeline.transcribe_episode`.
+
+        `audio_path` is where `prefetch_audio` cached the episode's audio on Modal.
+        `on_segments(chunks)` defaults to the pipeline's `on_segments` for this
+        episode. It runs in a worker thread.
+        """
+        episode_title = episode.get('title', 'Unknown Episode')
+        audio_url = episode.get('audioUrl')
+
+        if not audio_url:
+            logger.error(f"❌ No audio URL for episode: {episode_title}")
+            return None
+
+        if on_segments is None and self.pipeline.on_segments:
+            on_segments = functools.partial(self.pipeline.on_segments, episode)
+        cache = self.pipeline.cache
+        guid_hash = episode_guid_hash(episode)
+        model_name = await asyncio.to_thread(self.pipeline.model_for, episode, language)
+        model_id = whisper_model_id(model_name)
+        key = cache.key(guid_hash, model_id, language)
+        if not force_refresh:
+            cached_result = await asyncio.to_thread(cache.get, guid_hash, model_id, language)
+            if cached_result is not None:
+                logger.info(f"♻️  Using cached transcription for: {episode_title}")
+                if on_segments:
+                    await asyncio.to_thread(on_segments, cached_result.get("chunks", []))
+                if journal:
+                    await asyncio.to_thread(journal.record, key, job_journal.COMPLETED)
+                return {
+                    'episode_metadata': episode,
+                    'transcription': cached_result,
+                    'audio_url': audio_url,
+                    'model': model_id,
+                }
+
+        streamed = False
+        try:
+            if self.pipeline.backend == LOCAL_BACKEND:
+                logger.info(f"🖥️  Transcribing locally with {model_name}: {episode_title}")
+                result = await asyncio.to_thread(
+                    self.pipeline.local_model(model_name).transcribe, audio_url, language, guid_hash,
+                    vad=self.pipeline.vad,
+                )
+            elif self.pipeline.stream and not call_id:
+                result = await self._stream_on_modal(episode, language, model_name, audio_path, on_segments)
+                streamed = True
+            else:
+                result = await self._transcribe_on_modal(episode, language, model_name, key, journal,
+                                                         call_id, audio_path)
+        except (modal.exception.TimeoutError, TimeoutError):
+            logger.error(f"❌ Transcription timed out for: {episode_title}")
+            return None
+        except Exception as e:
+            logger.error(f"❌ Error transcribing '{episode_title}': {str(e)}")
+            return None
+
+        if not result or not result.get("text"):
+            logger.error(f"❌ No transcription text found for: {episode_title}")
+            return None
+
+        if not streamed:
+            if on_segments:
+                await asyncio.to_thread(on_segments, result.get("chunks", []))
+            await asyncio.to_thread(cache.put, guid_hash, model_id, language, result)
+        if journal:
+            await asyncio.to_thread(journal.record, key, job_journal.COMPLETED)
+        logger.info(f"✅ Successfully transcribed: {episode_title}")
+        return {
+            'episode_metadata': episode,
+            'transcription': result,
+            'audio_url': audio_url,
+            'model': model_id,
+        }
+
+    async def _transcribe_on_modal(self, episode: dict, language: str, model_name: str, key: str,
+                                   journal: Optional[JobJournal], call_id: Optional[str],
+                                   audio_path: Optional[str]) -> Optional[dict]:
+        """Run (or re-attach to) the episode's transcription on the deployed app and wait for it."""
+        episode_title = episode.get('title', 'Unknown Episode')
+        audio_url = episode['audioUrl']
+        await self._ensure_modal_app_running()
+        if call_id:
+            logger.info(f"🔗 Re-attaching to Modal call {call_id} for: {episode_title}")
+            try:
+                call = modal.FunctionCall.from_id(call_id)
+                return await call.get.aio(timeout=TRANSCRIPTION_TIMEOUT)
+            except modal.exception.TimeoutError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️  Could not re-attach to Modal call {call_id} ({e}), resubmitting")
+
+        logger.info(f"🎙️  Transcribing with {model_name}: {episode_title}")
+        logger.info(f"📡 Audio URL: {audio_url}")
+        call = await submit_transcription_async(audio_url, language=language, audio_key=episode_guid_hash(episode),
+                                                audio_path=audio_path, model=model_name, vad=self.pipeline.vad)
+        if journal:
+            await asyncio.to_thread(journal.record, key, job_journal.SUBMITTED, call_id=call.object_id)
+        return await call.get.aio(timeout=TRANSCRIPTION_TIMEOUT)
+
+    async def _stream_on_modal(self, episode: dict, language: str, model_name: str, audio_path: Optional[str],
+                               on_segments: Optional[Callable[[list], None]]) -> Optional[dict]:
+        """
+        Stream the episode's transcription from the deployed app, passing each
+        list of new chunks to `on_segments` as it arrives.
+
+        The chunks are appended to the episode's cache entry rather than kept
+        in memory, and the result is read back from it once the stream ends.
+        Streamed calls have no call id, so they aren't journaled as submitted;
+        a resumed run starts them over.
+        """
+        episode_title = episode.get('title', 'Unknown Episode')
+        guid_hash = episode_guid_hash(episode)
+        model_id = whisper_model_id(model_name)
+        cache = self.pipeline.cache
+        await self._ensure_modal_app_running()
+        logger.info(f"🎙️  Streaming transcription with {model_name}: {episode_title}")
+        logger.info(f"📡 Audio URL: {episode['audioUrl']}")
+        writer = await asyncio.to_thread(cache.open_entry, guid_hash, model_id, language)
+        has_text = False
+        try:
+            async with asyncio.timeout(TRANSCRIPTION_TIMEOUT):
+                async for new_chunks in stream_transcription_async(
+                    episode['audioUrl'], language=language, audio_key=guid_hash,
+                    audio_path=audio_path, model=model_name, vad=self.pipeline.vad,
+                ):
+                    if not writer.chunk_count:
+                        logger.info(f"⏩ First segments of: {episode_title}")
+                    has_text = has_text or any(text.strip() for _, _, text in new_chunks)
+                    await asyncio.to_thread(writer.append_chunks, new_chunks)
+                    if on_segments:
+                        await asyncio.to_thread(on_segments, new_chunks)
+        except BaseException:
+            # Also on cancellation, so don't await here.
+            writer.abort()
+            raise
+        if not has_text:
+            await asyncio.to_thread(writer.abort)
+            return None
+        await asyncio.to_thread(writer.close)
+        return await asyncio.to_thread(cache.get, guid_hash, model_id, language)
+
+    def _job_segment_callback(self, job: _Job, language: str) -> Optional[Callable[[list], None]]:
+        """
+        Segment callback for a queued episode: appends to its output file when
+        streaming jsonl, then calls the pipeline's `on_segments`.
+        """
+        streaming_output = self.pipeline.stream and self.pipeline.output_format == "jsonl"
+        if not streaming_output and not self.pipeline.on_segments:
+            return None
+
+        def on_segments(chunks: list) -> None:
+            if streaming_output:
+                if job.writer is None:
+                    model_id = whisper_model_id(self.pipeline.model_for(job.episode, language))
+                    job.writer = self.pipeline.open_streaming_output(job.episode, job.podcast_title, model_id)
+                job.writer.append_segments(chunks)
+            if self.pipeline.on_segments:
+                self.pipeline.on_segments(job.episode, chunks)
+
+        return on_segments
+
+    async def _enqueue(self, run: _Run, group: str, podcast_title: str, episodes: list[dict],
+                       journal: Optional[JobJournal], resume: bool) -> None:
+        """Queue episodes for processing, skipping those a resumed journal already saved."""
+        progress = await asyncio.to_thread(journal.load) if journal and resume else {}
+        # With the "auto" policy this sizes the episodes' audio, so do it for all of them at once.
+        models = await asyncio.gather(*(
+            asyncio.to_thread(self.pipeline.model_for, episode, run.language) for episode in episodes
+        ))
+        for i, (episode, model_name) in enumerate(zip(episodes, models)):
+            key = self.pipeline.cache.key(episode_guid_hash(episode), whisper_model_id(model_name), run.language)
+            entry = progress.get(key, {})
+            state = entry.get("state")
+            if state == job_journal.SAVED and pathlib.Path(entry["path"]).exists():
+                logger.info(f"⏭️  Already saved: {episode.get('title', 'Unknown Episode')}")
+                run.results[group][i] = pathlib.Path(entry["path"])
+                continue
+            if journal and state not in (job_journal.SUBMITTED, job_journal.COMPLETED):
+                await asyncio.to_thread(journal.record, key, job_journal.QUEUED, title=episode.get('title'))
+            await run.precheck_queue.put(_Job(group, i, podcast_title, episode, key, journal, entry))
+
+    async def _discover(self, run: _Run, gql_session, podcast_name: str, max_episodes: int,
+                        episode_filter: Optional[str], resume: bool) -> None:
+        """Discovery stage: look up a podcast and queue its episodes."""
+        logger.info(f"🔍 Searching for podcast: '{podcast_name}'")
+        if is_feed_url(podcast_name):
+            podcast, feed_episodes = await asyncio.to_thread(fetch_feed, podcast_name, max_episodes, episode_filter)
+            logger.info(f"✅ Found podcast: '{podcast.title}' (feed: {podcast.id})")
+            episodes = [episode_to_dict(episode) for episode in feed_episodes]
+        else:
+            podcast = await get_podcast_details_async(gql_session, podcast_name)
+            logger.info(f"✅ Found podcast: '{podcast.title}' (ID: {podcast.id})")
+
+            logger.info(f"📡 Fetching episodes for '{podcast.title}'...")
+            catalog = self.pipeline.catalog
+            try:
+                await catalog.sync_async(gql_session, podcast.id, max_episodes, episode_filter)
+            except Exception as e:
+                if not await asyncio.to_thread(catalog.is_synced, podcast.id):
+                    raise
+                logger.warning(f"⚠️  Could not refresh episode catalog, using stored episodes: {e}")
+            episodes = await asyncio.to_thread(catalog.episodes, podcast.id, max_episodes, episode_filter)
+        logger.info(f"✅ Ready to transcribe {len(episodes)} episodes")
+        if not episodes:
+            logger.error(f"❌ No valid episodes found for '{podcast.title}'")
+            return
+
+        journal = self.pipeline.journal_for(podcast_name)
+        if not resume:
+            await asyncio.to_thread(journal.reset)
+        await self._enqueue(run, podcast_name, podcast.title, episodes, journal, resume)
+
+    async def _precheck_audio(self, http: aiohttp.ClientSession, job: _Job) -> bool:
+        """HEAD the audio URL so dead links fail fast, before they take a GPU slot."""
+        audio_url = job.episode['audioUrl']
+        try:
+            async with http.head(
+                audio_url,
+                allow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=PRECHECK_TIMEOUT),
+            ) as response:
+                if response.status in (404, 410):
+                    logger.error(f"❌ Audio URL returned {response.status}: {audio_url}")
+                    return False
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Some podcast hosts reject HEAD requests; let Modal try the download.
+            logger.warning(f"⚠️  Could not pre-check audio URL ({type(e).__name__}), proceeding: {audio_url}")
+        return True
+
+    async def _precheck_worker(self, run: _Run) -> None:
+        while True:
+            job = await run.precheck_queue.get()
+            episode_title = job.episode.get('title', 'Unknown Episode')
+            try:
+                needs_audio = (
+                    job.progress.get("state") not in (job_journal.SUBMITTED, job_journal.COMPLETED)
+                    and (run.force_refresh or not self.pipeline.is_cached(job.episode, run.language))
+                )
+                if needs_audio and run.http and not await self._precheck_audio(run.http, job):
+                    run.failed[job.group].append(episode_title)
+                elif needs_audio and self.prefetch_depth and self.pipeline.backend != LOCAL_BACKEND:
+                    await run.prefetch_queue.put(job)
+                else:
+                    await run.inference_queue.put(job)
+            except Exception as e:
+                logger.error(f"❌ Failed to pre-check '{episode_title}': {str(e)}")
+                run.failed[job.group].append(episode_title)
+            finally:
+                run.precheck_queue.task_done()
+
+    async def _prefetch_worker(self, run: _Run) -> None:
+        """Start downloading audio on Modal as soon as a slot frees up; inference waits for it."""
+        while True:
+            job = await run.prefetch_queue.get()
+            try:
+                await run.prefetch_slots.acquire()
+                try:
+                    await self._ensure_modal_app_running()
+                    job.prefetch = await submit_prefetch_async(
+                        job.episode['audioUrl'], episode_guid_hash(job.episode), self.audio_cache_budget
+                    )
+                except Exception as e:
+                    run.prefetch_slots.release()
+                    logger.warning(f"⚠️  Could not prefetch audio, it will be downloaded at transcription: {e}")
+                await run.inference_queue.put(job)
+            finally:
+                run.prefetch_queue.task_done()
+
+    async def _prefetched_audio_path(self, job: _Job) -> Optional[str]:
+        episode_title = job.episode.get('title', 'Unknown Episode')
+        try:
+            audio_path = await job.prefetch.get.aio(timeout=TRANSCRIPTION_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"⚠️  Prefetching audio failed for '{episode_title}' ({e}), downloading at transcription")
+            return None
+        logger.info(f"📦 Audio ready for: {episode_title}")
+        return audio_path
+
+    async def _inference_worker(self, run: _Run) -> None:
+        while True:
+            job = await run.inference_queue.get()
+            episode_title = job.episode.get('title', 'Unknown Episode')
+            try:
+                state = job.progress.get("state")
+                audio_path = await self._prefetched_audio_path(job) if job.prefetch else None
+                job.transcription_data = await self.transcribe_episode(
+                    job.episode, run.language,
+                    # A completed result is already in the cache; never pay for it twice.
+                    run.force_refresh and state != job_journal.COMPLETED,
+                    job.journal,
+                    job.progress.get("call_id") if state == job_journal.SUBMITTED else None,
+                    audio_path,
+                    self._job_segment_callback(job, run.language),
+                )
+                if job.transcription_data:
+                    await run.save_queue.put(job)
+                else:
+                    run.failed[job.group].append(episode_title)
+            except Exception as e:
+                logger.error(f"❌ Failed to process '{episode_title}': {str(e)}")
+                run.failed[job.group].append(episode_title)
+            finally:
+                if job.writer and not job.transcription_data:
+                    # Don't leave a partial stream behind for a failed episode.
+                    await asyncio.to_thread(job.writer.abort)
+                if job.prefetch:
+                    run.prefetch_slots.release()
+                run.inference_queue.task_done()
+
+    async def _save_worker(self, run: _Run) -> None:
+        while True:
+            job = await run.save_queue.get()
+            episode_title = job.episode.get('title', 'Unknown Episode')
+            try:
+                if job.writer:
+                    # The segments were appended as they arrived; only the rename is left.
+                    path = await asyncio.to_thread(job.writer.close)
+                    logger.info(f"💾 Saved transcription to: {path}")
+                else:
+                    path = await asyncio.to_thread(
+                        self.pipeline.save_transcription, job.transcription_data, job.podcast_title
+                    )
+                if job.journal:
+                    await asyncio.to_thread(job.journal.record, job.key, job_journal.SAVED, path=str(path))
+                run.results[job.group][job.index] = path
+                text_preview = job.transcription_data['transcription']['text'][:200]
+                logger.info(f"📝 Preview: {text_preview}...")
+            except Exception as e:
+                logger.error(f"❌ Failed to save '{episode_title}': {str(e)}")
+                run.failed[job.group].append(episode_title)
+            finally:
+                run.save_queue.task_done()
+
+    async def _run(self, groups: list[str], produce: Callable[[_Run], Awaitable[None]],
+                   language: str, force_refresh: bool, http: Optional[aiohttp.ClientSession]) -> _Run:
+        """Start the stage workers, run the producer, and wait for every queue to drain."""
+        run = _Run(
+            language=language,
+            force_refresh=force_refresh,
+            precheck_queue=asyncio.Queue(self.queue_size),
+            prefetch_queue=asyncio.Queue(self.queue_size),
+            inference_queue=asyncio.Queue(self.queue_size),
+            save_queue=asyncio.Queue(self.queue_size),
+            results={group: {} for group in groups},
+            failed={group: [] for group in groups},
+            # Audio being transcribed counts too, so `prefetch_depth` is how far fetching runs ahead.
+            prefetch_slots=asyncio.Semaphore(self.max_concurrency + self.prefetch_depth),
+            http=http,
+        )
+        workers = [
+            *(asyncio.create_task(self._precheck_worker(run)) for _ in range(self.precheck_concurrency)),
+            asyncio.create_task(self._prefetch_worker(run)),
+            *(asyncio.create_task(self._inference_worker(run)) for _ in range(self.max_concurrency)),
+            asyncio.create_task(self._save_worker(run)),
+        ]
+        try:
+            await produce(run)
+            # Stages only feed downstream, so draining them in order drains everything.
+            await run.precheck_queue.join()
+            await run.prefetch_queue.join()
+            await run.inference_queue.join()
+            await run.save_queue.join()
+        finally:
+            # On Ctrl-C, remote calls keep running on Modal; their ids are in the journal for resume.
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        for group, titles in run.failed.items():
+            for episode_title in titles:
+                logger.warning(f"⚠️  Skipped failed transcription for episode: {episode_title}")
+        return run
+
+    async def transcribe_episodes(self, episodes: list[dict], podcast_title: str, language: str = 'en',
+                                  force_refresh: bool = False, journal: Optional[JobJournal] = None,
+                                  resume: bool = False) -> list[pathlib.Path]:
+        """Async counterpart of `PodcastTranscriptionPipeline.transcribe_episodes`."""
+        async def produce(run: _Run) -> None:
+            await self._enqueue(run, podcast_title, podcast_title, episodes, journal, resume)
+
+        async with aiohttp.ClientSession() as http:
+            run = await self._run([podcast_title], produce, language, force_refresh, http)
+        saved_files = run.results[podcast_title]
+        return [saved_files[i] for i in sorted(saved_files)]
+
+    async def process_podcasts(self, podcast_names: list[str], max_episodes: int = 5,
+                               episode_filter: Optional[str] = None, language: str = 'en',
+                               force_refresh: bool = False,
+                               resume: bool = False) -> dict[str, list[pathlib.Path]]:
+        """
+        Search, transcribe and save several podcasts in one event loop.
+
+        A podcast that can't be found is logged and maps to an empty list; use
+        `process_podcast` to have the error raised instead.
+        """
+        results, _ = await self._process_podcasts(
+            podcast_names, max_episodes, episode_filter, language, force_refresh, resume
+        )
+        return results
+
+    async def process_podcast(self, podcast_name: str, max_episodes: int = 5,
+                              episode_filter: Optional[str] = None, language: str = 'en',
+                              force_refresh: bool = False, resume: bool = False) -> list[pathlib.Path]:
+        """Async counterpart of `PodcastTranscriptionPipeline.process_podcast`."""
+        results, errors = await self._process_podcasts(
+            [podcast_name], max_episodes, episode_filter, language, force_refresh, resume
+        )
+        if podcast_name in errors:
+            raise errors[podcast_name]
+        return results[podcast_name]
+
+    async def _process_podcasts(self, podcast_names: list[str], max_episodes: int,
+                                episode_filter: Optional[str], language: str, force_refresh: bool,
+                                resume: bool) -> tuple[dict[str, list[pathlib.Path]], dict[str, Exception]]:
+        errors: dict[str, Exception] = {}
+        connector = aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT)
+        session_args = {"connector": connector, "connector_owner": False}
+        # Feed URLs don't need Podchaser, or its credentials.
+        if all(is_feed_url(name) for name in podcast_names):
+            gql_context = contextlib.nullcontext()
+        else:
+            gql_context = podchaser_session(session_args)
+        try:
+            async with aiohttp.ClientSession(**session_args) as http, gql_context as gql_session:
+                async def discover(run: _Run, podcast_name: str) -> None:
+                    try:
+                        await self._discover(run, gql_session, podcast_name, max_episodes, episode_filter, resume)
+                    except Exception as e:
+                        logger.error(f"❌ Failed to find podcast '{podcast_name}': {str(e)}")
+                        errors[podcast_name] = e
+
+                async def produce(run: _Run) -> None:
+                    await asyncio.gather(*(discover(run, name) for name in podcast_names))
+
+                run = await self._run(podcast_names, produce, language, force_refresh, http)
+        finally:
+            await connector.close()
+
+        results = {
+            name: [saved_files[i] for i in sorted(saved_files)]
+            for name, saved_files in run.results.items()
+        }
+        return results, errors
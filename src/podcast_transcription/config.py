@@ -1,6 +1,8 @@
 import dataclasses
 import logging
+import os
 import pathlib
+from typing import Optional
 
 
 @dataclasses.dataclass
@@ -21,6 +23,8 @@ def get_logger(name, level=logging.INFO):
     return logger
 
 
+logger = get_logger(__name__)
+
 CACHE_DIR = "/cache"
 # Where downloaded podcasts are stored, by guid hash.
 # Mostly .mp3 files 50-100MiB.
@@ -34,6 +38,10 @@ TRANSCRIPTIONS_DIR = pathlib.Path(CACHE_DIR, "transcriptions")
 SEARCH_DIR = pathlib.Path(CACHE_DIR, "search")
 # Location of modal checkpoint.
 MODEL_DIR = pathlib.Path(CACHE_DIR, "model")
+# Client-side cache on the machine running the pipeline, eg. API tokens and schemas.
+LOCAL_CACHE_DIR = pathlib.Path(
+    os.environ.get("PODCAST_TRANSCRIPTION_CACHE_DIR", pathlib.Path.home() / ".cache" / "podcast-transcription")
+)
 # Location of web frontend assets.
 ASSETS_PATH = pathlib.Path(__file__).parent / "frontend" / "dist"
 
@@ -47,6 +55,50 @@ supported_whisper_models = {
     "medium.en": ModelSpec(name="medium.en", params="769M", relative_speed=2),
     # Very slow. Will take around 45 mins to 1.5 hours to transcribe.
     "large": ModelSpec(name="large", params="1550M", relative_speed=1),
+    # What the Modal app has always run; the default so existing transcription caches stay valid.
+    "large-v3": ModelSpec(name="large-v3", params="1550M", relative_speed=1),
 }
 
-DEFAULT_MODEL = supported_whisper_models["base.en"] 
\ No newline at end of file
+DEFAULT_MODEL = supported_whisper_models["large-v3"]
+
+# Model name that picks a model per episode with `select_model`.
+AUTO_MODEL = "auto"
+# Inference seconds per second of audio for a relative_speed=1 model on the
+# Modal app's GPU with batched inference. Measure with scripts/benchmark.py.
+REFERENCE_REAL_TIME_FACTOR = 0.02
+# Default per-episode latency budget for the "auto" policy, in seconds.
+DEFAULT_LATENCY_BUDGET = 60
+
+
+def estimated_transcription_seconds(model: ModelSpec, audio_seconds: float) -> float:
+    return audio_seconds * REFERENCE_REAL_TIME_FACTOR / model.relative_speed
+
+
+def select_model(audio_seconds: Optional[float], latency_budget: float = DEFAULT_LATENCY_BUDGET,
+                 language: Optional[str] = "en") -> ModelSpec:
+    """
+    The largest model expected to transcribe `audio_seconds` of audio within `latency_budget` seconds.
+
+    English-only ('.en') models are only considered for English, so other and
+    auto-detected languages choose between the large models only. If nothing
+    fits, the fastest candidate is used with a warning; if the duration is
+    unknown, `DEFAULT_MODEL`.
+    """
+    if audio_seconds is None:
+        return DEFAULT_MODEL
+    candidates = [
+        model for model in supported_whisper_models.values()
+        if language == "en" or not model.name.endswith(".en")
+    ]
+    # Slowest (largest) first; among equally fast models, the default first.
+    candidates.sort(key=lambda model: (model.relative_speed, model is not DEFAULT_MODEL))
+    for model in candidates:
+        if estimated_transcription_seconds(model, audio_seconds) <= latency_budget:
+            return model
+    fastest = max(candidates, key=lambda model: (model.relative_speed, model is DEFAULT_MODEL))
+    logger.warning(
+        f"⚠️  No {'English' if language == 'en' else 'multilingual'} model transcribes "
+        f"{audio_seconds / 60:.0f} min of audio within the {latency_budget:g}s latency budget; "
+        f"using {fastest.name} (~{estimated_transcription_seconds(fastest, audio_seconds):.0f}s)"
+    )
+    return fastest
\ No newline at end of file
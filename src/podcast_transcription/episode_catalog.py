@@ -0,0 +1,299 @@
+"""
+Local SQLite catalog of podcast episodes.
+
+The first sync of a podcast pulls episodes from Podchaser, newest first,
+until as many as the caller asked for are stored; older episodes are
+backfilled by later syncs that need more of them. Later syncs only ask for
+episodes aired since the newest one stored and stop at the first guid already
+in the catalog, which is usually a single page. Episode selection ("latest N
+matching a filter") then runs locally.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import datetime
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
+
+from .config import LOCAL_CACHE_DIR, get_logger
+from .podcast_discovery import episode_matches, iter_episodes, iter_episodes_async
+
+logger = get_logger(__name__)
+
+CATALOG_FILENAME = "episodes.sqlite3"
+CATALOG_PATH = LOCAL_CACHE_DIR / CATALOG_FILENAME
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS podcasts (
+    podcast_id TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL,
+    -- Episodes aired before this date ('YYYY-MM-DD') are not stored yet; NULL once they all are.
+    backfill_before TEXT
+);
+CREATE TABLE IF NOT EXISTS episodes (
+    podcast_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    guid TEXT NOT NULL,
+    title TEXT,
+    air_date TEXT,
+    audio_url TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (podcast_id, id)
+);
+CREATE INDEX IF NOT EXISTS episodes_by_air_date ON episodes (podcast_id, air_date DESC);
+CREATE INDEX IF NOT EXISTS episodes_by_guid ON episodes (podcast_id, guid);
+"""
+
+
+def _episode_guid(episode: dict) -> str:
+    return episode.get("guid") or episode["id"]
+
+
+def _is_wanted(episode: dict, episode_filter: Optional[str]) -> bool:
+    """Whether `episodes()` would return this episode for `episode_filter`."""
+    return bool(episode.get("audioUrl")) and episode_matches(episode, episode_filter)
+
+
+def _next_day(date: str) -> str:
+    return (datetime.date.fromisoformat(date) + datetime.timedelta(days=1)).isoformat()
+
+
+@dataclasses.dataclass
+class _NewEpisodes:
+    """Episodes a sync has paged through so far, newest first, and when to stop."""
+    # None on a first sync, which has nothing stored to stop at.
+    aired_since: Optional[str]
+    # Stored episodes aired on `aired_since`, which Podchaser returns again.
+    known_guids: set[str]
+    max_episodes: Optional[int]
+    episode_filter: Optional[str]
+    episodes: list[dict] = dataclasses.field(default_factory=list)
+    wanted: int = 0
+    # False once paging stopped before the oldest episode.
+    complete: bool = True
+
+    def add(self, episode: dict) -> bool:
+        """Take the next episode; False once no more are needed."""
+        if self.aired_since is not None and _episode_guid(episode) in self.known_guids:
+            return False
+        self.episodes.append(episode)
+        self.wanted += _is_wanted(episode, self.episode_filter)
+        if self.aired_since is None and self.max_episodes is not None and self.wanted >= self.max_episodes:
+            self.complete = False
+            return False
+        return True
+
+
+@dataclasses.dataclass
+class _OlderEpisodes:
+    """Episodes a backfill has paged through so far, newest first, and when to stop."""
+    aired_before: str
+    # Stored episodes around the boundary day, which is asked for again.
+    known_guids: set[str]
+    # More wanted episodes needed, None for all of them.
+    needed: Optional[int]
+    episode_filter: Optional[str]
+    episodes: list[dict] = dataclasses.field(default_factory=list)
+    found: int = 0
+    complete: bool = True
+
+    def add(self, episode: dict) -> bool:
+        """Take the next episode; False once no more are needed."""
+        self.episodes.append(episode)
+        if _episode_guid(episode) not in self.known_guids:
+            self.found += _is_wanted(episode, self.episode_filter)
+        if self.needed is not None and self.found >= self.needed:
+            self.complete = False
+            return False
+        return True
+
+
+class EpisodeCatalog:
+    """Episodes of every podcast synced so far, newest first."""
+
+    def __init__(self, path: pathlib.Path = CATALOG_PATH):
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            # SQLite's own lower() only folds ASCII.
+            conn.create_function("unicode_lower", 1, lambda s: s and s.lower(), deterministic=True)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def is_synced(self, podcast_id: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT 1 FROM podcasts WHERE podcast_id = ?", (podcast_id,)).fetchone()
+        return row is not None
+
+    def latest_air_date(self, podcast_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            (air_date,) = conn.execute(
+                "SELECT max(air_date) FROM episodes WHERE podcast_id = ?", (podcast_id,)
+            ).fetchone()
+        return air_date
+
+    def _sync_start(self, podcast_id: str, max_episodes: Optional[int],
+                    episode_filter: Optional[str]) -> _NewEpisodes:
+        """Where to ask Podchaser for new episodes from, and the guids already stored on that date."""
+        aired_since, known_guids = None, set()
+        latest = self.latest_air_date(podcast_id) if self.is_synced(podcast_id) else None
+        if latest is not None:
+            aired_since = latest[:10]
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT guid FROM episodes WHERE podcast_id = ? AND air_date >= ?", (podcast_id, aired_since)
+                ).fetchall()
+            known_guids = {guid for (guid,) in rows}
+        return _NewEpisodes(aired_since, known_guids, max_episodes, episode_filter)
+
+    def _backfill_start(self, podcast_id: str, max_episodes: Optional[int],
+                        episode_filter: Optional[str]) -> Optional[_OlderEpisodes]:
+        """Where to backfill from, or None if the stored episodes already answer the request."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT backfill_before FROM podcasts WHERE podcast_id = ?", (podcast_id,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        needed = None
+        if max_episodes is not None:
+            needed = max_episodes - len(self.episodes(podcast_id, max_episodes, episode_filter))
+            if needed <= 0:
+                return None
+        # The boundary day is asked for again, so episodes aired later that day aren't missed.
+        aired_before = _next_day(row[0])
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT guid FROM episodes WHERE podcast_id = ? AND air_date >= ? AND substr(air_date, 1, 10) <= ?",
+                (podcast_id, row[0], aired_before),
+            ).fetchall()
+        return _OlderEpisodes(aired_before, {guid for (guid,) in rows}, needed, episode_filter)
+
+    @staticmethod
+    def _backfill_before(episodes: list[dict], complete: bool) -> Optional[str]:
+        """The new backfill boundary after storing `episodes`, oldest last."""
+        if complete or not episodes or not episodes[-1].get("airDate"):
+            return None
+        return episodes[-1]["airDate"][:10]
+
+    def _store(self, podcast_id: str, episodes: list[dict], backfill: bool = False,
+               backfill_before: Optional[str] = None) -> None:
+        """Store episodes; with `backfill`, also record how far back the catalog now goes."""
+        rows = [
+            (
+                podcast_id,
+                episode["id"],
+                _episode_guid(episode),
+                episode.get("title"),
+                episode.get("airDate"),
+                episode.get("audioUrl"),
+                json.dumps(episode, ensure_ascii=False),
+            )
+            for episode in episodes
+        ]
+        # One transaction, so an interrupted first sync never looks complete.
+        with self._lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            if backfill:
+                conn.execute("INSERT OR REPLACE INTO podcasts VALUES (?, ?, ?)",
+                             (podcast_id, time.time(), backfill_before))
+            else:
+                conn.execute(
+                    "INSERT INTO podcasts VALUES (?, ?, NULL)"
+                    " ON CONFLICT (podcast_id) DO UPDATE SET synced_at = excluded.synced_at",
+                    (podcast_id, time.time()),
+                )
+
+    def _store_new(self, podcast_id: str, new: _NewEpisodes) -> int:
+        """Store the episodes a sync found; a first sync also records how far back it got. Returns how many."""
+        if new.aired_since is not None:
+            self._store(podcast_id, new.episodes)
+            logger.info(f"📚 {len(new.episodes)} new episodes of podcast {podcast_id} since {new.aired_since}")
+            return len(new.episodes)
+        backfill_before = self._backfill_before(new.episodes, new.complete)
+        self._store(podcast_id, new.episodes, backfill=True, backfill_before=backfill_before)
+        older = ", older ones are fetched when needed" if backfill_before else ""
+        logger.info(f"📚 Cataloged {len(new.episodes)} episodes of podcast {podcast_id}{older}")
+        return len(new.episodes)
+
+    def _store_older(self, podcast_id: str, older: _OlderEpisodes) -> int:
+        """Store backfilled episodes. Returns how many were not stored before."""
+        self._store(podcast_id, older.episodes, backfill=True,
+                    backfill_before=self._backfill_before(older.episodes, older.complete))
+        count = sum(_episode_guid(episode) not in older.known_guids for episode in older.episodes)
+        logger.info(f"📚 Backfilled {count} older episodes of podcast {podcast_id}")
+        return count
+
+    def sync(self, client, podcast_id: str, max_episodes: Optional[int] = None,
+             episode_filter: Optional[str] = None) -> int:
+        """
+        Pull episodes not yet in the catalog from Podchaser. Returns how many were new.
+
+        With `max_episodes`, the first sync stops once that many episodes
+        matching `episode_filter` are stored. Later syncs reach further back
+        only when the stored episodes can't answer such a request; without
+        `max_episodes` they fetch the rest of the back catalog.
+        """
+        new = self._sync_start(podcast_id, max_episodes, episode_filter)
+        for episode in iter_episodes(client, podcast_id, require_audio=False, aired_since=new.aired_since):
+            if not new.add(episode):
+                break
+        count = self._store_new(podcast_id, new)
+
+        older = self._backfill_start(podcast_id, max_episodes, episode_filter)
+        if older is not None:
+            for episode in iter_episodes(client, podcast_id, require_audio=False, aired_before=older.aired_before):
+                if not older.add(episode):
+                    break
+            count += self._store_older(podcast_id, older)
+        return count
+
+    async def sync_async(self, session, podcast_id: str, max_episodes: Optional[int] = None,
+                         episode_filter: Optional[str] = None) -> int:
+        """Async counterpart of `sync`, run on a connected gql session. SQLite work runs in threads."""
+        new = await asyncio.to_thread(self._sync_start, podcast_id, max_episodes, episode_filter)
+        async for episode in iter_episodes_async(session, podcast_id, require_audio=False,
+                                                 aired_since=new.aired_since):
+            if not new.add(episode):
+                break
+        count = await asyncio.to_thread(self._store_new, podcast_id, new)
+
+        older = await asyncio.to_thread(self._backfill_start, podcast_id, max_episodes, episode_filter)
+        if older is not None:
+            async for episode in iter_episodes_async(session, podcast_id, require_audio=False,
+                                                     aired_before=older.aired_before):
+                if not older.add(episode):
+                    break
+            count += await asyncio.to_thread(self._store_older, podcast_id, older)
+        return count
+
+    def episodes(self, podcast_id: str, max_episodes: Optional[int] = None,
+                 episode_filter: Optional[str] = None, require_audio: bool = True) -> list[dict]:
+        """Newest-first episodes whose title contains `episode_filter` (case-insensitive)."""
+        query = "SELECT data FROM episodes WHERE podcast_id = ?"
+        params: list = [podcast_id]
+        if episode_filter:
+            query += " AND instr(unicode_lower(title), ?) > 0"
+            params.append(episode_filter.lower())
+        if require_audio:
+            query += " AND audio_url IS NOT NULL AND audio_url != ''"
+        query += " ORDER BY air_date IS NULL, air_date DESC"
+        if max_episodes is not None:
+            query += " LIMIT ?"
+            params.append(max_episodes)
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [json.loads(data) for (data,) in rows]
@@ -0,0 +1,328 @@
+"""
+Pooled HTTP fetching for podcast audio.
+
+Podcast audio URLs are usually chains of tracking redirects (podtrac, chrt.fm,
+...) in front of the CDN that actually serves the file. `resolve` follows a
+chain once and caches the final URL with its size and validators for
+`RESOLVE_CACHE_TTL` seconds. Every request goes through per-host pools of
+keep-alive connections. Large files on servers that accept byte ranges can be
+fetched as parallel segments written straight into a preallocated file.
+"""
+
+import contextlib
+import functools
+import http.client
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+from .config import LOCAL_CACHE_DIR, get_logger
+from .output_formats import atomic_open
+
+logger = get_logger(__name__)
+
+# Idle keep-alive connections kept per host.
+MAX_IDLE_PER_HOST = 8
+HTTP_TIMEOUT = 60
+MAX_REDIRECTS = 10
+RESOLVE_CACHE_PATH = LOCAL_CACHE_DIR / "resolved_urls.json"
+# The end of a redirect chain is often a signed CDN URL that expires, so resolutions are only trusted this long.
+RESOLVE_CACHE_TTL = 60 * 60
+# Files at least this big are fetched as parallel byte ranges when the server allows it.
+SEGMENTED_MIN_SIZE = 32 * 1024 * 1024
+SEGMENT_SIZE = 8 * 1024 * 1024
+SEGMENT_CONCURRENCY = 4
+READ_BUFFER_SIZE = 1024 * 1024
+
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+_CONTENT_RANGE_TOTAL = re.compile(r"/(\d+)\s*$")
+
+
+class ResolvedUrl(NamedTuple):
+    """Where a URL ends up after its redirects, and what the final server said about the file."""
+    url: str
+    size: Optional[int]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    accept_ranges: bool
+    content_type: Optional[str]
+    expires_at: float
+
+    @property
+    def validator(self) -> Optional[str]:
+        """Value for If-Range, so a changed file is never spliced into a partial one."""
+        return self.etag or self.last_modified
+
+
+class ResourceChanged(Exception):
+    """The server stopped honouring a byte range, usually because the file changed."""
+
+
+def http_error(url: str, response: http.client.HTTPResponse) -> urllib.error.HTTPError:
+    """The `urllib` error for an error response, so callers handle pooled and urllib requests alike."""
+    return urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections, pooled per scheme, host and port. Thread-safe."""
+
+    def __init__(self, max_idle_per_host: int = MAX_IDLE_PER_HOST, timeout: float = HTTP_TIMEOUT):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _new_connection(self, key: tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(host, port, timeout=self.timeout)
+
+    def _release(self, key: tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    @contextlib.contextmanager
+    def request(self, method: str, url: str,
+                headers: Optional[dict[str, str]] = None) -> Iterator[http.client.HTTPResponse]:
+        """
+        Send one request, without following redirects, and yield the response.
+
+        The connection goes back to the pool if the body was read to the end,
+        and is closed otherwise.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise urllib.error.URLError(f"Unsupported URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        reused = connection is not None
+        connection = connection or self._new_connection(key)
+        try:
+            try:
+                connection.request(method, target, headers=headers or {})
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server closed this keep-alive connection while it was idle.
+                connection.close()
+                connection = self._new_connection(key)
+                connection.request(method, target, headers=headers or {})
+                response = connection.getresponse()
+            yield response
+        except BaseException:
+            connection.close()
+            raise
+        if response.isclosed() and not response.will_close:
+            self._release(key, connection)
+        else:
+            connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class ResolveCache:
+    """Redirect chains resolved so far, persisted to `path` and trusted for `ttl` seconds."""
+
+    def __init__(self, path=RESOLVE_CACHE_PATH, ttl: float = RESOLVE_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Optional[dict[str, list]] = None
+
+    def _load(self) -> dict[str, list]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        now = time.time()
+        self._entries = {url: entry for url, entry in self._entries.items() if entry[-1] > now}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_open(self.path, "w") as f:
+            json.dump(self._entries, f)
+
+    def get(self, url: str) -> Optional[ResolvedUrl]:
+        with self._lock:
+            entry = self._load().get(url)
+        if entry is None or entry[-1] <= time.time():
+            return None
+        return ResolvedUrl(*entry)
+
+    def put(self, url: str, resolved: ResolvedUrl) -> None:
+        with self._lock:
+            self._load()[url] = list(resolved)
+            self._save()
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            if self._load().pop(url, None) is not None:
+                self._save()
+
+
+@functools.lru_cache(maxsize=None)
+def default_pool() -> ConnectionPool:
+    """The connection pool shared by every download in this process."""
+    return ConnectionPool()
+
+
+@functools.lru_cache(maxsize=None)
+def default_resolve_cache() -> ResolveCache:
+    return ResolveCache()
+
+
+def _content_range_total(response: http.client.HTTPResponse) -> Optional[int]:
+    match = _CONTENT_RANGE_TOTAL.search(response.getheader("Content-Range") or "")
+    return int(match.group(1)) if match else None
+
+
+def resolve(url: str, headers: Optional[dict[str, str]] = None, pool: Optional[ConnectionPool] = None,
+            cache: Optional[ResolveCache] = None) -> ResolvedUrl:
+    """
+    Follow `url`'s redirects to the file and return what the final server reports.
+
+    Each hop is a one-byte range request on a pooled connection, which also
+    tells whether the final server supports ranges. Results are cached.
+    """
+    pool = pool or default_pool()
+    cache = cache or default_resolve_cache()
+    cached = cache.get(url)
+    if cached is not None:
+        return cached
+
+    target = url
+    for _ in range(MAX_REDIRECTS + 1):
+        with pool.request("GET", target, {**(headers or {}), "Range": "bytes=0-0"}) as response:
+            if response.status in _REDIRECT_STATUSES and response.getheader("Location"):
+                response.read()
+                target = urllib.parse.urljoin(target, response.getheader("Location"))
+                continue
+            if response.status == 206:
+                size = _content_range_total(response)
+                accept_ranges = True
+                response.read()
+            elif response.status == 416:
+                # Only an empty file can't satisfy the first byte.
+                size, accept_ranges = 0, True
+                response.read()
+            elif response.status < 400:
+                # The range was ignored; don't download the whole body just to look at it.
+                length = response.getheader("Content-Length")
+                size = int(length) if length and length.isdigit() else None
+                accept_ranges = response.getheader("Accept-Ranges", "").lower() == "bytes"
+            else:
+                raise http_error(target, response)
+            resolved = ResolvedUrl(
+                url=target,
+                size=size,
+                etag=response.getheader("ETag"),
+                last_modified=response.getheader("Last-Modified"),
+                accept_ranges=accept_ranges,
+                content_type=response.getheader("Content-Type"),
+                expires_at=time.time() + cache.ttl,
+            )
+            break
+    else:
+        raise urllib.error.URLError(f"More than {MAX_REDIRECTS} redirects for {url}")
+
+    if target != url:
+        logger.info(f"Resolved {url} to {target}.")
+    cache.put(url, resolved)
+    return resolved
+
+
+def _preallocate(fd: int, size: int) -> None:
+    if hasattr(os, "posix_fallocate"):
+        os.posix_fallocate(fd, 0, size)
+    else:
+        os.ftruncate(fd, size)
+
+
+def fetch_segments(resolved: ResolvedUrl, path, headers: Optional[dict[str, str]] = None,
+                   done: Iterable[int] = (), on_segment: Optional[Callable[[int], None]] = None,
+                   progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                   pool: Optional[ConnectionPool] = None, segment_size: int = SEGMENT_SIZE,
+                   concurrency: int = SEGMENT_CONCURRENCY) -> None:
+    """
+    Download `resolved` into `path` as parallel byte ranges.
+
+    `path` is preallocated to the full size. Each range is read into a reused
+    buffer and written at its offset with `os.pwrite`, so nothing is joined in
+    memory. Segments listed in `done` are skipped, and `on_segment(index)` is
+    called as each one is synced to disk, so an interrupted download can resume.
+    Raises `ResourceChanged` if the server answers a range with anything but 206.
+    """
+    pool = pool or default_pool()
+    size = resolved.size
+    done = set(done)
+    todo = [i for i in range(-(-size // segment_size)) if i not in done]
+    downloaded = size - sum(min(segment_size, size - i * segment_size) for i in todo)
+    progress_lock = threading.Lock()
+    local = threading.local()
+
+    def fetch(index: int) -> int:
+        nonlocal downloaded
+        start = index * segment_size
+        end = min(start + segment_size, size) - 1
+        request_headers = {**(headers or {}), "Range": f"bytes={start}-{end}"}
+        if resolved.validator:
+            request_headers["If-Range"] = resolved.validator
+        if not hasattr(local, "buffer"):
+            local.buffer = memoryview(bytearray(READ_BUFFER_SIZE))
+        with pool.request("GET", resolved.url, request_headers) as response:
+            if response.status != 206:
+                raise ResourceChanged(f"Expected 206 for bytes {start}-{end}, got {response.status}")
+            offset = start
+            while offset <= end:
+                read = response.readinto(local.buffer[:end + 1 - offset])
+                if not read:
+                    raise http.client.IncompleteRead(b"", end + 1 - offset)
+                os.pwrite(fd, local.buffer[:read], offset)
+                offset += read
+                if progress:
+                    with progress_lock:
+                        downloaded += read
+                        progress(downloaded, size)
+            # Make sure the body is fully consumed so the connection can be reused.
+            response.read()
+        # On disk before `on_segment` records it, so a resume never skips a segment lost in a crash.
+        os.fsync(fd)
+        return index
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(fd).st_size != size:
+            _preallocate(fd, size)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            futures = [executor.submit(fetch, index) for index in todo]
+            for future in as_completed(futures):
+                index = future.result()
+                if on_segment:
+                    on_segment(index)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
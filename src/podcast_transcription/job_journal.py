@@ -0,0 +1,71 @@
+"""
+Append-only journal of episode progress for multi-episode runs.
+
+Each episode moves through queued -> submitted -> completed -> saved. Every
+state change is appended as one JSON line and fsync'd before the pipeline
+moves on, so after a crash the journal says exactly which episodes are done
+and which Modal function calls are still in flight.
+"""
+
+import json
+import os
+import pathlib
+import threading
+import time
+
+from .config import get_logger
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+# Sent to Modal. The record carries the `call_id` needed to re-attach.
+SUBMITTED = "submitted"
+# Result is in the transcription cache but not yet written to the output dir.
+COMPLETED = "completed"
+SAVED = "saved"
+
+
+class JobJournal:
+    """Crash-safe record of which episodes in a run have reached which state."""
+
+    def __init__(self, path: pathlib.Path):
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Start a fresh run, discarding any previous records."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+    def record(self, key: str, state: str, **fields) -> None:
+        """Durably append a state change for the episode identified by `key`."""
+        line = json.dumps({"key": key, "state": state, "time": time.time(), **fields}, ensure_ascii=False)
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, (line + "\n").encode("utf-8"))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def load(self) -> dict[str, dict]:
+        """
+        Replay the journal and return the latest state of every episode.
+
+        Fields from earlier records are kept unless overwritten, so eg. a
+        `completed` entry still has the `call_id` from `submitted`.
+        """
+        episodes: dict[str, dict] = {}
+        if not self.path.exists():
+            return episodes
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write; everything before it is intact.
+                    logger.warning(f"Ignoring incomplete journal record in {self.path}")
+                    continue
+                episodes.setdefault(entry["key"], {}).update(entry)
+        return episodes
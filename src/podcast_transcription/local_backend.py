@@ -0,0 +1,337 @@
+"""
+Local CPU transcription backend.
+
+`LocalModel.transcribe` takes the same arguments and returns the same compact
+result as `modal_client.Model.transcribe`, without Modal: audio is downloaded
+and decoded on this machine, and Whisper runs on the CPU with its linear
+layers dynamically quantized to int8. The 30 s windows are shared out to a
+pool of worker processes, each of which loads the weights once and keeps them
+for the life of the `LocalModel`.
+
+`TEST_MODEL_NAME` selects a tiny randomly initialized Whisper that is built
+on the spot, so tests run offline. Its transcripts are gibberish.
+"""
+
+import importlib.util
+import json
+import os
+import pathlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Optional
+
+from .config import LOCAL_CACHE_DIR, get_logger
+from .modal_client import (
+    CHUNK_LENGTH_S,
+    SAMPLE_RATE,
+    audio_cache_key,
+    compact_result,
+    decode_to_npy,
+    prepare_audio,
+    remap_chunks,
+    whisper_model_id,
+)
+from .podcast_discovery import store_original_audio
+
+logger = get_logger(__name__)
+
+# Downloaded episode audio, by audio key. Never evicted; delete it freely.
+LOCAL_AUDIO_DIR = LOCAL_CACHE_DIR / "audio"
+LOCAL_MODEL_DIR = LOCAL_CACHE_DIR / "models"
+# Big models are very slow on a CPU; short clips are what this backend is for.
+DEFAULT_LOCAL_MODEL_NAME = "base.en"
+TEST_MODEL_NAME = "tiny-random"
+# Windows per task sent to a worker, decoded as one batch.
+LOCAL_BATCH_SIZE = 4
+MAX_LOCAL_WORKERS = 4
+
+# The pipeline of the worker process this module is loaded in.
+_worker_pipe = None
+
+
+def _import_torch():
+    try:
+        import torch
+    except ImportError:
+        raise ImportError("The local backend needs PyTorch: pip install torch") from None
+    return torch
+
+
+def tiny_whisper_dir(directory: pathlib.Path = LOCAL_MODEL_DIR / "whisper-tiny-random") -> pathlib.Path:
+    """
+    A tiny randomly initialized Whisper checkpoint, written to `directory` on first use.
+
+    The vocabulary is the 256 byte-level tokens plus Whisper's special and
+    timestamp tokens, so it decodes and timestamps like a real checkpoint.
+    Weights are seeded, so every build is identical.
+    """
+    if (directory / "config.json").exists():
+        return directory
+
+    torch = _import_torch()
+    from transformers import GenerationConfig, WhisperConfig, WhisperFeatureExtractor, WhisperForConditionalGeneration
+
+    # GPT-2's printable stand-ins for the 256 byte values.
+    printable = [*range(ord("!"), ord("~") + 1), *range(ord("¡"), ord("¬") + 1), *range(ord("®"), ord("ÿ") + 1)]
+    unprintable = [b for b in range(256) if b not in printable]
+    byte_tokens = [chr(b) for b in printable] + [chr(256 + i) for i in range(len(unprintable))]
+    languages = ["<|en|>", "<|es|>"]
+    specials = ["<|endoftext|>", "<|startoftranscript|>", *languages, "<|translate|>", "<|transcribe|>",
+                "<|startoflm|>", "<|startofprev|>", "<|nospeech|>", "<|notimestamps|>"]
+    # Timestamp tokens must directly follow the last special token.
+    timestamps = [f"<|{i * 0.02:.2f}|>" for i in range(1501)]
+    vocab = {token: i for i, token in enumerate(byte_tokens + specials + timestamps)}
+
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = pathlib.Path(tempfile.mkdtemp(prefix=f".{directory.name}.", dir=directory.parent))
+    (tmp_dir / "vocab.json").write_text(json.dumps(vocab), encoding="utf-8")
+    (tmp_dir / "merges.txt").write_text("#version: 0.2\n", encoding="utf-8")
+    (tmp_dir / "tokenizer_config.json").write_text(json.dumps({
+        "tokenizer_class": "WhisperTokenizer",
+        "additional_special_tokens": specials[1:],
+        "bos_token": "<|endoftext|>", "eos_token": "<|endoftext|>",
+        "pad_token": "<|endoftext|>", "unk_token": "<|endoftext|>",
+    }), encoding="utf-8")
+    WhisperFeatureExtractor(feature_size=80).save_pretrained(tmp_dir)
+
+    token_ids = {
+        "decoder_start_token_id": vocab["<|startoftranscript|>"],
+        "bos_token_id": vocab["<|endoftext|>"],
+        "eos_token_id": vocab["<|endoftext|>"],
+        "pad_token_id": vocab["<|endoftext|>"],
+    }
+    config = WhisperConfig(
+        vocab_size=len(vocab), num_mel_bins=80, d_model=64, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=128, decoder_ffn_dim=128,
+        max_source_positions=1500, max_target_positions=448, suppress_tokens=[], begin_suppress_tokens=[],
+        **token_ids,
+    )
+    torch.manual_seed(0)
+    model = WhisperForConditionalGeneration(config)
+    model.generation_config = GenerationConfig(
+        **token_ids,
+        no_timestamps_token_id=vocab["<|notimestamps|>"],
+        prev_sot_token_id=vocab["<|startofprev|>"],
+        is_multilingual=True,
+        lang_to_id={language: vocab[language] for language in languages},
+        task_to_id={"transcribe": vocab["<|transcribe|>"], "translate": vocab["<|translate|>"]},
+        max_initial_timestamp_index=50,
+        max_length=64,
+        suppress_tokens=[],
+        begin_suppress_tokens=[vocab["<|endoftext|>"]],
+    )
+    model.save_pretrained(tmp_dir)
+    try:
+        os.replace(tmp_dir, directory)
+    except OSError:
+        # Built concurrently by another process; keep theirs.
+        import shutil
+
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return directory
+
+
+def model_source(model_name: str) -> str:
+    """Hugging Face id or local directory to load `model_name` from."""
+    return str(tiny_whisper_dir()) if model_name == TEST_MODEL_NAME else whisper_model_id(model_name)
+
+
+def load_pipeline(model_name: str, quantize: bool = True):
+    """A CPU Whisper pipeline for `model_name`, with int8 linear layers if `quantize`."""
+    torch = _import_torch()
+    from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
+
+    source = model_source(model_name)
+    model = AutoModelForSpeechSeq2Seq.from_pretrained(source, torch_dtype=torch.float32, low_cpu_mem_usage=True)
+    model.eval()
+    if quantize:
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    processor = AutoProcessor.from_pretrained(source)
+    return pipeline(
+        "automatic-speech-recognition",
+        model=model,
+        tokenizer=processor.tokenizer,
+        feature_extractor=processor.feature_extractor,
+        device="cpu",
+        return_timestamps=True,
+    )
+
+
+def _init_worker(model_name: str, quantize: bool, threads: int) -> None:
+    global _worker_pipe
+    _import_torch().set_num_threads(threads)
+    _worker_pipe = load_pipeline(model_name, quantize)
+
+
+def _decode_windows(pcm_path: str, windows: list[tuple], generate_kwargs: dict) -> list[dict]:
+    """Worker task: decode `(start, end, stride, is_last)` windows of the PCM at `pcm_path` as one batch."""
+    import numpy as np
+
+    pcm = np.load(pcm_path, mmap_mode="r")
+    features = _worker_pipe.feature_extractor(
+        [np.asarray(pcm[start:end], dtype=np.float32) for start, end, _, _ in windows],
+        sampling_rate=SAMPLE_RATE,
+        return_tensors="pt",
+        return_attention_mask=True,
+    )
+    batch = {
+        "input_features": features["input_features"],
+        "attention_mask": features["attention_mask"],
+        "stride": [stride for _, _, stride, _ in windows],
+        "is_last": [is_last for _, _, _, is_last in windows],
+    }
+    tokens = _worker_pipe.forward(batch, return_timestamps=True, **generate_kwargs)["tokens"]
+    return [
+        {"tokens": tokens[i:i + 1], "stride": stride, "is_last": is_last}
+        for i, (_, _, stride, is_last) in enumerate(windows)
+    ]
+
+
+def _merge_windows(outputs: list[dict]) -> dict:
+    """Worker task: merge decoded windows into one result, as the HF pipeline does."""
+    return _worker_pipe.postprocess(outputs, return_timestamps=True)
+
+
+def _decode_whole(pcm_path: str, generate_kwargs: dict) -> dict:
+    """Worker task: Whisper's sequential long-form decoding of the whole PCM."""
+    import numpy as np
+
+    pcm = np.asarray(np.load(pcm_path, mmap_mode="r"), dtype=np.float32)
+    return _worker_pipe({"raw": pcm, "sampling_rate": SAMPLE_RATE}, generate_kwargs=generate_kwargs)
+
+
+def window_bounds(samples: int, chunk_length_s: float,
+                  stride_length_s: Optional[float] = None) -> list[tuple[int, int, tuple[int, int, int], bool]]:
+    """
+    `(start, end, stride, is_last)` for each window of `samples` samples, as the HF pipeline cuts them.
+
+    `stride` is `(window length, left overlap, right overlap)` in samples.
+    """
+    stride_length_s = chunk_length_s / 6 if stride_length_s is None else stride_length_s
+    chunk = int(round(chunk_length_s * SAMPLE_RATE))
+    overlap = int(round(stride_length_s * SAMPLE_RATE))
+    if chunk < 2 * overlap:
+        raise ValueError("Chunk length must be superior to stride length")
+    windows = []
+    for start in range(0, samples, chunk - 2 * overlap):
+        end = min(start + chunk, samples)
+        is_last = start + chunk >= samples
+        left, right = (0 if start == 0 else overlap), (0 if is_last else overlap)
+        if end - start > left:
+            windows.append((start, end, (end - start, left, right), is_last))
+        if is_last:
+            break
+    return windows
+
+
+class LocalModel:
+    """
+    Whisper on the local CPU, with the interface of the Modal `Model` class.
+
+    `workers` processes (default: up to `MAX_LOCAL_WORKERS`, one per core)
+    each load `model_name` once, on first use, and split the cores between
+    them. Call `close()`, or use the instance as a context manager, to stop
+    them.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_LOCAL_MODEL_NAME, workers: Optional[int] = None,
+                 quantize: bool = True):
+        if importlib.util.find_spec("torch") is None:
+            # Fail here rather than in every worker process.
+            _import_torch()
+        cores = os.cpu_count() or 1
+        self.model_name = model_name
+        self.workers = workers or min(cores, MAX_LOCAL_WORKERS)
+        self.quantize = quantize
+        self._threads = max(1, cores // self.workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            if self.model_name == TEST_MODEL_NAME:
+                # Build it once here rather than racing in every worker.
+                tiny_whisper_dir()
+            logger.info(f"🖥️  Loading {self.model_name} in {self.workers} local worker processes")
+            # Forked workers would inherit torch's thread pools in an unusable state.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.quantize, self._threads),
+            )
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self) -> "LocalModel":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _audio_path(self, audio_url: str, audio_key: str, audio_path: Optional[str]) -> str:
+        if audio_path and os.path.exists(audio_path):
+            return audio_path
+        if os.path.exists(audio_url):
+            return audio_url
+        destination = LOCAL_AUDIO_DIR / audio_key
+        store_original_audio(audio_url, destination)
+        return str(destination)
+
+    def _run_pipeline(self, pcm_path: str, language: Optional[str], chunk_length_s: Optional[int] = None,
+                      stride_length_s: Optional[float] = None, batch_size: Optional[int] = None,
+                      vad: bool = False) -> dict:
+        """`Model._run_pipeline` on the worker pool, for PCM saved at `pcm_path`."""
+        import numpy as np
+
+        pcm = np.load(pcm_path, mmap_mode="r")
+        prepared = prepare_audio(pcm, language, vad, log=lambda message: logger.info(f"🖥️  {message}"))
+        if prepared is None:
+            return {"text": "", "chunks": []}
+        speech_pcm, spans, generate_kwargs = prepared
+        if spans:
+            # Workers read the audio from disk, so save the joined speech for them.
+            pcm_path = f"{pcm_path[:-len('.npy')]}-speech.npy"
+            np.save(pcm_path, speech_pcm)
+            pcm = speech_pcm
+
+        chunk_length_s = CHUNK_LENGTH_S if chunk_length_s is None else chunk_length_s
+        if chunk_length_s:
+            windows = window_bounds(len(pcm), chunk_length_s, stride_length_s)
+            batch_size = batch_size or LOCAL_BATCH_SIZE
+            shards = [windows[i:i + batch_size] for i in range(0, len(windows), batch_size)]
+            futures = [self.pool.submit(_decode_windows, pcm_path, shard, generate_kwargs) for shard in shards]
+            outputs = [output for future in futures for output in future.result()]
+            result = self.pool.submit(_merge_windows, outputs).result()
+        else:
+            result = self.pool.submit(_decode_whole, pcm_path, generate_kwargs).result()
+        if spans:
+            result["chunks"] = remap_chunks(result.get("chunks") or [], spans)
+        return result
+
+    def transcribe(self, audio_url: str, language: Optional[str] = None, audio_key: Optional[str] = None,
+                   audio_path: Optional[str] = None, chunk_length_s: Optional[int] = None,
+                   stride_length_s: Optional[float] = None, batch_size: Optional[int] = None,
+                   vad: bool = False) -> Optional[dict]:
+        """
+        Transcribe like `Model.transcribe`; `audio_url` may also be a local file.
+
+        `batch_size` is the number of windows per worker task. Returns None on failure.
+        """
+        audio_key = audio_key or audio_cache_key(audio_url)
+        try:
+            audio_path = self._audio_path(audio_url, audio_key, audio_path)
+            with tempfile.TemporaryDirectory(prefix="podcast-pcm-") as tmp_dir:
+                pcm_path = os.path.join(tmp_dir, f"{audio_key}.npy")
+                samples = decode_to_npy(audio_path, pcm_path)
+                logger.info(f"🖥️  Transcribing {audio_key} locally ({samples / SAMPLE_RATE:.0f}s of audio)")
+                result = self._run_pipeline(pcm_path, language, chunk_length_s, stride_length_s, batch_size, vad)
+            return compact_result(result, duration=samples / SAMPLE_RATE)
+        except Exception as e:
+            logger.error(f"❌ Local transcription of {audio_key} failed: {e}")
+            return None
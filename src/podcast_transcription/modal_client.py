@@ -2,15 +2,53 @@
 Modal cloud integration for podcast transcription using H100 GPUs and Whisper-large-v3.
 """
 
+import collections
+import functools
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
 import modal
 
-cuda_version = "12.4.0"  # should be no greater than host CUDA version
-flavor = "devel"  #  includes full CUDA toolkit
-operating_sys = "ubuntu22.04"
-tag = f"{cuda_version}-{flavor}-{operating_sys}"
+GPU_CONFIG = "H100"
+# Whisper checkpoint names as in `config.supported_whisper_models`. Each name
+# gets its own container pool, since `Model` is parameterized by it.
+DEFAULT_MODEL_NAME = "large-v3"
+
+
+def whisper_model_id(model_name: str) -> str:
+    """Hugging Face id of a Whisper checkpoint, eg. 'base.en' -> 'openai/whisper-base.en'."""
+    return f"openai/whisper-{model_name}"
+
+
+# Weights baked into the image at build time, one directory per checkpoint
+# name, so a new container doesn't fetch them from the network volume. Other
+# checkpoints are still loaded through the volume's Hugging Face cache.
+BAKED_MODEL_DIR = "/models"
+BAKED_MODEL_NAMES = (DEFAULT_MODEL_NAME,)
+# Only what `from_pretrained` needs. The repos also carry .bin, .msgpack and .h5
+# copies, and large-v3 has fp32 safetensors shards next to its fp16 model.safetensors.
+BAKED_MODEL_PATTERNS = ["*.json", "*.txt", "model.safetensors"]
+
+
+def baked_model_path(model_name: str) -> str:
+    return f"{BAKED_MODEL_DIR}/{model_name}"
+
+
+def bake_model_weights() -> None:
+    """Image build step: download `BAKED_MODEL_NAMES` into `BAKED_MODEL_DIR`."""
+    from huggingface_hub import snapshot_download
+
+    for model_name in BAKED_MODEL_NAMES:
+        snapshot_download(whisper_model_id(model_name), local_dir=baked_model_path(model_name),
+                          allow_patterns=BAKED_MODEL_PATTERNS)
 
+
+# The torch wheels bundle the CUDA runtime they need, so a slim base image is
+# enough; the CUDA `devel` image added several GB to every cold start.
 image = (
-    modal.Image.from_registry(f"nvidia/cuda:{tag}", add_python="3.11")
+    modal.Image.debian_slim(python_version="3.11")
     .apt_install(
         "git",
         "ffmpeg",
@@ -23,15 +61,61 @@ image = (
     )
     .pip_install(
         "transformers",
+        "accelerate",
+        "huggingface_hub",
         "ffmpeg-python",
     )
+    .run_function(bake_model_weights)
 )
-app = modal.App("example-base-whisper", image=image)
+# Audio prefetching only needs HTTP, not CUDA or torch.
+download_image = modal.Image.debian_slim(python_version="3.11").pip_install("requests")
+APP_NAME = "example-base-whisper"
+app = modal.App(APP_NAME, image=image)
 
-GPU_CONFIG = "H100"
+MODEL_ID = whisper_model_id(DEFAULT_MODEL_NAME)
+# Long-form audio is cut into 30 s windows (Whisper's input length) that overlap
+# by `chunk_length_s / 6` on each side, and decoded `batch_size` windows at a
+# time. The batch sizes fit whisper-large-v3 in fp16 on each GPU class.
+CHUNK_LENGTH_S = 30
+BATCH_SIZES = {"H100": 32, "A100-80GB": 32, "A100": 16, "L40S": 16, "A10G": 8, "L4": 8, "T4": 4}
+BATCH_SIZE = BATCH_SIZES.get(GPU_CONFIG, 8)
+# Windows from every in-flight request share GPU batches. A batch that isn't
+# full starts once its oldest window has waited this long.
+BATCH_MAX_WAIT_S = 0.05
 
 CACHE_DIR = "/cache"
 cache_vol = modal.Volume.from_name("whisper-cache", create_if_missing=True)
+# Downloaded episode audio on the volume, matching `config.RAW_AUDIO_DIR`. Files
+# are stored once under blobs/{sha256}; '{audio_key}.json' points at the blob.
+RAW_AUDIO_DIR = f"{CACHE_DIR}/raw_audio"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# `cache_vol.reload()` fails while other inputs on the container have volume
+# files open; it is tried this many times, waiting a little longer each time.
+VOLUME_RELOAD_ATTEMPTS = 3
+VOLUME_RELOAD_RETRY_S = 1
+# Prefetching evicts the least recently used audio beyond this many bytes.
+RAW_AUDIO_BUDGET = 50 * 1024 ** 3
+# Audio decoded to 16 kHz mono float16 PCM, as '{audio_key}.npy', on the volume
+# and on the container's local disk, each capped at its budget in bytes.
+SAMPLE_RATE = 16000
+PCM_CACHE_DIR = f"{CACHE_DIR}/pcm"
+PCM_CACHE_BUDGET = 100 * 1024 ** 3
+LOCAL_PCM_CACHE_DIR = "/tmp/pcm"
+LOCAL_PCM_CACHE_BUDGET = 20 * 1024 ** 3
+# Bytes of ffmpeg's stderr kept for the error message when decoding fails.
+FFMPEG_ERROR_TAIL = 4096
+# Optional voice activity detection, run on the CPU before Whisper. Frames of
+# VAD_FRAME_S seconds at least VAD_THRESHOLD_DB louder than the episode's noise
+# floor count as speech. Runs of speech shorter than VAD_MIN_SPEECH_S are
+# dropped, the rest are padded by VAD_PAD_S on each side and merged across
+# gaps shorter than VAD_MIN_GAP_S.
+VAD_FRAME_S = 0.03
+VAD_THRESHOLD_DB = 12.0
+# The threshold never drops below this level (dBFS), so digital silence doesn't make hiss count as speech.
+VAD_FLOOR_DB = -50.0
+VAD_MIN_SPEECH_S = 0.25
+VAD_PAD_S = 0.3
+VAD_MIN_GAP_S = 1.0
 
 @app.cls(
     gpu=GPU_CONFIG,
@@ -41,11 +125,24 @@ cache_vol = modal.Volume.from_name("whisper-cache", create_if_missing=True)
 )
 @modal.concurrent(max_inputs=15)
 class Model:
+    model_name: str = modal.parameter(default=DEFAULT_MODEL_NAME)
+
     @modal.enter()
     def setup(self):
+        started = time.perf_counter()
+        timings = {}
+
+        def phase(name: str) -> None:
+            nonlocal started
+            now = time.perf_counter()
+            timings[name] = round(now - started, 3)
+            started = now
+
+        import os
         import torch
         import warnings
         from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
+        phase("imports")
 
         # Suppress specific warnings for cleaner output
         warnings.filterwarnings("ignore", category=FutureWarning, module="transformers")
@@ -53,19 +150,29 @@ class Model:
         device = "cuda:0" if torch.cuda.is_available() else "cpu"
         torch_dtype = torch.float16 if torch.cuda.is_available() else torch.float32
         
-        model_id = "openai/whisper-large-v3"
+        model_id = whisper_model_id(self.model_name)
+        baked_path = baked_model_path(self.model_name)
+        # Baked weights skip the volume; other checkpoints go through its HF cache.
+        source, cache_dir = (baked_path, None) if os.path.isdir(baked_path) else (model_id, CACHE_DIR)
         
-        print(f"Loading model: {model_id}")
+        print(f"Loading model: {model_id} from {source}")
+        # The safetensors files are memory-mapped and each tensor is copied
+        # straight to `device`, instead of materializing the model on the CPU first.
         model = AutoModelForSpeechSeq2Seq.from_pretrained(
-            model_id, 
+            source, 
             torch_dtype=torch_dtype, 
             low_cpu_mem_usage=True, 
             use_safetensors=True,
-            cache_dir=CACHE_DIR
+            device_map=device,
+            cache_dir=cache_dir
         )
-        model.to(device)
+        phase("weights")
+        if torch.cuda.is_available():
+            # Copies to the GPU are asynchronous; wait so they count here.
+            torch.cuda.synchronize()
+        phase("device")
         
-        processor = AutoProcessor.from_pretrained(model_id, cache_dir=CACHE_DIR)
+        processor = AutoProcessor.from_pretrained(source, cache_dir=cache_dir)
         
         # Create pipeline with improved parameters
         self.pipe = pipeline(
@@ -74,46 +181,882 @@ class Model:
             tokenizer=processor.tokenizer,
             feature_extractor=processor.feature_extractor,
             torch_dtype=torch_dtype,
-            device=device,
+            # No `device`: the pipeline takes it from the model's device map.
             return_timestamps=True,
         )
+        self.batcher = WindowBatcher(self._forward_windows)
+        # `preprocess` and `postprocess` share the pipeline's feature extractor
+        # and Rust tokenizer, which concurrent inputs must not use at once.
+        self._pipe_lock = threading.Lock()
+        phase("pipeline")
+        self.setup_timings = timings
+        print("Setup took " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+              + f" ({sum(timings.values()):.2f}s total)")
 
     @modal.method()
-    def transcribe(self, audio_url: str, language: str | None = None):
-        import requests # type: ignore
+    def ping(self) -> dict:
+        """
+        Readiness probe. Only answered once `setup` has run, so a reply means
+        the model is loaded. `setup_seconds` times each phase of the cold start.
+        """
+        return {"ready": hasattr(self, "pipe"), "model": whisper_model_id(self.model_name),
+                "setup_seconds": getattr(self, "setup_timings", {})}
+
+    def _pcm(self, audio_url: str, audio_key: str | None, audio_path: str | None):
         import os
 
-        response = requests.get(audio_url)
-        # Save the audio file locally
-        with open("downloaded_audio.wav", "wb") as audio_file:
-            audio_file.write(response.content)
+        audio_key = audio_key or audio_cache_key(audio_url)
+        pcm = load_pcm(audio_key)
+        if pcm is None:
+            # A prefetched path may have been evicted since; fall back to the URL.
+            if not (audio_path and os.path.exists(audio_path)):
+                audio_path = fetch_audio(audio_url, audio_key)
+            pcm = decode_pcm(audio_path, audio_key)
+        return audio_key, pcm
 
-        if not os.path.exists("downloaded_audio.wav"):
-            raise FileNotFoundError("Audio file not found: downloaded_audio.wav")
-        
-        print(f"Transcribing: downloaded_audio.wav")
-        
-        # Prepare generation kwargs to avoid conflicts with forced_decoder_ids
-        generate_kwargs = {
-            "task": "transcribe",  # Explicitly set task
-        }
+    def _run_pipeline(self, pcm, language: str | None, chunk_length_s: int | None = None,
+                      stride_length_s: float | None = None, batch_size: int | None = None,
+                      vad: bool = False) -> dict:
+        """
+        Run Whisper over decoded audio, in batched windows unless `chunk_length_s` is 0.
+
+        0 selects Whisper's sequential long-form decoding. `None` uses the
+        defaults for this GPU class. With `vad`, only the speech found by
+        `speech_regions` is transcribed, and timestamps still refer to the
+        whole episode.
+        """
+        prepared = prepare_audio(pcm, language, vad)
+        if prepared is None:
+            return {"text": "", "chunks": []}
+        pcm, spans, generate_kwargs = prepared
+        chunk_length_s = CHUNK_LENGTH_S if chunk_length_s is None else chunk_length_s
         
-        if language:
-            generate_kwargs["language"] = language
-            # Clear any forced_decoder_ids to avoid conflicts
-            generate_kwargs["forced_decoder_ids"] = None  # type: ignore
-            print(f"Using language: {language}")
+        if chunk_length_s:
+            futures = self._submit_windows(pcm, generate_kwargs, chunk_length_s, stride_length_s,
+                                           batch_size or BATCH_SIZE)
+            outputs = [future.result() for future, _ in futures]
+            with self._pipe_lock:
+                result = self.pipe.postprocess(outputs, return_timestamps=True)
         else:
-            print("Using automatic language detection")
-        
+            # Sequential decoding can't share batches, so it gets the GPU to itself.
+            result = self.batcher.call(lambda: self._decode_sequentially(pcm, generate_kwargs))
+        if spans:
+            result["chunks"] = remap_chunks(result.get("chunks") or [], spans)
+        return result
+
+    def _stream_pipeline(self, pcm, language: str | None, chunk_length_s: int | None = None,
+                         stride_length_s: float | None = None, batch_size: int | None = None,
+                         vad: bool = False):
+        """
+        Like `_run_pipeline`, but yield compact `[start, end, text]` chunks as
+        each batch of windows is decoded.
+
+        After every batch the windows decoded so far are merged again, and the
+        chunks that end before the next window starts are yielded. Later
+        windows only overlap audio after that point, so those chunks are final.
+        Sequential decoding (`chunk_length_s` 0) yields everything at the end.
+        """
+        duration = len(pcm) / SAMPLE_RATE
+        prepared = prepare_audio(pcm, language, vad)
+        if prepared is None:
+            return
+        pcm, spans, generate_kwargs = prepared
+        chunk_length_s = CHUNK_LENGTH_S if chunk_length_s is None else chunk_length_s
+        batch_size = batch_size or BATCH_SIZE
+
+        def settled_chunks(chunks: list[dict], until_s: float | None) -> list[dict]:
+            if until_s is not None:
+                chunks = list(itertools.takewhile(
+                    lambda chunk: chunk["timestamp"][1] is not None and chunk["timestamp"][1] <= until_s, chunks
+                ))
+            return remap_chunks(chunks, spans) if spans else chunks
+
+        if not chunk_length_s:
+            result = self.batcher.call(lambda: self._decode_sequentially(pcm, generate_kwargs))
+            yield compact_result({"chunks": settled_chunks(result.get("chunks") or [], None)}, duration)["chunks"]
+            return
+
+        futures = self._submit_windows(pcm, generate_kwargs, chunk_length_s, stride_length_s, batch_size)
+        emitted = 0
+        for end in range(batch_size, len(futures) + batch_size, batch_size):
+            end = min(end, len(futures))
+            # `postprocess` modifies the outputs it merges, so give it copies.
+            outputs = [dict(future.result()) for future, _ in futures[:end]]
+            until_s = futures[end][1] / SAMPLE_RATE if end < len(futures) else None
+            with self._pipe_lock:
+                result = self.pipe.postprocess(outputs, return_timestamps=True)
+            # Restitching the settled prefix keeps the yielded chunks identical to `transcribe`'s.
+            chunks = compact_result({"chunks": settled_chunks(result.get("chunks") or [], until_s)},
+                                    duration if until_s is None else None)["chunks"]
+            if len(chunks) > emitted:
+                yield chunks[emitted:]
+                emitted = len(chunks)
+
+    def _submit_windows(self, pcm, generate_kwargs: dict, chunk_length_s: int, stride_length_s: float | None,
+                        batch_size: int) -> list[tuple[Future, int]]:
+        """
+        Cut `pcm` into windows and queue them on `self.batcher`.
+
+        Windows are handed over `batch_size` at a time as their features are
+        extracted, so decoding starts before the whole episode is prepared.
+        Returns each window's future with the sample the window starts at.
+        """
+        key = tuple(sorted(generate_kwargs.items()))
+        futures: list[tuple[Future, int]] = []
+        windows, starts = [], []
+        start, previous_stride = 0, None
+        # The memory-mapped PCM is sliced per window, and the feature extractor casts each slice to float32.
+        inputs = {"raw": pcm, "sampling_rate": SAMPLE_RATE}
+        preprocessed = self.pipe.preprocess(inputs, chunk_length_s=chunk_length_s, stride_length_s=stride_length_s)
+        for window in iter_locked(self._pipe_lock, preprocessed):
+            if previous_stride is not None:
+                # `stride` is (length, left, right) in samples; neighbours overlap by left + right.
+                length, _, right = previous_stride
+                start += length - right - window["stride"][1]
+            previous_stride = window["stride"]
+            windows.append(window)
+            starts.append(start)
+            if len(windows) == batch_size:
+                futures += zip(self.batcher.submit(windows, batch_size, key), starts)
+                windows, starts = [], []
+        if windows:
+            futures += zip(self.batcher.submit(windows, batch_size, key), starts)
+        return futures
+
+    def _decode_sequentially(self, pcm, generate_kwargs: dict) -> dict:
+        """Whisper's own long-form decoding, run through the whole pipeline."""
+        with self._pipe_lock:
+            return self.pipe({"raw": pcm, "sampling_rate": SAMPLE_RATE}, generate_kwargs=generate_kwargs)
+
+    def _forward_windows(self, key: tuple, windows: list[dict]) -> list[dict]:
+        """Decode preprocessed windows, from any mix of requests, as one GPU batch."""
+        import torch
+
+        batch = {
+            name: torch.cat([window[name] for window in windows])
+            for name in ("input_features", "attention_mask") if name in windows[0]
+        }
+        batch["stride"] = [window["stride"] for window in windows]
+        batch["is_last"] = [window["is_last"] for window in windows]
+        tokens = self.pipe.forward(batch, return_timestamps=True, **dict(key))["tokens"]
+        return [
+            {"tokens": tokens[i:i + 1], "stride": window["stride"], "is_last": window["is_last"]}
+            for i, window in enumerate(windows)
+        ]
+
+    @modal.method()
+    def transcribe(self, audio_url: str, language: str | None = None, audio_key: str | None = None,
+                   audio_path: str | None = None, chunk_length_s: int | None = None,
+                   stride_length_s: float | None = None, batch_size: int | None = None, vad: bool = False):
+        audio_key, pcm = self._pcm(audio_url, audio_key, audio_path)
+        print(f"Transcribing: {audio_key} ({len(pcm) / SAMPLE_RATE:.0f}s of audio)")
         try:
-            # Call pipeline with proper parameters
-            result = self.pipe("downloaded_audio.wav", generate_kwargs=generate_kwargs)
-            return result
+            result = self._run_pipeline(pcm, language, chunk_length_s, stride_length_s, batch_size, vad)
+            return compact_result(result, duration=len(pcm) / SAMPLE_RATE)
         except Exception as e:
             print(f"Error during transcription: {str(e)}")
             return None
 
+    @modal.method(is_generator=True)
+    def transcribe_stream(self, audio_url: str, language: str | None = None, audio_key: str | None = None,
+                          audio_path: str | None = None, chunk_length_s: int | None = None,
+                          stride_length_s: float | None = None, batch_size: int | None = None, vad: bool = False):
+        """
+        Like `transcribe`, but yield lists of compact `[start, end, text]`
+        chunks as the audio is decoded. Together they are `transcribe`'s chunks.
+        Errors are raised to the caller, since a stream can't return None.
+        """
+        audio_key, pcm = self._pcm(audio_url, audio_key, audio_path)
+        print(f"Streaming transcription: {audio_key} ({len(pcm) / SAMPLE_RATE:.0f}s of audio)")
+        try:
+            yield from self._stream_pipeline(pcm, language, chunk_length_s, stride_length_s, batch_size, vad)
+        except Exception as e:
+            print(f"Error during transcription: {str(e)}")
+            raise
+
+    @modal.method()
+    def benchmark(self, audio_url: str, configs: list[dict], language: str | None = None,
+                  audio_key: str | None = None) -> list[dict]:
+        """
+        Time `_run_pipeline` once per config (`chunk_length_s`, `stride_length_s`, `batch_size`, `vad`) on the same audio.
+
+        Each result adds `seconds` and the real-time factor `rtf`, which is
+        inference time divided by audio duration. Audio is decoded before
+        timing starts, and the first config also pays for CUDA warm-up.
+        """
+        import torch
+
+        audio_key, pcm = self._pcm(audio_url, audio_key, None)
+        duration = len(pcm) / SAMPLE_RATE
+        results = []
+        for config in configs:
+            if torch.cuda.is_available():
+                torch.cuda.synchronize()
+            started = time.perf_counter()
+            self._run_pipeline(pcm, language, **config)
+            if torch.cuda.is_available():
+                torch.cuda.synchronize()
+            seconds = time.perf_counter() - started
+            results.append({**config, "audio_seconds": round(duration, 1), "seconds": round(seconds, 2),
+                            "rtf": round(seconds / duration, 4)})
+            print(f"Benchmark {config}: {seconds:.1f}s for {duration:.0f}s of audio (RTF {seconds / duration:.4f})")
+        return results
+
+
+def iter_locked(lock: threading.Lock, iterable):
+    """Yield from `iterable`, advancing it only while holding `lock`."""
+    iterator = iter(iterable)
+    while True:
+        with lock:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+class WindowBatcher:
+    """
+    Collects audio windows from concurrent requests into GPU batches.
+
+    A single worker thread calls `forward(key, windows)`, so it is the only
+    thread that runs the model. Windows are batched first come, first served
+    with others submitted under the same `key` and batch size, and a batch
+    starts when it is full or when its oldest window has waited `max_wait_s`.
+    """
+
+    def __init__(self, forward, max_wait_s: float = BATCH_MAX_WAIT_S):
+        self.forward = forward
+        self.max_wait_s = max_wait_s
+        # (batch size, key) -> (window, future, submitted at)
+        self._pending: dict[tuple, collections.deque] = {}
+        self._calls: collections.deque = collections.deque()
+        self._condition = threading.Condition()
+        threading.Thread(target=self._work, name="window-batcher", daemon=True).start()
+
+    def submit(self, windows: list, batch_size: int, key: tuple = ()) -> list[Future]:
+        """Queue `windows` for decoding. Each future resolves to that window's output."""
+        futures = [Future() for _ in windows]
+        with self._condition:
+            queue = self._pending.setdefault((batch_size, key), collections.deque())
+            now = time.monotonic()
+            queue.extend((window, future, now) for window, future in zip(windows, futures))
+            self._condition.notify()
+        return futures
+
+    def call(self, fn):
+        """Run `fn` on the worker thread, ahead of any queued batch, and return its result."""
+        future = Future()
+        with self._condition:
+            self._calls.append((fn, future))
+            self._condition.notify()
+        return future.result()
+
+    def _next_batch(self) -> tuple[tuple | None, list]:
+        """The next `(group, [(window, future, submitted at), ...])`; exclusive calls come as group None."""
+        with self._condition:
+            while True:
+                if self._calls:
+                    fn, future = self._calls.popleft()
+                    return None, [(fn, future, None)]
+                now = time.monotonic()
+                ready, timeout = None, None
+                for group, queue in self._pending.items():
+                    oldest = queue[0][2]
+                    if len(queue) >= group[0] or oldest + self.max_wait_s <= now:
+                        if ready is None or oldest < self._pending[ready][0][2]:
+                            ready = group
+                    else:
+                        due = oldest + self.max_wait_s - now
+                        timeout = due if timeout is None else min(timeout, due)
+                if ready is not None:
+                    queue = self._pending[ready]
+                    batch = [queue.popleft() for _ in range(min(ready[0], len(queue)))]
+                    if not queue:
+                        del self._pending[ready]
+                    return ready, batch
+                self._condition.wait(timeout)
+
+    def _work(self) -> None:
+        while True:
+            group, batch = self._next_batch()
+            futures = [future for _, future, _ in batch]
+            try:
+                if group is None:
+                    results = [batch[0][0]()]
+                else:
+                    results = self.forward(group[1], [window for window, _, _ in batch])
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future, result in zip(futures, results):
+                    future.set_result(result)
+
+
+def audio_cache_key(audio_url: str) -> str:
+    """Raw-audio cache key used when the caller passes no `audio_key` (eg. a guid hash)."""
+    import hashlib
+
+    return hashlib.sha256(audio_url.encode("utf-8")).hexdigest()[:32]
+
+
+def _cached_audio(pointer_path: str) -> str | None:
+    """The blob a pointer file refers to, if both exist. Marks the blob as recently used."""
+    import json
+    import os
+
+    try:
+        with open(pointer_path) as f:
+            blob_path = os.path.join(RAW_AUDIO_DIR, "blobs", json.load(f)["sha256"])
+        os.utime(blob_path)
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+    return blob_path
+
+
+def _reload_cached_audio(pointer_path: str) -> str | None:
+    """
+    `_cached_audio` after reloading the cache volume, so audio another
+    container (eg. `prefetch_audio`) committed since this one mounted it is
+    found. While the reload is blocked by open files, the lookup is retried
+    between attempts, since another input here may have just downloaded it.
+    """
+    for attempt in range(1, VOLUME_RELOAD_ATTEMPTS + 1):
+        try:
+            cache_vol.reload()
+            break
+        except RuntimeError as e:
+            # Modal raises RuntimeError when open files prevent the reload.
+            print(f"Could not reload cache volume (attempt {attempt}/{VOLUME_RELOAD_ATTEMPTS}): {e}")
+        except Exception as e:
+            print(f"Could not reload cache volume: {e}")
+            break
+        blob_path = _cached_audio(pointer_path)
+        if blob_path is not None or attempt == VOLUME_RELOAD_ATTEMPTS:
+            return blob_path
+        time.sleep(VOLUME_RELOAD_RETRY_S * attempt)
+    return _cached_audio(pointer_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _http_session():
+    """Keep-alive connections shared by the downloads in this container."""
+    import requests  # type: ignore
+
+    return requests.Session()
+
+
+def fetch_audio(audio_url: str, audio_key: str | None = None) -> str:
+    """
+    Path of the audio on the cache volume, downloading it first on a miss.
+
+    Each download streams into its own temporary file, so concurrent inputs
+    never share a path, and is then moved to blobs/{sha256}. Retries and
+    re-transcriptions with another language or model find the pointer file
+    for `audio_key` and skip the download.
+    """
+    import hashlib
+    import json
+    import os
+    import tempfile
+
+    audio_key = audio_key or audio_cache_key(audio_url)
+    blob_dir = os.path.join(RAW_AUDIO_DIR, "blobs")
+    pointer_path = os.path.join(RAW_AUDIO_DIR, f"{audio_key}.json")
+    # Only a miss pays for reloading the volume.
+    blob_path = _cached_audio(pointer_path) or _reload_cached_audio(pointer_path)
+    if blob_path is not None:
+        print(f"Audio cache hit for {audio_key}")
+        return blob_path
+
+    os.makedirs(blob_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=RAW_AUDIO_DIR, prefix=".download-")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f, _http_session().get(audio_url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        blob_path = os.path.join(blob_dir, digest.hexdigest())
+        # Identical audio behind a different URL or key is stored once.
+        os.replace(tmp_path, blob_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    pointer_tmp = f"{pointer_path}.{os.getpid()}.{id(digest)}.tmp"
+    with open(pointer_tmp, "w") as f:
+        json.dump({"sha256": digest.hexdigest(), "size": size, "url": audio_url}, f)
+    os.replace(pointer_tmp, pointer_path)
+    try:
+        cache_vol.commit()
+    except Exception as e:
+        # Modal also commits in the background; this only makes the audio visible to other containers sooner.
+        print(f"Could not commit cache volume: {e}")
+    print(f"Downloaded {size} bytes of audio for {audio_key}")
+    return blob_path
+
+
+def _trim_lru(directory: str, budget: int, keep: str | None = None) -> int:
+    """Delete the least recently modified files in `directory` until at most `budget` bytes remain."""
+    import os
+
+    try:
+        # Dot-files are downloads or copies still being written.
+        entries = [entry for entry in os.scandir(directory) if entry.is_file() and not entry.name.startswith(".")]
+    except FileNotFoundError:
+        return 0
+    stats = {entry.path: entry.stat() for entry in entries}
+    total = sum(stat.st_size for stat in stats.values())
+    freed = 0
+    for path in sorted(stats, key=lambda path: stats[path].st_mtime):
+        if total - freed <= budget:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        freed += stats[path].st_size
+    return freed
+
+
+def trim_audio_cache(budget: int = RAW_AUDIO_BUDGET, keep: str | None = None) -> int:
+    """Evict the least recently used audio blobs until at most `budget` bytes remain. Returns bytes freed."""
+    import os
+
+    # Pointers to evicted blobs are left behind; `fetch_audio` treats them as a miss.
+    return _trim_lru(os.path.join(RAW_AUDIO_DIR, "blobs"), budget, keep)
+
+
+_NPY_HEADER_SIZE = 128
+
+
+def _npy_header(samples: int) -> bytes:
+    """A fixed-size .npy v1.0 header for `samples` float16 values, so it can be rewritten once the length is known."""
+    header = f"{{'descr': '<f2', 'fortran_order': False, 'shape': ({samples},), }}"
+    header = header.ljust(_NPY_HEADER_SIZE - 11) + "\n"
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1")
+
+
+def load_pcm(audio_key: str):
+    """
+    Memory-map the cached decoded audio for `audio_key`, or None if it was never decoded.
+
+    The local disk is checked first; audio found only on the volume is copied
+    to local disk so it is read at local speed.
+    """
+    import os
+    import shutil
+
+    import numpy as np
+
+    local_path = os.path.join(LOCAL_PCM_CACHE_DIR, f"{audio_key}.npy")
+    if not os.path.exists(local_path):
+        volume_path = os.path.join(PCM_CACHE_DIR, f"{audio_key}.npy")
+        if not os.path.exists(volume_path):
+            return None
+        os.makedirs(LOCAL_PCM_CACHE_DIR, exist_ok=True)
+        tmp_path = os.path.join(LOCAL_PCM_CACHE_DIR, f".{audio_key}.{os.getpid()}.{id(local_path)}.npy")
+        shutil.copyfile(volume_path, tmp_path)
+        os.replace(tmp_path, local_path)
+        os.utime(volume_path)
+        _trim_lru(LOCAL_PCM_CACHE_DIR, LOCAL_PCM_CACHE_BUDGET, keep=local_path)
+    os.utime(local_path)
+    print(f"Decoded audio cache hit for {audio_key}")
+    return np.load(local_path, mmap_mode="r")
+
+
+def decode_to_npy(audio_path: str, npy_path: str) -> int:
+    """
+    Decode audio with ffmpeg to 16 kHz mono float16 PCM saved as .npy at
+    `npy_path`. Returns the sample count.
+
+    ffmpeg's output is converted and written as it streams in, so the decoded
+    episode is never held in memory whole.
+    """
+    import os
+    import subprocess
+    import tempfile
+
+    import numpy as np
+
+    command = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-i", audio_path,
+        "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "f32le", "-",
+    ]
+    samples = 0
+    # stderr goes to a file: a pipe nobody reads until EOF would fill up
+    # with warnings about a damaged file and stall ffmpeg.
+    with tempfile.TemporaryFile() as stderr, \
+            subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr) as process, \
+            open(npy_path, "wb") as f:
+        f.write(_npy_header(0))
+        # A whole number of float32 samples, about 16 seconds of audio.
+        while chunk := process.stdout.read(SAMPLE_RATE * 4 * 16):
+            block = np.frombuffer(chunk, dtype="<f4").astype("<f2")
+            f.write(block.tobytes())
+            samples += len(block)
+        process.wait()
+        stderr.seek(max(0, stderr.seek(0, os.SEEK_END) - FFMPEG_ERROR_TAIL))
+        errors = stderr.read().decode(errors="replace")
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not decode {audio_path}: {errors.strip()}")
+    with open(npy_path, "r+b") as f:
+        f.write(_npy_header(samples))
+    return samples
+
+
+def decode_pcm(audio_path: str, audio_key: str):
+    """Decode audio with `decode_to_npy` into both PCM caches and memory-map it."""
+    import os
+    import shutil
+
+    import numpy as np
+
+    os.makedirs(LOCAL_PCM_CACHE_DIR, exist_ok=True)
+    local_path = os.path.join(LOCAL_PCM_CACHE_DIR, f"{audio_key}.npy")
+    tmp_path = os.path.join(LOCAL_PCM_CACHE_DIR, f".{audio_key}.{os.getpid()}.{id(local_path)}.npy")
+    try:
+        samples = decode_to_npy(audio_path, tmp_path)
+        os.replace(tmp_path, local_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _trim_lru(LOCAL_PCM_CACHE_DIR, LOCAL_PCM_CACHE_BUDGET, keep=local_path)
+
+    try:
+        os.makedirs(PCM_CACHE_DIR, exist_ok=True)
+        volume_path = os.path.join(PCM_CACHE_DIR, f"{audio_key}.npy")
+        volume_tmp = os.path.join(PCM_CACHE_DIR, f".{audio_key}.{os.getpid()}.{id(local_path)}.npy")
+        shutil.copyfile(local_path, volume_tmp)
+        os.replace(volume_tmp, volume_path)
+        _trim_lru(PCM_CACHE_DIR, PCM_CACHE_BUDGET, keep=volume_path)
+        cache_vol.commit()
+    except Exception as e:
+        # Other containers decode again; this one still has its local copy.
+        print(f"Could not store decoded audio on the cache volume: {e}")
+    print(f"Decoded {samples / SAMPLE_RATE:.0f}s of audio for {audio_key}")
+    return np.load(local_path, mmap_mode="r")
+
+
+def speech_regions(pcm) -> list[tuple[int, int]]:
+    """
+    `(start, end)` sample ranges of `pcm` that likely hold speech, judged by frame energy.
+
+    The noise floor is the 10th percentile of frame energies. Energy is
+    computed a minute of audio at a time, so the whole episode is never
+    converted to float32 at once. Audio that is loud throughout (speech over
+    a constant music bed) never rises above its own floor; unless it is
+    silent, all of it is returned rather than nothing.
+    """
+    import numpy as np
+
+    frame = int(SAMPLE_RATE * VAD_FRAME_S)
+    frames = len(pcm) // frame
+    if not frames:
+        return []
+    energy = np.empty(frames, dtype=np.float32)
+    block_frames = int(60 / VAD_FRAME_S)
+    for first in range(0, frames, block_frames):
+        last = min(first + block_frames, frames)
+        block = np.asarray(pcm[first * frame:last * frame], dtype=np.float32).reshape(-1, frame)
+        energy[first:last] = 10 * np.log10(np.mean(np.square(block), axis=1) + 1e-10)
+    threshold = max(float(np.percentile(energy, 10)) + VAD_THRESHOLD_DB, VAD_FLOOR_DB)
+
+    voiced = np.concatenate(([False], energy > threshold, [False]))
+    edges = np.flatnonzero(voiced[1:] != voiced[:-1]) * frame
+    pad, min_gap, min_speech = (int(SAMPLE_RATE * s) for s in (VAD_PAD_S, VAD_MIN_GAP_S, VAD_MIN_SPEECH_S))
+    regions: list[list[int]] = []
+    for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+        if end - start < min_speech:
+            continue
+        start, end = max(start - pad, 0), min(end + pad, len(pcm))
+        if regions and start - regions[-1][1] < min_gap:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+    if not regions and float(energy.max()) > VAD_FLOOR_DB:
+        return [(0, len(pcm))]
+    return [(start, end) for start, end in regions]
+
+
+def join_regions(pcm, regions: list[tuple[int, int]]):
+    """
+    The `regions` of `pcm` back to back, and `(offset, start)` pairs in seconds mapping them to the original.
+
+    Audio at `offset` seconds into the joined array was at `start` seconds in `pcm`.
+    """
+    import numpy as np
+
+    spans = []
+    offset = 0
+    for start, end in regions:
+        spans.append((offset / SAMPLE_RATE, start / SAMPLE_RATE))
+        offset += end - start
+    return np.concatenate([pcm[start:end] for start, end in regions]), spans
+
+
+def remap_chunks(chunks: list[dict], spans: list[tuple[float, float]]) -> list[dict]:
+    """Move HF pipeline chunk timestamps from joined speech regions back onto the original timeline."""
+    import bisect
+
+    offsets = [offset for offset, _ in spans]
+
+    def remap(t: float | None, is_end: bool) -> float | None:
+        if t is None:
+            return None
+        # An end exactly on a region boundary belongs to the region before it.
+        i = (bisect.bisect_left if is_end else bisect.bisect_right)(offsets, t) - 1
+        offset, start = spans[max(i, 0)]
+        return start + t - offset
+
+    remapped = []
+    for chunk in chunks:
+        start, end = chunk.get("timestamp") or (None, None)
+        remapped.append({**chunk, "timestamp": (remap(start, False), remap(end, True))})
+    return remapped
+
+
+def prepare_audio(pcm, language: str | None, vad: bool, log=print):
+    """
+    The audio to decode, the VAD spans to remap its timestamps with (None
+    without VAD), and Whisper's generate kwargs. None if VAD found no speech.
+    Shared by `Model` and `local_backend.LocalModel`; `log` reports progress.
+    """
+    spans = None
+    if vad:
+        regions = speech_regions(pcm)
+        speech = sum(end - start for start, end in regions)
+        log(f"VAD: {speech / SAMPLE_RATE:.0f}s of speech in {len(pcm) / SAMPLE_RATE:.0f}s of audio "
+            f"({len(regions)} regions)")
+        if not regions:
+            return None
+        if regions != [(0, len(pcm))]:
+            pcm, spans = join_regions(pcm, regions)
+
+    # Prepare generation kwargs to avoid conflicts with forced_decoder_ids
+    generate_kwargs = {
+        "task": "transcribe",  # Explicitly set task
+    }
+    
+    if language:
+        generate_kwargs["language"] = language
+        # Clear any forced_decoder_ids to avoid conflicts
+        generate_kwargs["forced_decoder_ids"] = None  # type: ignore
+        log(f"Using language: {language}")
+    else:
+        log("Using automatic language detection")
+    return pcm, spans, generate_kwargs
+
+
+@app.function(image=download_image, volumes={CACHE_DIR: cache_vol}, timeout=60 * 30)
+def prefetch_audio(audio_url: str, audio_key: str | None = None, budget: int = RAW_AUDIO_BUDGET) -> str:
+    """
+    Download audio into the raw-audio cache ahead of its transcription.
+
+    Runs on a CPU container while the GPU works on earlier episodes, and
+    returns the cached path to hand to `Model.transcribe`.
+    """
+    audio_path = fetch_audio(audio_url, audio_key)
+    freed = trim_audio_cache(budget, keep=audio_path)
+    if freed:
+        print(f"Evicted {freed} bytes of cached audio")
+        cache_vol.commit()
+    return audio_path
+
+
+def stitch_timestamps(chunks: list[list], duration: float | None = None) -> list[list]:
+    """
+    Make `[start, end, text]` timestamps monotonic across window boundaries.
+
+    Batched windows are merged by the pipeline, but the segment at the end of
+    a window (or of the audio) can lack an end, and neighbours can overlap
+    slightly. Missing starts take the previous end, missing ends take the
+    next start (or the audio duration), and overlaps are clipped.
+    """
+    stitched = []
+    previous_end = 0.0
+    for i, (start, end, text) in enumerate(chunks):
+        start = previous_end if start is None else max(start, previous_end)
+        if end is None:
+            next_starts = [chunk[0] for chunk in chunks[i + 1:] if chunk[0] is not None]
+            end = next_starts[0] if next_starts else duration
+        if end is not None:
+            end = max(end, start)
+            previous_end = end
+        stitched.append([start, end, text])
+    return stitched
+
+
+def compact_result(result: dict, duration: float | None = None) -> dict:
+    """
+    Shrink a HF pipeline result for transfer and storage.
+
+    Chunks are encoded as ``[start, end, text]`` triples instead of
+    ``{"timestamp": (start, end), "text": text}`` dicts, with timestamps
+    stitched by `stitch_timestamps`.
+    """
+    chunks = []
+    for chunk in result.get("chunks") or []:
+        start, end = chunk.get("timestamp") or (None, None)
+        chunks.append([
+            round(start, 2) if start is not None else None,
+            round(end, 2) if end is not None else None,
+            chunk.get("text", ""),
+        ])
+    duration = round(duration, 2) if duration is not None else None
+    return {"text": result.get("text", "").strip(), "chunks": stitch_timestamps(chunks, duration)}
+
+
+def expand_chunks(chunks: list[list]) -> list[dict]:
+    """Decode compact ``[start, end, text]`` chunks into segment dicts."""
+    return [{"start": start, "end": end, "text": text} for start, end, text in chunks]
+
+
+# ## Client API
+#
+# Used by the pipeline to call the deployed app in-process, rather than
+# starting an ephemeral app with `modal run` for every episode.
+
+@functools.lru_cache(maxsize=None)
+def lookup_model() -> modal.Cls:
+    """Look up the deployed ``Model`` class. Hydrated lazily on first call."""
+    return modal.Cls.from_name(APP_NAME, "Model")
+
+
+def model_instance(model_name: str | None = None):
+    """The deployed `Model` for a Whisper checkpoint name, `DEFAULT_MODEL_NAME` if None."""
+    return lookup_model()(model_name=model_name or DEFAULT_MODEL_NAME)
+
+
+@functools.lru_cache(maxsize=None)
+def lookup_prefetch() -> modal.Function:
+    """Look up the deployed `prefetch_audio` function."""
+    return modal.Function.from_name(APP_NAME, "prefetch_audio")
+
+
+# How long a successful readiness check is trusted before checking again.
+READINESS_TTL = 60 * 5
+_ready_until = 0.0
+
+
+def is_deployed() -> bool:
+    """Whether the app is deployed. A metadata lookup only; no container is started."""
+    try:
+        lookup_model().hydrate()
+    except modal.exception.NotFoundError:
+        lookup_model.cache_clear()
+        return False
+    return True
+
+
+def ping_model(model: str | None = None, timeout: float = 60 * 5) -> dict:
+    """
+    Ping a container of `model`, starting one if none is running, and return
+    its status (see `Model.ping`). Raises `modal.exception.TimeoutError`.
+    """
+    return model_instance(model).ping.spawn().get(timeout=timeout)
+
+
+def check_ready(probe: bool = False, timeout: float = 60 * 5) -> bool:
+    """
+    Whether the deployed app can take transcriptions.
+
+    By default this only checks that the app is deployed. With `probe`, it also
+    pings a container and waits up to `timeout` seconds for the model to load.
+    Positive results are cached for `READINESS_TTL` seconds.
+    """
+    global _ready_until
+    if time.monotonic() < _ready_until:
+        return True
+    if not is_deployed():
+        return False
+    if probe:
+        try:
+            status = ping_model(timeout=timeout)
+        except modal.exception.TimeoutError:
+            return False
+        if not status.get("ready"):
+            return False
+    _ready_until = time.monotonic() + READINESS_TTL
+    return True
+
+
+def invalidate_readiness() -> None:
+    """Forget cached readiness, eg. after stopping the app."""
+    global _ready_until
+    _ready_until = 0.0
+    lookup_model.cache_clear()
+    lookup_prefetch.cache_clear()
+
+
+def submit_transcription(audio_url: str, language: str | None = None, audio_key: str | None = None,
+                         audio_path: str | None = None, model: str | None = None,
+                         **options) -> modal.FunctionCall:
+    """
+    Start a transcription on the deployed app and return its function call handle.
+
+    `audio_key` (eg. the episode guid hash) names the audio in the volume's
+    raw-audio cache; without it the URL is hashed instead. `audio_path` is a
+    path returned by `prefetch_audio`; the URL is only fetched if it is gone.
+    `model` is a Whisper checkpoint name such as 'base.en'. `options` are
+    passed on to `Model.transcribe`: `chunk_length_s`, `stride_length_s`,
+    `batch_size`, and `vad` to skip audio without speech.
+    """
+    return model_instance(model).transcribe.spawn(audio_url, language=language, audio_key=audio_key,
+                                                  audio_path=audio_path, **options)
+
+
+async def submit_transcription_async(audio_url: str, language: str | None = None, audio_key: str | None = None,
+                                     audio_path: str | None = None, model: str | None = None,
+                                     **options) -> modal.FunctionCall:
+    """Async counterpart of `submit_transcription`."""
+    return await model_instance(model).transcribe.spawn.aio(audio_url, language=language, audio_key=audio_key,
+                                                            audio_path=audio_path, **options)
+
+
+async def submit_prefetch_async(audio_url: str, audio_key: str | None = None,
+                                budget: int = RAW_AUDIO_BUDGET) -> modal.FunctionCall:
+    """Start downloading audio into the raw-audio cache. The call's result is the cached path."""
+    return await lookup_prefetch().spawn.aio(audio_url, audio_key=audio_key, budget=budget)
+
+
+def transcribe_remote(audio_url: str, language: str | None = None, audio_key: str | None = None,
+                      model: str | None = None, **options) -> dict | None:
+    """Transcribe on the deployed app, blocking until the result is available."""
+    return model_instance(model).transcribe.remote(audio_url, language=language, audio_key=audio_key, **options)
+
+
+def stream_transcription(audio_url: str, language: str | None = None, audio_key: str | None = None,
+                         audio_path: str | None = None, model: str | None = None, **options):
+    """
+    Transcribe on the deployed app, yielding lists of compact `[start, end, text]`
+    chunks as they are decoded. Arguments are as for `submit_transcription`.
+    """
+    return model_instance(model).transcribe_stream.remote_gen(audio_url, language=language, audio_key=audio_key,
+                                                              audio_path=audio_path, **options)
+
+
+def stream_transcription_async(audio_url: str, language: str | None = None, audio_key: str | None = None,
+                               audio_path: str | None = None, model: str | None = None, **options):
+    """Async counterpart of `stream_transcription`; iterate it with `async for`."""
+    return model_instance(model).transcribe_stream.remote_gen.aio(audio_url, language=language, audio_key=audio_key,
+                                                                  audio_path=audio_path, **options)
+
+
+def benchmark_remote(audio_url: str, configs: list[dict], language: str | None = None,
+                     model: str | None = None) -> list[dict]:
+    """Real-time factor of each inference config on the deployed app, see `Model.benchmark`."""
+    return model_instance(model).benchmark.remote(audio_url, configs, language=language)
+
 
 # ## Run the model
 @app.local_entrypoint()
@@ -129,13 +1072,11 @@ def main():
         print(result["text"])
         
         # Print timestamps if available
-        if "chunks" in result and result["chunks"]:
+        if result.get("chunks"):
             print("\n" + "="*50)
             print("TIMESTAMPED SEGMENTS:")
             print("="*50)
-            for chunk in result["chunks"]:
-                timestamp = chunk.get("timestamp", "N/A")
-                text = chunk.get("text", "")
-                print(f"[{timestamp}] {text}")
+            for start, end, text in result["chunks"]:
+                print(f"[{start}, {end}] {text}")
     else:
-        print("Transcription failed.") 
\ No newline at end of file
+        print("Transcription failed.")
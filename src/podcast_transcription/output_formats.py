@@ -0,0 +1,215 @@
+"""
+Output profiles for saved transcriptions.
+
+- json: pretty-printed JSON with the full episode metadata (the original format).
+- compact: minified JSON. The transcription text is dropped when chunks are
+  present (it is the concatenation of the chunk texts) and so is the HTML
+  episode description.
+- gzip / zstd: compact, compressed. zstd needs the optional `zstandard` package.
+- jsonl: a header line followed by one `[start, end, text]` line per segment,
+  appended as segments arrive so readers can stream them. With a streaming
+  pipeline they are appended while the episode is still being transcribed.
+- slim: compact, with the episode metadata written once to a sidecar file in
+  `metadata_dir` and referenced by guid hash.
+
+All files are written to a temporary path and renamed into place, so readers
+never observe a partial file.
+"""
+
+import contextlib
+import gzip
+import json
+import os
+import pathlib
+from typing import IO, Iterator, Optional
+
+OUTPUT_FORMATS = {
+    "json": ".json",
+    "compact": ".json",
+    "gzip": ".json.gz",
+    "zstd": ".json.zst",
+    "jsonl": ".jsonl",
+    "slim": ".json",
+}
+DEFAULT_OUTPUT_FORMAT = "json"
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "The 'zstd' output format needs the zstandard package: pip install zstandard"
+        ) from None
+    return zstandard
+
+
+@contextlib.contextmanager
+def atomic_open(path: pathlib.Path, mode: str = "wb") -> Iterator[IO]:
+    """Open a temporary file next to `path` and rename it over `path` on success."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    f = open(tmp_path, mode, **({} if "b" in mode else {"encoding": "utf-8"}))
+    try:
+        yield f
+        f.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        f.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def chunks_text(chunks: list) -> str:
+    """Rebuild the full transcription text from compact `[start, end, text]` chunks."""
+    return "".join(text for _, _, text in chunks).strip()
+
+
+def _compact_record(record: dict) -> dict:
+    record = dict(record)
+    if record.get("transcription_chunks"):
+        record.pop("transcription_text", None)
+    if record.get("episode_metadata"):
+        record["episode_metadata"] = {
+            k: v for k, v in record["episode_metadata"].items() if k != "htmlDescription"
+        }
+    return record
+
+
+def _slim_record(record: dict, metadata_dir: pathlib.Path) -> dict:
+    record = _compact_record(record)
+    metadata = record.pop("episode_metadata", None) or {}
+    guid_hash = record["guid_hash"]
+    record["episode_id"] = metadata.get("id")
+    metadata_path = metadata_dir / f"{guid_hash}.json"
+    if not metadata_path.exists():
+        metadata_dir.mkdir(parents=True, exist_ok=True)
+        with atomic_open(metadata_path, "w") as f:
+            json.dump(metadata, f, ensure_ascii=False, separators=_COMPACT_SEPARATORS)
+    return record
+
+
+class JsonlTranscriptionWriter:
+    """
+    Write a transcription as JSONL: one header object, then one line per segment.
+
+    The file only appears at its final path once `close` is called.
+    """
+
+    def __init__(self, path: pathlib.Path, header: dict):
+        self.path = pathlib.Path(path)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self._write_line(header)
+
+    def _write_line(self, obj) -> None:
+        self._file.write(json.dumps(obj, ensure_ascii=False, separators=_COMPACT_SEPARATORS) + "\n")
+
+    def append_segments(self, chunks: list) -> None:
+        for chunk in chunks:
+            self._write_line(chunk)
+        self._file.flush()
+
+    def close(self) -> pathlib.Path:
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_transcription(path_stem: pathlib.Path, record: dict, output_format: str = DEFAULT_OUTPUT_FORMAT,
+                        metadata_dir: Optional[pathlib.Path] = None) -> pathlib.Path:
+    """
+    Write a transcription record in the given output profile.
+
+    `record` is the full record built by the pipeline; the file extension is
+    added to `path_stem` according to the profile.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unknown output format '{output_format}'. Choose from: {', '.join(OUTPUT_FORMATS)}"
+        )
+    path = path_stem.with_name(path_stem.name + OUTPUT_FORMATS[output_format])
+
+    if output_format == "json":
+        with atomic_open(path, "w") as f:
+            json.dump(record, f, indent=2, ensure_ascii=False)
+        return path
+
+    if output_format == "jsonl":
+        header = _compact_record(record)
+        chunks = header.pop("transcription_chunks", [])
+        with JsonlTranscriptionWriter(path, header) as writer:
+            writer.append_segments(chunks)
+        return path
+
+    if output_format == "slim":
+        record = _slim_record(record, metadata_dir or path.parent / "metadata")
+    else:
+        record = _compact_record(record)
+    data = json.dumps(record, ensure_ascii=False, separators=_COMPACT_SEPARATORS).encode("utf-8")
+    if output_format == "gzip":
+        data = gzip.compress(data, compresslevel=6)
+    elif output_format == "zstd":
+        data = _import_zstandard().ZstdCompressor(level=10).compress(data)
+    with atomic_open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def open_jsonl_transcription(path_stem: pathlib.Path, record: dict) -> JsonlTranscriptionWriter:
+    """
+    Start a JSONL transcription before any segments are known, so they can be
+    appended as they are transcribed. `record` is the pipeline's record without
+    the transcription; `read_transcription` rebuilds the text from the segments.
+    """
+    header = _compact_record(record)
+    header.pop("transcription_text", None)
+    header.pop("transcription_chunks", None)
+    return JsonlTranscriptionWriter(path_stem.with_name(path_stem.name + OUTPUT_FORMATS["jsonl"]), header)
+
+
+def iter_jsonl_segments(path: pathlib.Path) -> Iterator[list]:
+    """Stream `[start, end, text]` segments from a JSONL transcription, skipping the header."""
+    with open(path, encoding="utf-8") as f:
+        next(f, None)
+        for line in f:
+            yield json.loads(line)
+
+
+def read_transcription(path: pathlib.Path) -> dict:
+    """
+    Read a transcription saved in any output profile.
+
+    `transcription_text` is rebuilt from the chunks when a profile dropped it.
+    Slim files are returned as stored; their metadata lives in the sidecar file.
+    """
+    path = pathlib.Path(path)
+    if path.suffix == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            record = json.loads(next(f))
+            record["transcription_chunks"] = [json.loads(line) for line in f]
+    else:
+        data = path.read_bytes()
+        if path.suffix == ".gz":
+            data = gzip.decompress(data)
+        elif path.suffix == ".zst":
+            data = _import_zstandard().ZstdDecompressor().decompress(data)
+        record = json.loads(data)
+    if "transcription_text" not in record:
+        record["transcription_text"] = chunks_text(record.get("transcription_chunks", []))
+    return record
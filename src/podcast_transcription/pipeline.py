@@ -5,29 +5,99 @@ Combines podcast discovery with Modal transcription to create a complete
 podcast processing pipeline.
 """
 
-import json
+import asyncio
 import pathlib
 import subprocess
 import sys
-from typing import Optional
+from typing import Callable, Optional
 
-from .config import get_logger
+from .config import AUTO_MODEL, DEFAULT_LATENCY_BUDGET, DEFAULT_MODEL, get_logger, select_model, supported_whisper_models
+from .episode_catalog import CATALOG_FILENAME, CATALOG_PATH, EpisodeCatalog
+from .job_journal import JobJournal
+from .local_backend import DEFAULT_LOCAL_MODEL_NAME, TEST_MODEL_NAME
+from .output_formats import (
+    DEFAULT_OUTPUT_FORMAT,
+    OUTPUT_FORMATS,
+    JsonlTranscriptionWriter,
+    open_jsonl_transcription,
+    write_transcription,
+)
+from .modal_client import APP_NAME, check_ready, invalidate_readiness, whisper_model_id
 from .podcast_discovery import (
     PodcastMetadata, 
     get_podcast_details, 
-    create_podchaser_client, 
-    fetch_episodes_data
+    get_podchaser_client,
+    episode_duration,
+    episode_guid_hash,
 )
+from .rss_discovery import episode_to_dict, fetch_feed, is_feed_url
+from .transcription_cache import TranscriptionCache
 
 logger = get_logger(__name__)
 
+# Matches the Modal class timeout; transcriptions never run longer than this.
+TRANSCRIPTION_TIMEOUT = 60 * 60
+MODAL_CLIENT_PATH = pathlib.Path(__file__).parent / "modal_client.py"
+# Where inference runs: the deployed Modal app, or `local_backend.LocalModel` on this machine's CPU.
+MODAL_BACKEND = "modal"
+LOCAL_BACKEND = "local"
+BACKENDS = (MODAL_BACKEND, LOCAL_BACKEND)
+
+
+def default_model(backend: str) -> str:
+    """The model a backend uses when none is given; big models are very slow on a CPU."""
+    return DEFAULT_LOCAL_MODEL_NAME if backend == LOCAL_BACKEND else DEFAULT_MODEL.name
+
 
 class PodcastTranscriptionPipeline:
-    """Complete pipeline for podcast discovery and transcription."""
+    """
+    Complete pipeline for podcast discovery and transcription.
+
+    `model` is a name from `config.supported_whisper_models`, or "auto" to
+    pick the largest model expected to transcribe each episode within
+    `latency_budget` seconds. It defaults to `default_model(backend)`; the
+    local backend also accepts `local_backend.TEST_MODEL_NAME`. With `vad`, audio without speech (silence,
+    music beds) is skipped before Whisper runs. `backend` is "modal", or
+    "local" to transcribe on this machine's CPU instead.
+
+    With `stream`, Modal transcriptions are streamed back as they are decoded
+    instead of returned whole, and the jsonl output format appends segments to
+    the episode's file as they arrive. `on_segments(episode, chunks)` is called
+    with each list of new `[start, end, text]` chunks; without streaming (or
+    for cached and local results) it gets all of an episode's chunks at once.
+    """
     
-    def __init__(self, output_dir: str = "transcriptions"):
+    def __init__(self, output_dir: str = "transcriptions", cache_dir: Optional[str] = None,
+                 output_format: str = DEFAULT_OUTPUT_FORMAT, model: Optional[str] = None,
+                 latency_budget: float = DEFAULT_LATENCY_BUDGET, vad: bool = False,
+                 backend: str = MODAL_BACKEND, stream: bool = False,
+                 on_segments: Optional[Callable[[dict, list], None]] = None):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown output format '{output_format}'. Choose from: {', '.join(OUTPUT_FORMATS)}"
+            )
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+        model = model or default_model(backend)
+        models = [*supported_whisper_models, AUTO_MODEL, *([TEST_MODEL_NAME] if backend == LOCAL_BACKEND else [])]
+        if model not in models:
+            raise ValueError(f"Unknown model '{model}' for the {backend} backend. Choose from: {', '.join(models)}")
+        self.backend = backend
+        # Loaded on first use, by model name; each keeps its worker processes.
+        self._local_models: dict = {}
+        self.model = model
+        self.latency_budget = latency_budget
+        self.vad = vad
+        self.stream = stream
+        self.on_segments = on_segments
+        # Models picked by the "auto" policy, by (guid hash, language), so every stage agrees.
+        self._auto_models: dict[tuple[str, Optional[str]], str] = {}
         self.output_dir = pathlib.Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.output_format = output_format
+        self.cache = TranscriptionCache(pathlib.Path(cache_dir) if cache_dir else self.output_dir / ".cache")
+        # An explicit cache dir holds the episode catalog too; otherwise it is shared per user.
+        self.catalog = EpisodeCatalog(pathlib.Path(cache_dir) / CATALOG_FILENAME if cache_dir else CATALOG_PATH)
         logger.info("✅ Pipeline initialized successfully")
     
     def search_and_get_podcast(self, podcast_name: str) -> PodcastMetadata:
@@ -35,7 +105,10 @@ class PodcastTranscriptionPipeline:
         logger.info(f"🔍 Searching for podcast: '{podcast_name}'")
         
         try:
-            podcast_details = get_podcast_details(podcast_name)
+            if is_feed_url(podcast_name):
+                podcast_details, _ = fetch_feed(podcast_name, max_episodes=0)
+            else:
+                podcast_details = get_podcast_details(podcast_name)
             logger.info(f"✅ Found podcast: '{podcast_details.title}' (ID: {podcast_details.id})")
             return podcast_details
         except Exception as e:
@@ -50,208 +123,116 @@ class PodcastTranscriptionPipeline:
         """Get episode metadata including audio URLs."""
         logger.info(f"📡 Fetching episodes for '{podcast.title}'...")
         
-        # Use the existing download method but capture episodes instead of downloading
-        from gql import gql
-        
-        client = create_podchaser_client()
-        episodes = fetch_episodes_data(gql=gql, client=client, podcast_id=podcast.id, max_episodes=max_episodes)
-        
-        logger.info(f"📋 Found {len(episodes)} episodes")
-        
-        # Sort episodes by air date (newest first)
-        episodes_with_dates = []
-        episodes_without_dates = []
-        
-        for ep in episodes:
-            if ep.get('airDate'):
-                episodes_with_dates.append(ep)
-            else:
-                episodes_without_dates.append(ep)
-        
-        episodes_with_dates.sort(key=lambda x: x.get('airDate', ''), reverse=True)
-        episodes = episodes_with_dates + episodes_without_dates
-        
-        # Filter episodes if specified
-        if episode_filter:
-            episodes = [ep for ep in episodes if episode_filter.lower() in ep.get('title', '').lower()]
-            logger.info(f"🔽 Filtered to {len(episodes)} episodes matching '{episode_filter}'")
+        if is_feed_url(podcast.id):
+            _, feed_episodes = fetch_feed(podcast.id, max_episodes, episode_filter)
+            episodes = [episode_to_dict(episode) for episode in feed_episodes]
+            logger.info(f"✅ Ready to transcribe {len(episodes)} episodes")
+            return episodes
         
-        # Return only episodes with audio URLs
-        valid_episodes = []
-        for ep in episodes[:max_episodes]:
-            if ep.get("audioUrl"):
-                valid_episodes.append(ep)
-            else:
-                logger.warning(f"⚠️  Episode '{ep.get('title', 'Unknown')}' has no audio URL, skipping")
+        try:
+            self.catalog.sync(get_podchaser_client(), podcast.id, max_episodes, episode_filter)
+        except Exception as e:
+            if not self.catalog.is_synced(podcast.id):
+                raise
+            logger.warning(f"⚠️  Could not refresh episode catalog, using stored episodes: {e}")
+        episodes = self.catalog.episodes(podcast.id, max_episodes, episode_filter)
         
-        logger.info(f"✅ Ready to transcribe {len(valid_episodes)} episodes")
-        return valid_episodes
+        logger.info(f"✅ Ready to transcribe {len(episodes)} episodes")
+        return episodes
 
     def ensure_modal_app_running(self):
-        """Ensure Modal app is running before transcription."""
+        """Ensure Modal app is deployed and ready before transcription."""
         logger.info("🔄 Ensuring Modal app is running...")
         
-        # Check if app is running
+        if check_ready():
+            logger.info("✅ Modal app is deployed")
+            return True
+        
+        logger.info("📡 Modal app not deployed, deploying...")
         try:
-            result = subprocess.run([
-                "modal", "app", "list"
-            ], capture_output=True, text=True, check=True, 
-               encoding='cp1252' if sys.platform == "win32" else None, 
+            subprocess.run([
+                "modal", "deploy", str(MODAL_CLIENT_PATH)
+            ], capture_output=True, text=True, check=True,
+               encoding='cp1252' if sys.platform == "win32" else None,
                errors='replace' if sys.platform == "win32" else None)
-            
-            if 'example-base-whisper' in result.stdout and 'stopped' not in result.stdout:
-                logger.info("✅ Modal app is already running")
-                return True
-            else:
-                logger.info("📡 Modal app not running, deploying...")
-                # Deploy the app
-                deploy_result = subprocess.run([
-                    "modal", "deploy", "src/podcast_transcription/modal_client.py"
-                ], capture_output=True, text=True, check=True,
-                   encoding='cp1252' if sys.platform == "win32" else None,
-                   errors='replace' if sys.platform == "win32" else None)
-                
-                logger.info("✅ Modal app deployed, waiting for it to be ready...")
-                # Wait for the app to be ready
-                import time
-                time.sleep(10)  # Give the app time to start up
-                
-                # Test if the app is ready by trying to call a simple method
-                logger.info("🧪 Testing if Modal app is ready...")
-                for attempt in range(3):
-                    try:
-                        test_result = subprocess.run([
-                            "modal", "run", "src/podcast_transcription/modal_client.py::main"
-                        ], capture_output=True, text=True, timeout=60,
-                           encoding='cp1252' if sys.platform == "win32" else None,
-                           errors='replace' if sys.platform == "win32" else None)
-                        
-                        if test_result.returncode == 0:
-                            logger.info("✅ Modal app is ready to receive requests")
-                            return True
-                        else:
-                            logger.info(f"⏳ App not ready yet, attempt {attempt + 1}/3...")
-                            time.sleep(5)
-                    except subprocess.TimeoutExpired:
-                        logger.info(f"⏳ App startup timeout, attempt {attempt + 1}/3...")
-                        time.sleep(5)
-                
-                logger.warning("⚠️  Modal app may not be fully ready, but proceeding...")
-                return True
-                
-        except subprocess.CalledProcessError as e:
-            logger.error(f"❌ Failed to ensure Modal app is running: {e}")
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            logger.error(f"❌ Failed to deploy Modal app: {e}")
             return False
-    
-    def transcribe_episode(self, episode: dict, language: str = 'en') -> Optional[dict]:
-        """Transcribe a single episode using Modal via subprocess."""
-        episode_title = episode.get('title', 'Unknown Episode')
-        audio_url = episode.get('audioUrl')
-        
-        if not audio_url:
-            logger.error(f"❌ No audio URL for episode: {episode_title}")
-            return None
-        
-        logger.info(f"🎙️  Transcribing: {episode_title}")
-        logger.info(f"📡 Audio URL: {audio_url}")
         
+        logger.info("🧪 Waiting for the model to load...")
+        if check_ready(probe=True):
+            logger.info("✅ Modal app is ready to receive requests")
+        else:
+            logger.warning("⚠️  Modal app may not be fully ready, but proceeding...")
+        return True
+    
+    def stop_modal_app(self) -> None:
+        """Stop the Modal app to free resources."""
+        logger.info("🛑 Auto-stopping Modal app to free resources...")
         try:
-            # For now, let's modify the modal_client.py to use our URL
-            # We'll create a simple approach by temporarily modifying the script
-            
-            # Read the original script
-            original_script = pathlib.Path("src/podcast_transcription/modal_client.py").read_text()
-            
-            # Create a modified version with our URL and language
-            modified_script = original_script.replace(
-                'url = "https://pub-ebe9e51393584bf5b5bea84a67b343c2.r2.dev/examples_english_english.wav"',
-                f'url = "{audio_url}"'
-            ).replace(
-                "result = Model().transcribe.remote(url, language='en')",
-                f"result = Model().transcribe.remote(url, language='{language}')"
-            )
-            
-            # Write temporary script
-            temp_file = pathlib.Path("temp_transcribe.py")
-            with open(temp_file, 'w') as f:
-                f.write(modified_script)
-            
-            # Run the script via Modal with proper encoding
-            import os
-            
-            # Set up environment for Modal
-            env = os.environ.copy()
-            env['PYTHONIOENCODING'] = 'utf-8'
-            
-            if sys.platform == "win32":
-                process = subprocess.run([
-                    "modal", "run", "temp_transcribe.py::main"
-                ], capture_output=True, text=True, timeout=3600, 
-                   encoding='cp1252', errors='replace', env=env)
-            else:
-                process = subprocess.run([
-                    "modal", "run", "temp_transcribe.py::main"
-                ], capture_output=True, text=True, timeout=3600, env=env)
-            
-            # Clean up temp file
-            temp_file.unlink(missing_ok=True)
-            
-            if process.returncode == 0:
-                output = process.stdout
-                logger.info(f"✅ Modal transcription completed for: {episode_title}")
-                
-                # The modal_client script already outputs the result in a structured way
-                # Let's extract the text from the output
-                lines = output.split('\n')
-                transcription_text = ""
-                chunks: list[dict] = []
-                
-                # Look for the main transcription text after "TRANSCRIPTION RESULT:"
-                capturing_text = False
-                for line in lines:
-                    if "TRANSCRIPTION RESULT:" in line:
-                        capturing_text = True
-                        continue
-                    elif "TIMESTAMPED SEGMENTS:" in line:
-                        capturing_text = False
-                        continue
-                    elif capturing_text and line.strip() and not line.startswith("="):
-                        transcription_text += line.strip() + " "
-                
-                # Create a simple result structure
-                result = {
-                    "text": transcription_text.strip(),
-                    "chunks": chunks  # For now, we'll keep this simple
-                }
-                
-                if result["text"]:
-                    logger.info(f"✅ Successfully transcribed: {episode_title}")
-                    return {
-                        'episode_metadata': episode,
-                        'transcription': result,
-                        'audio_url': audio_url
-                    }
-                else:
-                    logger.error(f"❌ No transcription text found for: {episode_title}")
-                    logger.error(f"Raw output: {output}")
-                    return None
-            else:
-                logger.error(f"❌ Modal transcription failed with return code {process.returncode}")
-                logger.error(f"stdout: {process.stdout}")
-                logger.error(f"stderr: {process.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            logger.error(f"❌ Transcription timed out for: {episode_title}")
-            return None
+            subprocess.run(["modal", "app", "stop", APP_NAME], 
+                         capture_output=True, check=True)
+            invalidate_readiness()
+            logger.info("💰 Modal app stopped - no more costs")
         except Exception as e:
-            logger.error(f"❌ Error transcribing '{episode_title}': {str(e)}")
-            return None
+            logger.warning(f"⚠️  Could not auto-stop Modal app: {e}")
     
-    def save_transcription(self, transcription_data: dict, podcast_title: str) -> pathlib.Path:
-        """Save transcription results to file."""
-        episode_title = transcription_data['episode_metadata'].get('title', 'unknown')
-        episode_date = transcription_data['episode_metadata'].get('airDate', 'unknown')
+    def journal_for(self, podcast_name: str) -> JobJournal:
+        """The job journal used for runs of this podcast name."""
+        safe_name = "".join(c if c.isalnum() else '_' for c in podcast_name.lower()).strip('_')[:80]
+        return JobJournal(self.output_dir / ".journal" / f"{safe_name}.jsonl")
+    
+    def model_for(self, episode: dict, language: str = 'en') -> str:
+        """
+        The Whisper model name to transcribe `episode` with.
+
+        With the "auto" policy this may size the audio file over the network
+        the first time it is asked about an episode.
+        """
+        if self.model != AUTO_MODEL:
+            return self.model
+        key = (episode_guid_hash(episode), language)
+        if key not in self._auto_models:
+            duration = episode_duration(episode)
+            model = select_model(duration, self.latency_budget, language)
+            length = f"{duration / 60:.0f} min" if duration is not None else "unknown length"
+            logger.info(f"🧭 Using {model.name} for '{episode.get('title', 'Unknown Episode')}' ({length})")
+            self._auto_models[key] = model.name
+        return self._auto_models[key]
+
+    def local_model(self, model_name: str):
+        """The `LocalModel` for `model_name`, shared by every episode of this pipeline."""
+        from .local_backend import LocalModel
+
+        if model_name not in self._local_models:
+            self._local_models[model_name] = LocalModel(model_name)
+        return self._local_models[model_name]
+
+    def is_cached(self, episode: dict, language: str = 'en') -> bool:
+        """Whether a transcription of this episode is already in the local cache."""
+        model_id = whisper_model_id(self.model_for(episode, language))
+        return self.cache.contains(episode_guid_hash(episode), model_id, language)
+    
+    def transcribe_episode(self, episode: dict, language: str = 'en',
+                           force_refresh: bool = False, journal: Optional[JobJournal] = None,
+                           call_id: Optional[str] = None) -> Optional[dict]:
+        """
+        Transcribe a single episode by calling the deployed Modal app in-process.
+
+        Results are served from the local cache when available, unless
+        `force_refresh` is set. Passing the `call_id` of an earlier submission
+        re-attaches to that Modal call instead of starting a new one.
+        """
+        from .async_pipeline import AsyncPodcastTranscriptionPipeline
+        
+        return asyncio.run(AsyncPodcastTranscriptionPipeline(self).transcribe_episode(
+            episode, language, force_refresh=force_refresh, journal=journal, call_id=call_id
+        ))
+    
+    def _path_stem(self, episode_metadata: dict, podcast_title: str) -> pathlib.Path:
+        """The output path of an episode's transcription, without the output profile's extension."""
+        episode_title = episode_metadata.get('title', 'unknown')
+        episode_date = episode_metadata.get('airDate', 'unknown')
         
         # Create safe filename components
         safe_podcast = "".join(c for c in podcast_title if c.isalnum() or c in (' ', '-', '_')).strip()[:50]
@@ -272,80 +253,122 @@ class PodcastTranscriptionPipeline:
         else:
             safe_date = "unknown"
         
-        filename = f"{safe_podcast}_{safe_episode}_{safe_date}.json"
-        filepath = self.output_dir / filename
-        
-        # Save comprehensive data
-        output_data = {
+        return self.output_dir / f"{safe_podcast}_{safe_episode}_{safe_date}"
+    
+    def _output_record(self, transcription_data: dict, podcast_title: str) -> dict:
+        # Comprehensive data; the output profile decides what is kept
+        transcription = transcription_data.get('transcription') or {}
+        return {
+            'guid_hash': episode_guid_hash(transcription_data['episode_metadata']),
             'podcast_title': podcast_title,
-            'episode_title': episode_title,
-            'episode_date': episode_date,
+            'episode_title': transcription_data['episode_metadata'].get('title', 'unknown'),
+            'episode_date': transcription_data['episode_metadata'].get('airDate', 'unknown'),
             'audio_url': transcription_data['audio_url'],
-            'transcription_text': transcription_data['transcription']['text'],
-            'transcription_chunks': transcription_data['transcription'].get('chunks', []),
+            'transcription_text': transcription.get('text', ''),
+            'transcription_chunks': transcription.get('chunks', []),
+            'model': transcription_data.get('model'),
             'episode_metadata': transcription_data['episode_metadata']
         }
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+    
+    def save_transcription(self, transcription_data: dict, podcast_title: str) -> pathlib.Path:
+        """Save transcription results to file."""
+        filepath = write_transcription(
+            self._path_stem(transcription_data['episode_metadata'], podcast_title),
+            self._output_record(transcription_data, podcast_title),
+            self.output_format, metadata_dir=self.output_dir / "metadata"
+        )
         
         logger.info(f"💾 Saved transcription to: {filepath}")
         return filepath
     
+    def open_streaming_output(self, episode: dict, podcast_title: str, model_id: str) -> JsonlTranscriptionWriter:
+        """
+        Start an episode's JSONL output file before it is transcribed, so
+        segments can be appended as they arrive. It is only renamed into
+        place once closed.
+        """
+        record = self._output_record(
+            {'episode_metadata': episode, 'audio_url': episode.get('audioUrl'), 'model': model_id}, podcast_title
+        )
+        return open_jsonl_transcription(self._path_stem(episode, podcast_title), record)
+    
+    def transcribe_episodes(self, episodes: list[dict], podcast_title: str, language: str = 'en',
+                            max_concurrency: int = 1, force_refresh: bool = False,
+                            journal: Optional[JobJournal] = None, resume: bool = False) -> list[pathlib.Path]:
+        """
+        Transcribe and save episodes, keeping up to `max_concurrency` in flight.
+
+        Each transcription is saved as soon as it finishes. A failed episode is
+        logged and skipped without stopping the rest of the batch. Progress is
+        recorded in `journal` if given; with `resume`, episodes the journal
+        already saved are skipped and in-flight Modal calls are re-attached.
+        Returns the saved files in episode order.
+        """
+        from .async_pipeline import AsyncPodcastTranscriptionPipeline
+        
+        return asyncio.run(AsyncPodcastTranscriptionPipeline(self, max_concurrency=max_concurrency).transcribe_episodes(
+            episodes, podcast_title, language=language,
+            force_refresh=force_refresh, journal=journal, resume=resume
+        ))
+    
     def process_podcast(self, podcast_name: str, max_episodes: int = 5, 
                        episode_filter: Optional[str] = None, language: str = 'en', 
-                       auto_stop: bool = False) -> list[pathlib.Path]:
-        """Complete pipeline: search -> get episodes -> transcribe -> save."""
+                       auto_stop: bool = False, max_concurrency: int = 1,
+                       force_refresh: bool = False, resume: bool = False) -> list[pathlib.Path]:
+        """
+        Complete pipeline: search -> get episodes -> transcribe -> save.
+
+        Progress is journaled per podcast name. With `resume`, a previous run
+        that was interrupted carries on where it left off. This wraps
+        `AsyncPodcastTranscriptionPipeline`, so it can't be called from a
+        running event loop; await that class directly instead.
+        """
         logger.info(f"🚀 Starting podcast transcription pipeline")
         logger.info(f"📺 Podcast: {podcast_name}")
         logger.info(f"📊 Max episodes: {max_episodes}")
+        logger.info(f"⚡ Max concurrency: {max_concurrency}")
         if episode_filter:
             logger.info(f"🔍 Filter: {episode_filter}")
         logger.info(f"🌍 Language: {language}")
         
-        # Step 0: Ensure Modal app is running
-        if not self.ensure_modal_app_running():
-            raise RuntimeError("Failed to start Modal app")
+        from .async_pipeline import AsyncPodcastTranscriptionPipeline
         
-        # Step 1: Find podcast
-        podcast = self.search_and_get_podcast(podcast_name)
+        # Search, transcribe and save, with the stages overlapping
+        transcribed_files = asyncio.run(AsyncPodcastTranscriptionPipeline(self, max_concurrency=max_concurrency).process_podcast(
+            podcast_name, max_episodes=max_episodes, episode_filter=episode_filter,
+            language=language, force_refresh=force_refresh, resume=resume
+        ))
         
-        # Step 2: Get episodes with URLs
-        episodes = self.get_episodes_with_urls(podcast, max_episodes, episode_filter)
+        logger.info(f"\n✅ Pipeline complete! Transcribed {len(transcribed_files)} episodes")
+        logger.info(f"📁 Files saved to: {self.output_dir}")
         
-        if not episodes:
-            logger.error("❌ No valid episodes found")
-            return []
+        # Auto-stop Modal app if requested
+        if auto_stop:
+            self.stop_modal_app()
         
-        # Step 3: Transcribe each episode
-        transcribed_files = []
-        for i, episode in enumerate(episodes, 1):
-            logger.info(f"\n📋 Processing episode {i}/{len(episodes)}")
-            
-            transcription_data = self.transcribe_episode(episode, language)
-            
-            if transcription_data:
-                # Step 4: Save transcription
-                saved_file = self.save_transcription(transcription_data, podcast.title)
-                transcribed_files.append(saved_file)
-                
-                # Display preview
-                text_preview = transcription_data['transcription']['text'][:200]
-                logger.info(f"📝 Preview: {text_preview}...")
-            else:
-                logger.warning(f"⚠️  Skipping failed transcription for episode {i}")
+        return transcribed_files
+    
+    def process_podcasts(self, podcast_names: list[str], max_episodes: int = 5,
+                         episode_filter: Optional[str] = None, language: str = 'en',
+                         auto_stop: bool = False, max_concurrency: int = 1,
+                         force_refresh: bool = False, resume: bool = False) -> dict[str, list[pathlib.Path]]:
+        """
+        Run several podcasts through the pipeline in one event loop and connection pool.
+
+        Returns the saved files per podcast name. A podcast that can't be found
+        is logged and maps to an empty list.
+        """
+        from .async_pipeline import AsyncPodcastTranscriptionPipeline
         
-        logger.info(f"\n✅ Pipeline complete! Transcribed {len(transcribed_files)}/{len(episodes)} episodes")
+        logger.info(f"🚀 Starting podcast transcription pipeline for {len(podcast_names)} podcasts")
+        results = asyncio.run(AsyncPodcastTranscriptionPipeline(self, max_concurrency=max_concurrency).process_podcasts(
+            podcast_names, max_episodes=max_episodes, episode_filter=episode_filter,
+            language=language, force_refresh=force_refresh, resume=resume
+        ))
+        logger.info(f"\n✅ Pipeline complete! Transcribed {sum(map(len, results.values()))} episodes")
         logger.info(f"📁 Files saved to: {self.output_dir}")
         
-        # Auto-stop Modal app if requested
         if auto_stop:
-            logger.info("🛑 Auto-stopping Modal app to free resources...")
-            try:
-                subprocess.run(["modal", "app", "stop", "example-base-whisper"], 
-                             capture_output=True, check=True)
-                logger.info("💰 Modal app stopped - no more costs")
-            except Exception as e:
-                logger.warning(f"⚠️  Could not auto-stop Modal app: {e}")
+            self.stop_modal_app()
         
-        return transcribed_files 
\ No newline at end of file
+        return results 
\ No newline at end of file
@@ -2,17 +2,53 @@
 Podcast discovery and metadata retrieval using Podchaser API.
 """
 
+import asyncio
+import atexit
+import contextlib
+import copy
 import dataclasses
+import functools
+import hashlib
+import http.client
+import json
+import math
 import os
 import pathlib
-import urllib.request
+import random
+import threading
+import time
+import urllib.error
 import warnings
-from typing import NamedTuple, Optional, TypedDict, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, Iterator, NamedTuple, Optional, TypedDict, Union
+import aiohttp
 import dotenv
 from gql import Client, gql
+from graphql import (
+    DocumentNode,
+    NameNode,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionSetNode,
+    VariableNode,
+    Visitor,
+    visit,
+)
 from gql.transport.aiohttp import AIOHTTPTransport
+from gql.transport.exceptions import TransportQueryError, TransportServerError
 
-from .config import get_logger
+from .config import LOCAL_CACHE_DIR, RAW_AUDIO_DIR, get_logger
+from .http_pool import (
+    SEGMENT_SIZE,
+    SEGMENTED_MIN_SIZE,
+    ResolvedUrl,
+    ResourceChanged,
+    default_pool,
+    default_resolve_cache,
+    fetch_segments,
+    http_error,
+    resolve,
+)
 
 dotenv.load_dotenv()
 
@@ -20,6 +56,43 @@ dotenv.load_dotenv()
 warnings.filterwarnings("ignore", message=".*ssl certificates.*", module="gql.transport.aiohttp")
 
 logger = get_logger(__name__)
+
+PODCHASER_API_URL = "https://api.podchaser.com/graphql"
+TOKEN_CACHE_PATH = LOCAL_CACHE_DIR / "podchaser_token.json"
+# Refresh access tokens this many seconds before Podchaser says they expire.
+TOKEN_EXPIRY_MARGIN = 60 * 5
+# Used when the token response has no expires_in.
+DEFAULT_TOKEN_LIFETIME = 60 * 60 * 24
+# Introspection result of Podchaser's schema, so clients validate locally.
+SCHEMA_CACHE_PATH = LOCAL_CACHE_DIR / "podchaser_schema.json"
+SCHEMA_CACHE_TTL = 60 * 60 * 24 * 7
+# Podchaser caps `first` at 100 episodes per page.
+MAX_EPISODES_PER_PAGE = 100
+# Small allowance for episodes without an audio URL, so the first page usually suffices.
+EPISODE_PAGE_HEADROOM = 2
+# Once the total is known, at most this many later pages are requested at once.
+EPISODE_PAGE_CONCURRENCY = 4
+# Client-side request budget, kept under Podchaser's rate limit: sustained
+# requests per second, and how many may go out back to back.
+REQUESTS_PER_SECOND = 4
+REQUEST_BURST = 8
+# Throttled (429), 5xx and connection failures are retried with full jitter.
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+# Concurrent lookups arriving within this window are merged into one request.
+BATCH_WINDOW = 0.02
+MAX_BATCH_SIZE = 10
+# Audio downloads are streamed in chunks of this size, so memory use does not
+# depend on episode length, and resumed after dropped connections.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_TIMEOUT = 60
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_PROGRESS_INTERVAL = 10 * 1024 * 1024
+# Used to estimate an episode's duration from its file size: 128 kbps, the usual podcast MP3 bitrate.
+ESTIMATED_AUDIO_BYTES_PER_SECOND = 128_000 // 8
+# Set a user agent to avoid 403 response from some podcast audio servers.
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_9_3) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/35.0.1916.47 Safari/537.36"
 Segment = TypedDict("Segment", {"text": str, "start": float, "end": float})
 
 
@@ -44,6 +117,8 @@ class EpisodeMetadata:
     episode_url: Optional[str]
     # Link to audio file for episode. Typically an .mp3 file.
     original_download_link: str
+    # Length of the audio in seconds, when the publisher states it.
+    duration: Optional[int] = None
 
 
 @dataclasses.dataclass
@@ -61,35 +136,222 @@ class PodcastMetadata:
     language: Optional[str] = None
 
 
+def get_guid_hash(guid: str) -> str:
+    """Hash an episode guid into something appropriate for filenames."""
+    return hashlib.sha256(guid.encode("utf-8")).hexdigest()[:32]
+
+
+def episode_guid_hash(episode: dict) -> str:
+    """
+    Guid hash for a raw Podchaser episode dict. Falls back to the audio URL
+    for the few feeds that don't publish a guid.
+    """
+    return get_guid_hash(episode.get("guid") or episode["audioUrl"])
+
+
+def episode_duration(episode: dict) -> Optional[float]:
+    """
+    An episode's length in seconds: the stated `length` if the episode has one,
+    else estimated from the audio file size (one cached range request).
+    """
+    if episode.get("length"):
+        return float(episode["length"])
+    if not episode.get("audioUrl"):
+        return None
+    try:
+        size = resolve(episode["audioUrl"], {"User-Agent": USER_AGENT}).size
+    except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+        logger.warning(f"⚠️  Could not size audio for '{episode.get('title', 'Unknown')}': {e}")
+        return None
+    return size / ESTIMATED_AUDIO_BYTES_PER_SECOND if size else None
+
+
 class DownloadResult(NamedTuple):
-    data: bytes
+    path: pathlib.Path
+    size: int
+    # Hex SHA-256 of the file, computed while downloading.
+    sha256: str
     # Helpful to store and transmit when uploading to cloud bucket.
     content_type: str
 
 
-def download_podcast_file(url: str) -> DownloadResult:
-    req = urllib.request.Request(
-        url,
-        data=None,
-        # Set a user agent to avoid 403 response from some podcast audio servers.
-        headers={
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_9_3) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/35.0.1916.47 Safari/537.36"
-        },
+def raw_audio_path(guid_hash: str) -> pathlib.Path:
+    """Where an episode's original audio is stored, see `config.RAW_AUDIO_DIR`."""
+    return RAW_AUDIO_DIR / guid_hash
+
+
+def _partial_paths(destination: pathlib.Path) -> tuple[pathlib.Path, pathlib.Path]:
+    """The in-progress download and its sidecar recording the validator to resume against."""
+    return destination.with_name(f".{destination.name}.part"), destination.with_name(f".{destination.name}.part.json")
+
+
+def _hash_file(path: pathlib.Path, chunk_size: int = DOWNLOAD_CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest
+
+
+def _total_size(response, offset: int) -> Optional[int]:
+    content_range = response.headers.get("Content-Range")
+    if content_range and "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    content_length = response.headers.get("Content-Length")
+    return offset + int(content_length) if content_length else None
+
+
+def _load_partial_meta(meta_path: pathlib.Path) -> dict:
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _download_stream(url: str, resolved: ResolvedUrl, part_path: pathlib.Path, meta_path: pathlib.Path,
+                     progress: Optional[Callable[[int, Optional[int]], None]]) -> tuple[str, int, str]:
+    """
+    One attempt at streaming the file into `part_path`, resuming what an earlier attempt left there.
+
+    Returns the SHA-256, size and content type of the complete file.
+    """
+    meta = _load_partial_meta(meta_path)
+    validator = meta.get("validator")
+    # A segmented download leaves a full-size file with holes, which can't be resumed sequentially.
+    if part_path.exists() and validator and "segments" not in meta:
+        digest = _hash_file(part_path)
+        offset = part_path.stat().st_size
+        logger.info(f"Resuming download of {url} at {sizeof_fmt(offset)}.")
+    else:
+        part_path.unlink(missing_ok=True)
+        digest, offset = hashlib.sha256(), 0
+
+    headers = {"User-Agent": USER_AGENT}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+    with default_pool().request("GET", resolved.url, headers) as response:
+        if response.status == 416 and offset:
+            # Everything was already downloaded before the connection dropped.
+            return digest.hexdigest(), offset, response.getheader("Content-Type", "application/octet-stream")
+        if response.status in (301, 302, 303, 307, 308):
+            raise ResourceChanged(f"{resolved.url} now redirects")
+        if response.status >= 400:
+            raise http_error(resolved.url, response)
+        if offset and response.status != 206:
+            # The server ignored the range or the file changed; start over.
+            logger.info(f"Server sent the whole file for {url}, restarting download.")
+            digest, offset = hashlib.sha256(), 0
+        total = _total_size(response, offset)
+        content_type = response.getheader("Content-Type", "application/octet-stream")
+        validator = response.getheader("ETag") or response.getheader("Last-Modified")
+        _write_private_json(meta_path, {"url": url, "validator": validator})
+        with open(part_path, "ab" if offset else "wb") as f:
+            while chunk := response.read(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+                offset += len(chunk)
+                if progress:
+                    progress(offset, total)
+            f.flush()
+            os.fsync(f.fileno())
+    if total is not None and offset < total:
+        raise http.client.IncompleteRead(b"", total - offset)
+    return digest.hexdigest(), offset, content_type
+
+
+def _download_segments(url: str, resolved: ResolvedUrl, part_path: pathlib.Path, meta_path: pathlib.Path,
+                       progress: Optional[Callable[[int, Optional[int]], None]]) -> None:
+    """Fetch the file as parallel byte ranges, skipping the segments an earlier attempt finished."""
+    meta = _load_partial_meta(meta_path)
+    resumable = (
+        part_path.exists()
+        and meta.get("validator") == resolved.validator
+        and meta.get("size") == resolved.size
+        and meta.get("segment_size") == SEGMENT_SIZE
     )
-    with urllib.request.urlopen(req) as response:
-        return DownloadResult(
-            data=response.read(),
-            content_type=response.headers["content-type"],
-        )
+    done = set(meta.get("segments", [])) if resumable else set()
+    if done:
+        logger.info(f"Resuming download of {url} with {len(done)} segments already fetched.")
+    elif not resumable:
+        part_path.unlink(missing_ok=True)
+    lock = threading.Lock()
 
+    def record(index: Optional[int] = None) -> None:
+        with lock:
+            if index is not None:
+                done.add(index)
+            _write_private_json(meta_path, {
+                "url": url,
+                "validator": resolved.validator,
+                "size": resolved.size,
+                "segment_size": SEGMENT_SIZE,
+                "segments": sorted(done),
+            })
 
-def create_podchaser_client():
+    record()
+    fetch_segments(resolved, part_path, {"User-Agent": USER_AGENT}, done, record, progress)
+
+
+def download_podcast_file(url: str, destination: pathlib.Path,
+                          progress: Optional[Callable[[int, Optional[int]], None]] = None) -> DownloadResult:
     """
-    Use's Podchaser's graphql API to get an new access token and instantiate
-    a graphql client with it.
+    Download `url` to `destination` over pooled keep-alive connections.
+
+    The redirect chain in front of the audio is resolved once and cached (see
+    `http_pool.resolve`). Files of at least `SEGMENTED_MIN_SIZE` on servers
+    that accept ranges are fetched as parallel segments; others are streamed
+    in fixed-size chunks. Bytes go to a hidden '.part' file next to
+    `destination`, which is renamed into place once complete. A '.part' left by
+    an interrupted download is resumed, guarded by If-Range so a changed file
+    restarts from zero. Dropped connections are retried the same way.
+    `progress(downloaded_bytes, total_bytes_or_None)` is called after every chunk.
     """
-    transport = AIOHTTPTransport(url="https://api.podchaser.com/graphql")
-    client = Client(transport=transport, fetch_schema_from_transport=True)
+    destination = pathlib.Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    part_path, meta_path = _partial_paths(destination)
+    resolve_cache = default_resolve_cache()
+
+    for attempt in range(DOWNLOAD_RETRIES + 1):
+        cached_resolution = resolve_cache.get(url) is not None
+        try:
+            resolved = resolve(url, {"User-Agent": USER_AGENT})
+            if resolved.accept_ranges and resolved.validator and (resolved.size or 0) >= SEGMENTED_MIN_SIZE:
+                _download_segments(url, resolved, part_path, meta_path, progress)
+                sha256, size = _hash_file(part_path).hexdigest(), resolved.size
+                content_type = resolved.content_type or "application/octet-stream"
+            else:
+                sha256, size, content_type = _download_stream(url, resolved, part_path, meta_path, progress)
+            break
+        except ResourceChanged as e:
+            resolve_cache.invalidate(url)
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+            logger.info(f"{e}; resolving {url} again.")
+            continue
+        except urllib.error.HTTPError as e:
+            if cached_resolution and e.code in (403, 404, 410):
+                # Signed CDN URLs expire; the chain may lead somewhere else now.
+                resolve_cache.invalidate(url)
+                if attempt < DOWNLOAD_RETRIES:
+                    continue
+            if e.code < 500 or attempt == DOWNLOAD_RETRIES:
+                raise
+            error = e
+        except (urllib.error.URLError, http.client.HTTPException, ConnectionError, TimeoutError) as e:
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+            error = e
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+        logger.warning(f"Download of {url} interrupted ({error}), resuming in {delay:.0f}s.")
+        time.sleep(delay)
+
+    os.replace(part_path, destination)
+    meta_path.unlink(missing_ok=True)
+    return DownloadResult(path=destination, size=size, sha256=sha256, content_type=content_type)
+
+
+def _podchaser_credentials() -> tuple[str, str]:
     podchaser_client_id = os.environ.get("PODCHASER_CLIENT_ID")
     podchaser_client_secret = os.environ.get("PODCHASER_CLIENT_SECRET")
 
@@ -97,169 +359,708 @@ def create_podchaser_client():
         raise ValueError(
             "Must provide both PODCHASER_CLIENT_ID and PODCHASER_CLIENT_SECRET as environment vars."
         )
+    return podchaser_client_id, podchaser_client_secret
 
-    query = gql(
-        """
-        mutation {{
-            requestAccessToken(
-                input: {{
-                    grant_type: CLIENT_CREDENTIALS
-                    client_id: "{client_id}"
-                    client_secret: "{client_secret}"
-                }}
-            ) {{
-                access_token
-                token_type
-            }}
-        }}
-    """.format(
-            client_id=podchaser_client_id,
-            client_secret=podchaser_client_secret,
-        )
-    )
 
-    result = client.execute(query)
+ACCESS_TOKEN_MUTATION = gql(
+    """
+    mutation requestAccessToken($clientId: String!, $clientSecret: String!) {
+        requestAccessToken(
+            input: {grant_type: CLIENT_CREDENTIALS, client_id: $clientId, client_secret: $clientSecret}
+        ) {
+            access_token
+            token_type
+            expires_in
+        }
+    }
+    """
+)
+
 
-    access_token = result["requestAccessToken"]["access_token"]
+def _write_private_json(path: pathlib.Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _load_cached_token(client_id: str) -> Optional[str]:
+    try:
+        cached = json.loads(TOKEN_CACHE_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if cached.get("client_id") != client_id:
+        return None
+    if cached.get("expires_at", 0) - TOKEN_EXPIRY_MARGIN < time.time():
+        return None
+    return cached["access_token"]
+
+
+def _store_token(client_id: str, token: dict) -> str:
+    expires_in = token.get("expires_in") or DEFAULT_TOKEN_LIFETIME
+    _write_private_json(TOKEN_CACHE_PATH, {
+        "client_id": client_id,
+        "access_token": token["access_token"],
+        "expires_at": time.time() + expires_in,
+    })
+    return token["access_token"]
+
+
+def clear_cached_token() -> None:
+    """Forget the cached access token, eg. after Podchaser rejected it."""
+    TOKEN_CACHE_PATH.unlink(missing_ok=True)
+
+
+def _load_cached_introspection() -> Optional[dict]:
+    try:
+        if time.time() - SCHEMA_CACHE_PATH.stat().st_mtime > SCHEMA_CACHE_TTL:
+            return None
+        return json.loads(SCHEMA_CACHE_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _authenticated_client(access_token: str, client_session_args: Optional[dict] = None) -> Client:
+    """
+    A client that validates against the disk-cached schema, only falling back
+    to introspection when there is no snapshot yet.
+    """
     transport = AIOHTTPTransport(
-        url="https://api.podchaser.com/graphql",
+        url=PODCHASER_API_URL,
         headers={"Authorization": f"Bearer {access_token}"},
+        client_session_args=client_session_args,
+    )
+    introspection = _load_cached_introspection()
+    return Client(
+        transport=transport,
+        introspection=introspection,
+        fetch_schema_from_transport=introspection is None,
+    )
+
+
+def get_access_token() -> str:
+    """
+    Podchaser access token, from the on-disk cache while it is valid and
+    otherwise from the `requestAccessToken` mutation.
+    """
+    client_id, client_secret = _podchaser_credentials()
+    access_token = _load_cached_token(client_id)
+    if access_token:
+        return access_token
+
+    logger.info("Requesting a new Podchaser access token.")
+    client = Client(transport=AIOHTTPTransport(url=PODCHASER_API_URL))
+    result = client.execute(
+        ACCESS_TOKEN_MUTATION, variable_values={"clientId": client_id, "clientSecret": client_secret}
     )
+    return _store_token(client_id, result["requestAccessToken"])
+
+
+async def get_access_token_async(client_session_args: Optional[dict] = None) -> str:
+    """Async counterpart of `get_access_token`."""
+    client_id, client_secret = _podchaser_credentials()
+    access_token = _load_cached_token(client_id)
+    if access_token:
+        return access_token
+
+    logger.info("Requesting a new Podchaser access token.")
+    transport = AIOHTTPTransport(url=PODCHASER_API_URL, client_session_args=client_session_args)
+    async with Client(transport=transport) as session:
+        result = await session.execute(
+            ACCESS_TOKEN_MUTATION, variable_values={"clientId": client_id, "clientSecret": client_secret}
+        )
+    return _store_token(client_id, result["requestAccessToken"])
 
-    return Client(transport=transport, fetch_schema_from_transport=True)
 
+def create_podchaser_client():
+    """
+    Instantiate a graphql client for Podchaser's API, using the cached access
+    token and schema snapshot where possible.
 
-def search_podcast_name(gql, client, name, max_results=5) -> list[dict]:
+    Prefer `get_podchaser_client`, which shares one connected client.
     """
-    Search for a podcast by name/title. eg. 'Joe Rogan Experience' or 'Serial'.
+    return _authenticated_client(get_access_token())
 
-    This method does not paginate queries because 100s of search results is not
-    useful in this application.
+
+async def create_podchaser_client_async(client_session_args: Optional[dict] = None) -> Client:
     """
-    if max_results > 100:
-        raise ValueError(
-            f"A maximum of 100 results is supported, but {max_results} results were requested."
+    Async counterpart of `create_podchaser_client`. The returned client is not
+    connected; use it with `async with client as session`.
+
+    `client_session_args` are passed to aiohttp, eg. to share a connector.
+    """
+    access_token = await get_access_token_async(client_session_args)
+    return _authenticated_client(access_token, client_session_args)
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by every event loop and thread in the process.
+
+    Each request reserves a token up front and sleeps until it is due, so
+    concurrent callers are spaced out instead of racing for the next token.
+    """
+
+    def __init__(self, rate: float = REQUESTS_PER_SECOND, capacity: int = REQUEST_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            return max(0.0, self._updated - now) + max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self) -> None:
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all new requests for `seconds`, eg. after being throttled."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, time.monotonic() + seconds)
+
+
+_rate_limiter = TokenBucket()
+
+
+def _is_retryable(e: Exception) -> bool:
+    if isinstance(e, TransportServerError):
+        return e.code is not None and (e.code == 429 or e.code >= 500)
+    if isinstance(e, TransportQueryError):
+        # A 429 with a JSON body surfaces as a GraphQL error rather than a server error.
+        message = str(e).lower()
+        return any(s in message for s in ("too many requests", "rate limit", "throttl"))
+    return isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+# Documents whose concurrent executions may be merged with field aliases.
+_BATCHABLE_DOCUMENTS: set[int] = set()
+_batched_documents: dict[tuple[int, int], tuple[DocumentNode, DocumentNode]] = {}
+
+
+def _batchable(document: DocumentNode) -> DocumentNode:
+    (operation,) = document.definitions
+    if not isinstance(operation, OperationDefinitionNode) or operation.operation != OperationType.QUERY:
+        raise ValueError("Only single-operation queries can be batched.")
+    _BATCHABLE_DOCUMENTS.add(id(document))
+    return document
+
+
+class _SuffixVariables(Visitor):
+    def __init__(self, suffix: str):
+        super().__init__()
+        self.suffix = suffix
+
+    def enter_variable(self, node, *_):
+        return VariableNode(name=NameNode(value=f"{node.name.value}{self.suffix}"))
+
+
+def _root_fields(document: DocumentNode) -> list[str]:
+    return [(field.alias or field.name).value for field in document.definitions[0].selection_set.selections]
+
+
+def _batched_document(document: DocumentNode, count: int) -> DocumentNode:
+    """
+    `count` copies of a query merged into one document. Copy i has its root
+    fields aliased 'b{i}_<field>' and its variables suffixed '_{i}'.
+    """
+    key = (id(document), count)
+    if key not in _batched_documents:
+        operation = document.definitions[0]
+        variable_definitions, selections = [], []
+        for i in range(count):
+            suffix = _SuffixVariables(f"_{i}")
+            variable_definitions += [visit(definition, suffix) for definition in operation.variable_definitions]
+            for field in operation.selection_set.selections:
+                field = copy.copy(visit(field, suffix))
+                field.alias = NameNode(value=f"b{i}_{(field.alias or field.name).value}")
+                selections.append(field)
+        batched = OperationDefinitionNode(
+            operation=OperationType.QUERY,
+            name=NameNode(value=f"{operation.name.value if operation.name else 'query'}Batch{count}"),
+            variable_definitions=tuple(variable_definitions),
+            directives=(),
+            selection_set=SelectionSetNode(selections=tuple(selections)),
         )
-    current_page = 0
-    max_episodes_per_request = max_results
-    search_podcast_name_query = gql(
+        # Keep `document` alive alongside its batched form so its id is never reused.
+        _batched_documents[key] = (document, DocumentNode(definitions=(batched,)))
+    return _batched_documents[key][1]
+
+
+class PodchaserScheduler:
+    """
+    Rate-limited, retrying front for a connected gql session, with the same
+    `execute` interface.
+
+    Every request first takes a token from the process-wide `TokenBucket`.
+    Throttling, 5xx and connection errors are retried with jittered
+    exponential backoff, and a throttled response pauses the bucket so
+    concurrent requests back off too. Concurrent executions of a batchable
+    document (podcast search, podcast and episode lookups) are coalesced
+    into one request using field aliases.
+    """
+
+    def __init__(self, session, rate_limiter: Optional[TokenBucket] = None):
+        self.session = session
+        self.rate_limiter = rate_limiter or _rate_limiter
+        self._pending: dict[int, list[tuple[dict, asyncio.Future]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def _send(self, document: DocumentNode, variable_values: Optional[dict]) -> dict:
+        for attempt in range(MAX_RETRIES + 1):
+            await self.rate_limiter.acquire()
+            try:
+                return await self.session.execute(document, variable_values=variable_values)
+            except Exception as e:
+                if attempt == MAX_RETRIES or not _is_retryable(e):
+                    raise
+                delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+                logger.warning(f"Podchaser request failed ({e}), retrying in {delay:.1f}s.")
+                if not isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+                    self.rate_limiter.pause(delay)
+                await asyncio.sleep(delay)
+
+    async def execute(self, document: DocumentNode, variable_values: Optional[dict] = None) -> dict:
+        if id(document) not in _BATCHABLE_DOCUMENTS:
+            return await self._send(document, variable_values)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.get(id(document))
+        if batch is None:
+            batch = self._pending[id(document)] = []
+            loop.call_later(BATCH_WINDOW, self._flush, document)
+        batch.append((variable_values or {}, future))
+        if len(batch) >= MAX_BATCH_SIZE:
+            self._flush(document)
+        return await future
+
+    def _flush(self, document: DocumentNode) -> None:
+        batch = self._pending.pop(id(document), None)
+        if batch:
+            task = asyncio.ensure_future(self._send_batch(document, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, document: DocumentNode, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        if len(batch) == 1:
+            (variable_values, future), = batch
+            try:
+                result = await self._send(document, variable_values)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                return
+            if not future.done():
+                future.set_result(result)
+            return
+
+        fields = _root_fields(document)
+        variable_values = {
+            f"{name}_{i}": value for i, (values, _) in enumerate(batch) for name, value in values.items()
+        }
+        error: Optional[Exception] = None
+        try:
+            data = await self._send(_batched_document(document, len(batch)), variable_values)
+        except TransportQueryError as e:
+            # Keep the results of lookups that succeeded alongside one that failed.
+            error, data = e, e.data or {}
+        except Exception as e:
+            error, data = e, {}
+        for i, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            result = {field: data.get(f"b{i}_{field}") for field in fields}
+            if error is not None and any(value is None for value in result.values()):
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+@contextlib.asynccontextmanager
+async def podchaser_session(client_session_args: Optional[dict] = None):
+    """
+    Connected Podchaser session, wrapped in a `PodchaserScheduler`. If the
+    schema had to be fetched by introspection, it is saved to disk for the
+    next client.
+    """
+    client = await create_podchaser_client_async(client_session_args)
+    async with client as session:
+        if client.fetch_schema_from_transport and client.introspection:
+            _write_private_json(SCHEMA_CACHE_PATH, client.introspection)
+        yield PodchaserScheduler(session)
+
+
+def _is_auth_error(e: Exception) -> bool:
+    # Depending on the endpoint, Podchaser reports a bad token as HTTP 401 or as
+    # an 'Unauthenticated.' GraphQL error.
+    if isinstance(e, TransportServerError):
+        return e.code == 401
+    return "unauthenticated" in str(e).lower()
+
+
+class PodchaserClient:
+    """
+    Long-lived Podchaser client for sync code.
+
+    gql's sync `Client.execute` opens and closes a new aiohttp session per
+    query. This class instead keeps one connected session on a background
+    event loop, so every query reuses the same connection pool.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="podchaser-client", daemon=True)
+        self._thread.start()
+        self._lock = threading.Lock()
+        self._stack: Optional[contextlib.AsyncExitStack] = None
+        self._session = None
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _connect(self):
+        self._stack = contextlib.AsyncExitStack()
+        self._session = await self._stack.enter_async_context(podchaser_session())
+
+    async def _disconnect(self):
+        if self._stack:
+            await self._stack.aclose()
+        self._stack = None
+        self._session = None
+
+    def _ensure_connected(self):
+        with self._lock:
+            if self._session is None:
+                self._run(self._connect())
+            return self._session
+
+    def execute(self, document, variable_values: Optional[dict] = None) -> dict:
+        session = self._ensure_connected()
+        try:
+            return self._run(session.execute(document, variable_values=variable_values))
+        except (TransportServerError, TransportQueryError) as e:
+            if not _is_auth_error(e):
+                raise
+            # The cached token was revoked or expired early; get a new one and retry once.
+            logger.info("Podchaser rejected the access token, requesting a new one.")
+            clear_cached_token()
+            with self._lock:
+                self._run(self._disconnect())
+            session = self._ensure_connected()
+            return self._run(session.execute(document, variable_values=variable_values))
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        with self._lock:
+            self._run(self._disconnect())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+_shared_client: Optional[PodchaserClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_podchaser_client() -> PodchaserClient:
+    """The process-wide `PodchaserClient`, created on first use."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = PodchaserClient()
+            atexit.register(_shared_client.close)
+        return _shared_client
+
+
+PODCAST_FIELDS = ("id", "title", "description", "language", "htmlDescription", "webUrl")
+# `length` (seconds) lets the "auto" model policy skip sizing the audio file.
+EPISODE_FIELDS = ("id", "title", "airDate", "audioUrl", "description", "htmlDescription", "guid", "url",
+                  "length")
+
+
+def _selection(fields: Iterable[str]) -> str:
+    fields = tuple(fields)
+    if not fields:
+        raise ValueError("At least one field must be selected.")
+    return " ".join(fields)
+
+
+@functools.lru_cache(maxsize=None)
+def _search_podcasts_document(fields: tuple[str, ...]) -> DocumentNode:
+    return _batchable(gql(
+        f"""
+        query searchPodcasts($searchTerm: String!, $first: Int!, $page: Int!) {{
+            podcasts(searchTerm: $searchTerm, first: $first, page: $page) {{
+                paginatorInfo {{ currentPage hasMorePages lastPage }}
+                data {{ {_selection(fields)} }}
+            }}
+        }}
         """
-        query {{
-            podcasts(searchTerm: "{name}", first: {max_episodes_per_request}, page: {current_page}) {{
-                paginatorInfo {{
-                    currentPage,
-                    hasMorePages,
-                    lastPage,
-                }},
-                data {{
-                    id,
-                    title,
-                    description,
-                    language,
-                    htmlDescription,
-                    webUrl,
+    ))
+
+
+@functools.lru_cache(maxsize=None)
+def _podcast_document(fields: tuple[str, ...]) -> DocumentNode:
+    return _batchable(gql(
+        f"""
+        query getPodcast($id: String!) {{
+            podcast(identifier: {{id: $id, type: PODCHASER}}) {{ {_selection(fields)} }}
+        }}
+        """
+    ))
+
+
+@functools.lru_cache(maxsize=None)
+def _episodes_document(fields: tuple[str, ...], search: bool, aired_since: bool,
+                       aired_before: bool = False) -> DocumentNode:
+    variables = ["$id: String!", "$first: Int!", "$page: Int!"]
+    arguments = ["sort: {sortBy: AIR_DATE, direction: DESCENDING}", "first: $first", "page: $page"]
+    if search:
+        variables.append("$searchTerm: String!")
+        arguments.append("searchTerm: $searchTerm")
+    air_date = []
+    if aired_since:
+        variables.append("$airedSince: String!")
+        air_date.append("from: $airedSince")
+    if aired_before:
+        variables.append("$airedBefore: String!")
+        air_date.append("to: $airedBefore")
+    if air_date:
+        arguments.append(f"filters: {{airDate: {{{', '.join(air_date)}}}}}")
+    return _batchable(gql(
+        f"""
+        query getPodList({", ".join(variables)}) {{
+            podcast(identifier: {{id: $id, type: PODCHASER}}) {{
+                episodes({", ".join(arguments)}) {{
+                    paginatorInfo {{ currentPage hasMorePages lastPage total }}
+                    data {{ {_selection(fields)} }}
                 }}
             }}
         }}
-        """.format(
-            name=name,
-            max_episodes_per_request=max_episodes_per_request,
-            current_page=current_page,
+        """
+    ))
+
+
+def search_podcasts_document(fields: Iterable[str] = PODCAST_FIELDS) -> DocumentNode:
+    """Parsed podcast search query selecting `fields`. Variables: searchTerm, first, page."""
+    return _search_podcasts_document(tuple(fields))
+
+
+def podcast_document(fields: Iterable[str] = PODCAST_FIELDS) -> DocumentNode:
+    """Parsed single-podcast query selecting `fields`. Variables: id."""
+    return _podcast_document(tuple(fields))
+
+
+def episodes_document(fields: Iterable[str] = EPISODE_FIELDS, search: bool = False,
+                      aired_since: bool = False, aired_before: bool = False) -> DocumentNode:
+    """
+    Parsed episode listing query selecting `fields`, newest first.
+
+    Variables: id, first, page, plus searchTerm, airedSince and airedBefore
+    when enabled. Documents are parsed once per combination and reused.
+    """
+    return _episodes_document(tuple(fields), search, aired_since, aired_before)
+
+
+SEARCH_PODCASTS_QUERY = search_podcasts_document()
+PODCAST_QUERY = podcast_document()
+EPISODES_QUERY = episodes_document()
+
+
+def _search_podcasts_variables(name: str, max_results: int) -> dict:
+    if max_results > 100:
+        raise ValueError(
+            f"A maximum of 100 results is supported, but {max_results} results were requested."
         )
-    )
+    return {"searchTerm": name, "first": max_results, "page": 0}
+
+
+def _episodes_variables(podcast_id, page_size: int, page: int, search_term: Optional[str],
+                        aired_since: Optional[str], aired_before: Optional[str] = None) -> dict:
+    variables = {"id": str(podcast_id), "first": page_size, "page": page}
+    if search_term:
+        variables["searchTerm"] = search_term
+    if aired_since:
+        variables["airedSince"] = aired_since
+    if aired_before:
+        variables["airedBefore"] = aired_before
+    return variables
+
+
+def search_podcast_name(gql, client, name, max_results=5, fields: Iterable[str] = PODCAST_FIELDS) -> list[dict]:
+    """
+    Search for a podcast by name/title. eg. 'Joe Rogan Experience' or 'Serial'.
+
+    This method does not paginate queries because 100s of search results is not
+    useful in this application. The `gql` argument is no longer used; queries
+    are parsed once at import.
+    """
     logger.info(f"Querying Podchaser for podcasts matching query '{name}'.")
-    result = client.execute(search_podcast_name_query)
+    result = client.execute(
+        search_podcasts_document(fields), variable_values=_search_podcasts_variables(name, max_results)
+    )
     podcasts_in_page = result["podcasts"]["data"]
     return podcasts_in_page
 
 
-def fetch_episodes_data(gql, client, podcast_id, max_episodes=100, debug_urls=False) -> list[dict]:
+def _episode_page_size(max_episodes: Optional[int]) -> int:
+    if max_episodes is None:
+        return MAX_EPISODES_PER_PAGE
+    return max(1, min(MAX_EPISODES_PER_PAGE, max_episodes + EPISODE_PAGE_HEADROOM))
+
+
+def _next_pages(episodes_page: dict, page_size: int, next_page: int, remaining: Optional[int]) -> list[int]:
     """
-    Use the Podchaser API to grab a podcast's episodes.
+    Page numbers to request next, sized to what is still needed.
+
+    Assumes every remaining episode will be wanted; if some are not, the
+    caller simply asks again.
     """
-    max_episodes_per_request = 100  # Max allowed by API
+    total = episodes_page["paginatorInfo"]["total"]
+    page_count = math.ceil(total / page_size) if total is not None else next_page + 1
+    if not episodes_page["paginatorInfo"]["hasMorePages"] or next_page >= page_count:
+        return []
+    wanted = EPISODE_PAGE_CONCURRENCY if remaining is None else math.ceil(remaining / page_size)
+    batch = max(1, min(wanted, EPISODE_PAGE_CONCURRENCY, page_count - next_page))
+    return list(range(next_page, next_page + batch))
+
+
+def episode_matches(episode: dict, episode_filter: Optional[str] = None) -> bool:
+    """Whether an episode's title contains `episode_filter` (case-insensitive)."""
+    return not episode_filter or episode_filter.lower() in (episode.get("title") or "").lower()
+
+
+def _wanted_episodes(episodes: list[dict], episode_filter: Optional[str], require_audio: bool) -> Iterator[dict]:
+    for episode in episodes:
+        if not episode_matches(episode, episode_filter):
+            continue
+        if require_audio and not episode.get("audioUrl"):
+            logger.warning(f"⚠️  Episode '{episode.get('title', 'Unknown')}' has no audio URL, skipping")
+            continue
+        yield episode
+
+
+class _EpisodeCursor(NamedTuple):
+    """How far a listing of a podcast's episodes has got, see `_read_pages`."""
+    page_size: int
+    # Page numbers to request next; empty once the listing is done.
+    pages: tuple[int, ...]
+    yielded: int
+    max_episodes: Optional[int]
+    episode_filter: Optional[str]
+    # Without server-side search, how many episodes match is unknown.
+    scanning: bool
+    require_audio: bool
+
+
+def _episode_cursor(max_episodes: Optional[int], episode_filter: Optional[str], search_term: Optional[str],
+                    require_audio: bool) -> _EpisodeCursor:
+    scanning = bool(episode_filter) and not search_term
+    # A scan can't size pages to what is still needed, so it uses full pages.
+    page_size = MAX_EPISODES_PER_PAGE if scanning else _episode_page_size(max_episodes)
+    return _EpisodeCursor(page_size, (0,), 0, max_episodes, episode_filter, scanning, require_audio)
+
+
+def _read_pages(cursor: _EpisodeCursor, pages: list[dict]) -> tuple[list[dict], _EpisodeCursor]:
+    """The wanted episodes of the pages fetched for `cursor.pages`, and the cursor for the next ones."""
     episodes = []
-    has_more_pages = True
-    current_page = 0
-    while has_more_pages:
-        list_episodes_query = gql(
-            """
-            query getPodList {{
-                podcast(identifier: {{id: "{id}", type: PODCHASER}}) {{
-                    episodes(first: {max_episodes_per_request}, page: {current_page}) {{
-                        paginatorInfo {{
-                          count
-                          currentPage
-                          firstItem
-                          hasMorePages
-                          lastItem
-                          lastPage
-                          perPage
-                          total
-                        }}
-                        data {{
-                          id
-                          title
-                          airDate
-                          audioUrl
-                          description
-                          htmlDescription
-                          guid
-                          url
-                        }}
-                    }}
-                }}
-            }}
-        """.format(
-                id=podcast_id,
-                max_episodes_per_request=max_episodes_per_request,
-                current_page=current_page,
-            )
+    for episodes_page in pages:
+        for episode in _wanted_episodes(episodes_page["data"], cursor.episode_filter, cursor.require_audio):
+            episodes.append(episode)
+            if cursor.max_episodes is not None and cursor.yielded + len(episodes) >= cursor.max_episodes:
+                return episodes, cursor._replace(pages=(), yielded=cursor.yielded + len(episodes))
+    yielded = cursor.yielded + len(episodes)
+    remaining = None if cursor.scanning or cursor.max_episodes is None else cursor.max_episodes - yielded
+    next_pages = _next_pages(pages[-1], cursor.page_size, cursor.pages[-1] + 1, remaining)
+    return episodes, cursor._replace(pages=tuple(next_pages), yielded=yielded)
+
+
+def _iter_episodes(client, podcast_id, max_episodes: Optional[int], episode_filter: Optional[str],
+                   search_term: Optional[str], require_audio: bool,
+                   aired_since: Optional[str] = None, fields: Iterable[str] = EPISODE_FIELDS,
+                   aired_before: Optional[str] = None) -> Iterator[dict]:
+    cursor = _episode_cursor(max_episodes, episode_filter, search_term, require_audio)
+    document = episodes_document(fields, search=bool(search_term), aired_since=bool(aired_since),
+                                 aired_before=bool(aired_before))
+
+    def fetch(page: int) -> dict:
+        logger.info(f"Fetching page {page} of up to {cursor.page_size} episodes from API.")
+        result = client.execute(
+            document,
+            variable_values=_episodes_variables(podcast_id, cursor.page_size, page, search_term, aired_since,
+                                                aired_before),
         )
+        return result["podcast"]["episodes"]
 
-        logger.info(f"Fetching {max_episodes_per_request} episodes from API.")
-        result = client.execute(list_episodes_query)
-        has_more_pages = result["podcast"]["episodes"]["paginatorInfo"]["hasMorePages"]
-        episodes_in_page = result["podcast"]["episodes"]["data"]
-        
-        if debug_urls:
-            print(f"\n🔍 RAW API RESPONSE (Page {current_page + 1}):")
-            print(f"Episodes in this page: {len(episodes_in_page)}")
-            for i, ep in enumerate(episodes_in_page[:3], 1):  # Show first 3
-                print(f"  Episode {i} Raw Data:")
-                print(f"    audioUrl: {ep.get('audioUrl', 'NONE')}")
-                print(f"    title: {ep.get('title', 'NONE')}")
-        
-        episodes.extend(episodes_in_page)
-        current_page += 1
-        if len(episodes) >= max_episodes:
-            break
+    with ThreadPoolExecutor(max_workers=EPISODE_PAGE_CONCURRENCY) as pool:
+        while cursor.pages:
+            episodes, cursor = _read_pages(cursor, list(pool.map(fetch, cursor.pages)))
+            yield from episodes
+
+
+def iter_episodes(client, podcast_id, max_episodes: Optional[int] = None,
+                  episode_filter: Optional[str] = None, require_audio: bool = True,
+                  aired_since: Optional[str] = None, fields: Iterable[str] = EPISODE_FIELDS,
+                  aired_before: Optional[str] = None) -> Iterator[dict]:
+    """
+    Lazily yield a podcast's episodes, newest first.
+
+    Podchaser sorts by air date and, when `episode_filter` is given, searches
+    for it server-side; titles are still checked locally. The first page is
+    sized to `max_episodes`, later pages are fetched a few at a time once the
+    total is known, and no more pages are requested after `max_episodes`
+    matching episodes have been yielded. With `require_audio`, episodes
+    without an audio URL are skipped. `aired_since` and `aired_before`
+    ('YYYY-MM-DD') limit the results to episodes aired from and up to those
+    dates, as Podchaser's air date filter does. `fields` selects the
+    episode fields to request; it must include those the filters rely on.
+    """
+    found = False
+    for episode in _iter_episodes(client, podcast_id, max_episodes, episode_filter, episode_filter, require_audio,
+                                  aired_since, fields, aired_before):
+        found = True
+        yield episode
+    if episode_filter and not found:
+        # Podchaser's search is word-based, so a title fragment can miss; fall back to a full scan.
+        logger.info(f"No server-side matches for '{episode_filter}', scanning all episodes.")
+        yield from _iter_episodes(client, podcast_id, max_episodes, episode_filter, None, require_audio,
+                                  aired_since, fields, aired_before)
+
+
+def fetch_episodes_data(gql, client, podcast_id, max_episodes=100, debug_urls=False) -> list[dict]:
+    """
+    Use the Podchaser API to grab a podcast's most recent episodes.
+    """
+    episodes = list(iter_episodes(client, podcast_id, max_episodes, require_audio=False))
+    if debug_urls:
+        print(f"\n🔍 Episodes fetched: {len(episodes)}")
+        for i, ep in enumerate(episodes[:3], 1):  # Show first 3
+            print(f"  Episode {i} Raw Data:")
+            print(f"    audioUrl: {ep.get('audioUrl', 'NONE')}")
+            print(f"    title: {ep.get('title', 'NONE')}")
     return episodes
 
 
-def fetch_podcast_data(gql, client, podcast_id) -> dict:
-    podcast_metadata_query = gql(
-        """
-        query {{
-            podcast(identifier: {{id: "{podcast_id}", type: PODCHASER}}) {{
-                id,
-                title,
-                description,
-                htmlDescription,
-                webUrl,
-            }}
-        }}
-        """.format(
-            podcast_id=podcast_id,
-        )
-    )
+def fetch_podcast_data(gql, client, podcast_id, fields: Iterable[str] = PODCAST_FIELDS) -> dict:
     logger.info(f"Querying Podchaser for podcast with ID {podcast_id}.")
-    result = client.execute(podcast_metadata_query)
+    result = client.execute(podcast_document(fields), variable_values={"id": str(podcast_id)})
     return result["podcast"]
 
 
 def fetch_podcast(gql, podcast_id: str) -> PodcastMetadata:
-    client = create_podchaser_client()
+    client = get_podchaser_client()
     data = fetch_podcast_data(gql=gql, client=client, podcast_id=podcast_id)
     return PodcastMetadata(
         id=data["id"],
@@ -272,13 +1073,16 @@ def fetch_podcast(gql, podcast_id: str) -> PodcastMetadata:
 
 def get_podcast_details(podcast_name: str) -> PodcastMetadata:
     """Get podcast details from the name of the podcast."""
-    client = create_podchaser_client()
+    client = get_podchaser_client()
     podcasts = search_podcast_name(gql=gql, client=client, name=podcast_name)
     if not podcasts:
         raise ValueError(f"No podcasts found for name: {podcast_name}")
     
     # Get the first podcast result and convert to PodcastMetadata
-    podcast_data = podcasts[0]
+    return _podcast_metadata_from_search(podcasts[0])
+
+
+def _podcast_metadata_from_search(podcast_data: dict) -> PodcastMetadata:
     return PodcastMetadata(
         id=podcast_data["id"],
         title=podcast_data["title"],
@@ -289,6 +1093,72 @@ def get_podcast_details(podcast_name: str) -> PodcastMetadata:
     )
 
 
+async def search_podcast_name_async(session, name, max_results=5,
+                                    fields: Iterable[str] = PODCAST_FIELDS) -> list[dict]:
+    """Async counterpart of `search_podcast_name`, run on a connected gql session."""
+    logger.info(f"Querying Podchaser for podcasts matching query '{name}'.")
+    result = await session.execute(
+        search_podcasts_document(fields), variable_values=_search_podcasts_variables(name, max_results)
+    )
+    return result["podcasts"]["data"]
+
+
+async def _iter_episodes_async(session, podcast_id, max_episodes: Optional[int], episode_filter: Optional[str],
+                               search_term: Optional[str], require_audio: bool,
+                               aired_since: Optional[str] = None,
+                               fields: Iterable[str] = EPISODE_FIELDS,
+                               aired_before: Optional[str] = None) -> AsyncIterator[dict]:
+    cursor = _episode_cursor(max_episodes, episode_filter, search_term, require_audio)
+    document = episodes_document(fields, search=bool(search_term), aired_since=bool(aired_since),
+                                 aired_before=bool(aired_before))
+
+    async def fetch(page: int) -> dict:
+        logger.info(f"Fetching page {page} of up to {cursor.page_size} episodes from API.")
+        result = await session.execute(
+            document,
+            variable_values=_episodes_variables(podcast_id, cursor.page_size, page, search_term, aired_since,
+                                                aired_before),
+        )
+        return result["podcast"]["episodes"]
+
+    while cursor.pages:
+        episodes, cursor = _read_pages(cursor, await asyncio.gather(*(fetch(page) for page in cursor.pages)))
+        for episode in episodes:
+            yield episode
+
+
+async def iter_episodes_async(session, podcast_id, max_episodes: Optional[int] = None,
+                              episode_filter: Optional[str] = None,
+                              require_audio: bool = True,
+                              aired_since: Optional[str] = None,
+                              fields: Iterable[str] = EPISODE_FIELDS,
+                              aired_before: Optional[str] = None) -> AsyncIterator[dict]:
+    """Async counterpart of `iter_episodes`, run on a connected gql session."""
+    found = False
+    async for episode in _iter_episodes_async(session, podcast_id, max_episodes, episode_filter,
+                                              episode_filter, require_audio, aired_since, fields, aired_before):
+        found = True
+        yield episode
+    if episode_filter and not found:
+        logger.info(f"No server-side matches for '{episode_filter}', scanning all episodes.")
+        async for episode in _iter_episodes_async(session, podcast_id, max_episodes, episode_filter,
+                                                  None, require_audio, aired_since, fields, aired_before):
+            yield episode
+
+
+async def fetch_episodes_data_async(session, podcast_id, max_episodes=100) -> list[dict]:
+    """Async counterpart of `fetch_episodes_data`, run on a connected gql session."""
+    return [episode async for episode in iter_episodes_async(session, podcast_id, max_episodes, require_audio=False)]
+
+
+async def get_podcast_details_async(session, podcast_name: str) -> PodcastMetadata:
+    """Async counterpart of `get_podcast_details`, run on a connected gql session."""
+    podcasts = await search_podcast_name_async(session, name=podcast_name)
+    if not podcasts:
+        raise ValueError(f"No podcasts found for name: {podcast_name}")
+    return _podcast_metadata_from_search(podcasts[0])
+
+
 def sizeof_fmt(num, suffix="B") -> str:
     for unit in ["", "Ki", "Mi", "Gi", "Ti", "Pi", "Ei", "Zi"]:
         if abs(num) < 1024.0:
@@ -299,7 +1169,12 @@ def sizeof_fmt(num, suffix="B") -> str:
 
 def store_original_audio(
     url: str, destination: pathlib.Path, overwrite: bool = False
-) -> None:
+) -> Optional[DownloadResult]:
+    """
+    Download an episode's audio to `destination`, eg. `raw_audio_path(guid_hash)`.
+
+    Returns None when the file already exists and `overwrite` is not set.
+    """
     if destination.exists():
         if overwrite:
             logger.info(
@@ -307,14 +1182,22 @@ def store_original_audio(
             )
         else:
             logger.info(f"Audio file exists at {destination}, skipping download.")
-            return
+            return None
+
+    next_report = 0
+
+    def report(downloaded: int, total: Optional[int]) -> None:
+        nonlocal next_report
+        if downloaded >= next_report:
+            of_total = f" of {sizeof_fmt(total)}" if total else ""
+            logger.info(f"Downloaded {sizeof_fmt(downloaded)}{of_total}.")
+            next_report = downloaded + DOWNLOAD_PROGRESS_INTERVAL
 
-    podcast_download_result = download_podcast_file(url=url)
-    humanized_bytes_str = sizeof_fmt(num=len(podcast_download_result.data))
-    logger.info(f"Downloaded {humanized_bytes_str} episode from URL.")
-    with open(destination, "wb") as f:
-        f.write(podcast_download_result.data)
+    podcast_download_result = download_podcast_file(url=url, destination=destination, progress=report)
+    humanized_bytes_str = sizeof_fmt(num=podcast_download_result.size)
+    logger.info(f"Downloaded {humanized_bytes_str} episode from URL (sha256 {podcast_download_result.sha256}).")
     logger.info(f"Stored audio episode at {destination}.")
+    return podcast_download_result
 
 
 def coalesce_short_transcript_segments(
@@ -0,0 +1,280 @@
+"""
+Podcast discovery straight from a show's public RSS feed, without Podchaser.
+
+Feeds are parsed as they stream in, holding at most one `<item>` in memory,
+and parsing stops as soon as enough episodes have been found. The feed's
+ETag and Last-Modified headers are cached alongside the parsed episodes, so
+re-reading an unchanged feed costs a single 304 response.
+"""
+
+import dataclasses
+import email.utils
+import hashlib
+import json
+import functools
+import pathlib
+import re
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+from .config import LOCAL_CACHE_DIR, get_logger
+from .output_formats import atomic_open
+from .podcast_discovery import USER_AGENT, EpisodeMetadata, PodcastMetadata, episode_matches, get_guid_hash
+
+logger = get_logger(__name__)
+
+FEED_CACHE_DIR = LOCAL_CACHE_DIR / "feeds"
+FEED_TIMEOUT = 30
+# Apple Podcasts show pages are resolved to their RSS feed with the iTunes lookup API.
+APPLE_PODCASTS_HOST = "podcasts.apple.com"
+ITUNES_LOOKUP_URL = "https://itunes.apple.com/lookup?entity=podcast&id={}"
+# Podchaser show pages have no public feed link; the podcast's name finds them instead.
+PODCHASER_HOSTS = ("podchaser.com", "www.podchaser.com")
+
+_ITUNES = "{http://www.itunes.com/dtds/podcast-1.0.dtd}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+
+
+class NotAFeedError(ValueError):
+    """A podcast URL that doesn't lead to an RSS feed, eg. a show's web page."""
+
+
+def is_feed_url(podcast_name: str) -> bool:
+    """
+    Podcast names given as http(s) URLs are treated as RSS feeds.
+
+    Apple Podcasts show pages count too, see `resolve_feed_url`; other web
+    pages fail in `fetch_feed` with a `NotAFeedError`.
+    """
+    return podcast_name.startswith(("http://", "https://"))
+
+
+def _not_a_feed(url: str, reason: str) -> NotAFeedError:
+    host = urllib.parse.urlsplit(url).hostname or ""
+    if host in PODCHASER_HOSTS:
+        hint = "Podchaser pages aren't feeds; pass the podcast's name to search Podchaser instead."
+    else:
+        hint = "Pass the show's RSS feed URL, or its name to search Podchaser."
+    return NotAFeedError(f"{url} is not an RSS feed ({reason}). {hint}")
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_feed_url(url: str) -> str:
+    """The RSS feed behind `url`: Apple Podcasts show pages are looked up, anything else is returned as is."""
+    if urllib.parse.urlsplit(url).hostname != APPLE_PODCASTS_HOST:
+        return url
+    match = re.search(r"/id(\d+)", url)
+    if not match:
+        raise _not_a_feed(url, "no show id in the Apple Podcasts URL")
+    request = urllib.request.Request(ITUNES_LOOKUP_URL.format(match.group(1)), headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=FEED_TIMEOUT) as response:
+        results = json.load(response).get("results", [])
+    feed_url = next((result["feedUrl"] for result in results if result.get("feedUrl")), None)
+    if not feed_url:
+        raise _not_a_feed(url, "Apple Podcasts lists no feed for this show")
+    logger.info(f"🍎 Resolved Apple Podcasts page to feed {feed_url}")
+    return feed_url
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    return (element.text or "").strip() if element is not None else ""
+
+
+def _publish_date(pub_date: str) -> str:
+    """RFC 822 pubDate -> 'YYYY-MM-DD HH:MM:SS', the format Podchaser uses for airDate."""
+    try:
+        return email.utils.parsedate_to_datetime(pub_date).strftime("%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return ""
+
+
+def _duration(value: str) -> Optional[int]:
+    """itunes:duration, given as seconds, 'MM:SS' or 'HH:MM:SS'."""
+    try:
+        seconds = 0
+        for part in value.split(":"):
+            seconds = seconds * 60 + int(float(part))
+    except ValueError:
+        return None
+    return seconds or None
+
+
+def _episode_from_item(item: ET.Element, podcast: PodcastMetadata) -> Optional[EpisodeMetadata]:
+    enclosure = item.find("enclosure")
+    audio_url = enclosure.get("url", "") if enclosure is not None else ""
+    title = _text(item.find("title"))
+    if not audio_url:
+        logger.warning(f"⚠️  Episode '{title or 'Unknown'}' has no audio URL, skipping")
+        return None
+    guid = _text(item.find("guid")) or audio_url
+    description = _text(item.find("description")) or _text(item.find(f"{_ITUNES}summary"))
+    return EpisodeMetadata(
+        podcast_id=podcast.id,
+        podcast_title=podcast.title,
+        title=title,
+        publish_date=_publish_date(_text(item.find("pubDate"))),
+        description=description,
+        html_description=_text(item.find(f"{_CONTENT}encoded")) or description,
+        guid=guid,
+        guid_hash=get_guid_hash(guid),
+        episode_url=_text(item.find("link")) or None,
+        original_download_link=audio_url,
+        duration=_duration(_text(item.find(f"{_ITUNES}duration"))),
+    )
+
+
+def parse_feed(stream, feed_url: str, max_episodes: Optional[int] = None,
+               episode_filter: Optional[str] = None) -> tuple[PodcastMetadata, list[EpisodeMetadata], bool]:
+    """
+    Incrementally parse an RSS document from a binary file-like `stream`.
+
+    Returns the podcast, the episodes matching `episode_filter`, and whether
+    the whole feed was read. Reading stops before the first `<item>` after
+    `max_episodes` matching episodes were found.
+    """
+    channel_fields: dict[str, str] = {}
+    podcast: Optional[PodcastMetadata] = None
+    episodes: list[EpisodeMetadata] = []
+    matched = 0
+    channel: Optional[ET.Element] = None
+    depth = 0
+    complete = True
+
+    def current_podcast() -> PodcastMetadata:
+        description = channel_fields.get("description") or channel_fields.get(f"{_ITUNES}summary", "")
+        return PodcastMetadata(
+            id=feed_url,
+            title=channel_fields.get("title", feed_url),
+            description=description,
+            html_description=description,
+            web_url=channel_fields.get("link", feed_url),
+            language=channel_fields.get("language"),
+        )
+
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 1 and element.tag != "rss":
+                raise _not_a_feed(feed_url, f"the document is <{element.tag}>, not <rss>")
+            elif depth == 2 and element.tag == "channel":
+                channel = element
+            elif depth == 3 and element.tag == "item" and max_episodes is not None and matched >= max_episodes:
+                complete = False
+                break
+            continue
+
+        depth -= 1
+        if depth == 2 and element.tag != "item":
+            # Channel-level fields come before the items in practice, but are not required to.
+            channel_fields.setdefault(element.tag, _text(element))
+            podcast = None
+        elif depth == 2 and element.tag == "item":
+            podcast = podcast or current_podcast()
+            if episode_matches({"title": _text(element.find("title"))}, episode_filter):
+                episode = _episode_from_item(element, podcast)
+                if episode is not None:
+                    episodes.append(episode)
+                    matched += 1
+            # Drop the parsed item so memory stays flat however long the feed is.
+            if channel is not None:
+                channel.remove(element)
+
+    return current_podcast(), episodes, complete
+
+
+def _cache_path(feed_url: str) -> pathlib.Path:
+    return FEED_CACHE_DIR / f"{hashlib.sha256(feed_url.encode('utf-8')).hexdigest()[:32]}.json"
+
+
+def _load_cached_feed(feed_url: str) -> Optional[dict]:
+    try:
+        return json.loads(_cache_path(feed_url).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _store_feed(feed_url: str, headers, podcast: PodcastMetadata, episodes: list[EpisodeMetadata],
+                episode_filter: Optional[str], complete: bool) -> None:
+    FEED_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "url": feed_url,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "episode_filter": episode_filter,
+        "complete": complete,
+        "podcast": dataclasses.asdict(podcast),
+        "episodes": [dataclasses.asdict(episode) for episode in episodes],
+    }
+    with atomic_open(_cache_path(feed_url), "w") as f:
+        json.dump(entry, f, ensure_ascii=False)
+
+
+def _select(episodes: list[EpisodeMetadata], max_episodes: Optional[int],
+            episode_filter: Optional[str]) -> list[EpisodeMetadata]:
+    episodes = [episode for episode in episodes if episode_matches({"title": episode.title}, episode_filter)]
+    # Feeds are conventionally newest first, but sort in case this one is not.
+    episodes.sort(key=lambda episode: episode.publish_date, reverse=True)
+    return episodes[:max_episodes] if max_episodes is not None else episodes
+
+
+def fetch_feed(feed_url: str, max_episodes: Optional[int] = None,
+               episode_filter: Optional[str] = None) -> tuple[PodcastMetadata, list[EpisodeMetadata]]:
+    """
+    The podcast and its newest episodes (with audio) matching `episode_filter`.
+
+    Sends a conditional GET using the cached ETag/Last-Modified. On 304 the
+    cached episodes are reused. The cache only holds the episodes an earlier
+    call kept, so if those can't answer this request (a different filter, or
+    parsing stopped too early) the feed is downloaded again. Raises
+    `NotAFeedError` if `feed_url` turns out to be a web page or other non-RSS document.
+    """
+    feed_url = resolve_feed_url(feed_url)
+    cached = _load_cached_feed(feed_url)
+    usable = False
+    if cached is not None and cached.get("episode_filter") in (None, episode_filter):
+        cached_episodes = [EpisodeMetadata(**episode) for episode in cached["episodes"]]
+        usable = cached["complete"] or (
+            max_episodes is not None and len(_select(cached_episodes, None, episode_filter)) >= max_episodes
+        )
+    headers = {"User-Agent": USER_AGENT}
+    if usable:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    logger.info(f"📡 Fetching RSS feed {feed_url}")
+    try:
+        with urllib.request.urlopen(urllib.request.Request(feed_url, headers=headers), timeout=FEED_TIMEOUT) as response:
+            podcast, episodes, complete = parse_feed(response, feed_url, max_episodes, episode_filter)
+            response_headers = response.headers
+    except ET.ParseError as e:
+        raise _not_a_feed(feed_url, f"invalid XML: {e}") from e
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            raise
+        logger.info(f"✅ Feed unchanged since last fetch: {feed_url}")
+        return PodcastMetadata(**cached["podcast"]), _select(cached_episodes, max_episodes, episode_filter)
+
+    if episodes or complete:
+        # A metadata-only read (max_episodes=0) would just evict a useful entry.
+        _store_feed(feed_url, response_headers, podcast, episodes, episode_filter, complete)
+    return podcast, _select(episodes, max_episodes, episode_filter)
+
+
+def episode_to_dict(episode: EpisodeMetadata) -> dict:
+    """An episode in the Podchaser episode shape the pipelines work with."""
+    return {
+        "id": episode.guid_hash,
+        "title": episode.title,
+        "airDate": episode.publish_date or None,
+        "audioUrl": episode.original_download_link,
+        "description": episode.description,
+        "htmlDescription": episode.html_description,
+        "guid": episode.guid,
+        "url": episode.episode_url,
+        "length": episode.duration,
+    }
@@ -0,0 +1,164 @@
+"""
+Content-addressed local cache of transcription results.
+
+Results are stored as flat files named '{guid_hash}-{model_slug}-{language}.json',
+following the layout described for `config.TRANSCRIPTIONS_DIR`. An index file
+maps cache keys to file names so lookups never need to scan the directory; each
+new entry appends one line to it.
+"""
+
+import datetime
+import json
+import os
+import pathlib
+import threading
+from typing import Optional
+
+from .config import get_logger
+from .output_formats import chunks_text
+
+logger = get_logger(__name__)
+
+# One {"key": ..., "file": ...} line per stored entry.
+INDEX_FILENAME = "index.jsonl"
+
+
+def model_slug(model_id: str) -> str:
+    """Turn a model id like 'openai/whisper-large-v3' into a filename-safe slug."""
+    return model_id.split("/")[-1].replace(".", "-")
+
+
+def _write_json_atomic(path: pathlib.Path, data) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class CacheEntryWriter:
+    """
+    Write a cache entry one batch of `[start, end, text]` chunks at a time.
+
+    The entry only appears in the cache once `close` is called; its text is
+    rebuilt from the chunks when it is read.
+    """
+
+    def __init__(self, cache: "TranscriptionCache", key: str, entry: dict):
+        self._cache = cache
+        self._key = key
+        self.path = cache.cache_dir / f"{key}.json"
+        self._tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self._file.write(json.dumps(entry, ensure_ascii=False)[:-1] + ', "result": {"chunks": [')
+        self.chunk_count = 0
+
+    def append_chunks(self, chunks: list) -> None:
+        for chunk in chunks:
+            self._file.write(("," if self.chunk_count else "") + json.dumps(chunk, ensure_ascii=False))
+            self.chunk_count += 1
+        self._file.flush()
+
+    def close(self) -> pathlib.Path:
+        self._file.write("]}}")
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        self._cache._record(self._key, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class TranscriptionCache:
+    """Transcription results keyed by episode guid hash, model and language."""
+
+    def __init__(self, cache_dir: pathlib.Path):
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    @staticmethod
+    def key(guid_hash: str, model_id: str, language: Optional[str]) -> str:
+        return f"{guid_hash}-{model_slug(model_id)}-{language or 'auto'}"
+
+    def _load_index(self) -> dict[str, str]:
+        if self.index_path.exists():
+            index = {}
+            lines = 0
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    for line in f:
+                        record = json.loads(line)
+                        index[record["key"]] = record["file"]
+                        lines += 1
+            except (json.JSONDecodeError, KeyError, TypeError):
+                # eg. a line cut short by a crash while it was appended.
+                logger.warning(f"Cache index at {self.index_path} is corrupt, rebuilding.")
+            else:
+                if lines > 2 * len(index):
+                    # Mostly entries stored again, eg. with force_refresh.
+                    self._write_index(index)
+                return index
+        # Rebuild from the files on disk, eg. after the index was deleted.
+        index = {path.stem: path.name for path in self.cache_dir.glob("*.json")}
+        self._write_index(index)
+        return index
+
+    def _write_index(self, index: dict[str, str]) -> None:
+        tmp_path = self.index_path.with_name(f".{self.index_path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, filename in index.items():
+                f.write(json.dumps({"key": key, "file": filename}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+    def contains(self, guid_hash: str, model_id: str, language: Optional[str]) -> bool:
+        return self.key(guid_hash, model_id, language) in self._index
+
+    def get(self, guid_hash: str, model_id: str, language: Optional[str]) -> Optional[dict]:
+        """Return the cached transcription result, or None on a miss."""
+        filename = self._index.get(self.key(guid_hash, model_id, language))
+        if filename is None:
+            return None
+        try:
+            entry = json.loads((self.cache_dir / filename).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            logger.warning(f"Cache entry {filename} is missing or corrupt, ignoring it.")
+            return None
+        result = entry["result"]
+        if "text" not in result:
+            # Streamed entries are written chunk by chunk, without the joined text.
+            result["text"] = chunks_text(result.get("chunks", []))
+        return result
+
+    @staticmethod
+    def _entry(guid_hash: str, model_id: str, language: Optional[str]) -> dict:
+        return {
+            "guid_hash": guid_hash,
+            "model": model_id,
+            "language": language,
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+
+    def _record(self, key: str, path: pathlib.Path) -> None:
+        line = json.dumps({"key": key, "file": path.name}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._index[key] = path.name
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def put(self, guid_hash: str, model_id: str, language: Optional[str], result: dict) -> pathlib.Path:
+        """Store a transcription result and record it in the index."""
+        key = self.key(guid_hash, model_id, language)
+        path = self.cache_dir / f"{key}.json"
+        _write_json_atomic(path, {**self._entry(guid_hash, model_id, language), "result": result})
+        self._record(key, path)
+        return path
+
+    def open_entry(self, guid_hash: str, model_id: str, language: Optional[str]) -> CacheEntryWriter:
+        """Start an entry whose chunks are appended as they are transcribed, see `CacheEntryWriter`."""
+        return CacheEntryWriter(self, self.key(guid_hash, model_id, language),
+                                self._entry(guid_hash, model_id, language))
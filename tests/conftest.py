@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Keep everything the tests cache out of the user's real cache.
+# Set before the package is imported, since `config.LOCAL_CACHE_DIR` is read once.
+os.environ["PODCAST_TRANSCRIPTION_CACHE_DIR"] = tempfile.mkdtemp(prefix="podcast-transcription-tests-")
@@ -0,0 +1,125 @@
+import asyncio
+import datetime
+import math
+
+from graphql import value_from_ast_untyped
+
+from podcast_transcription.episode_catalog import EpisodeCatalog
+
+PODCAST_ID = "123"
+
+
+def _episodes_arguments(node, variables: dict) -> dict:
+    """Arguments of the query's `episodes` field, whether inline or passed as variables."""
+    for selection in node.selection_set.selections:
+        if selection.name.value == "episodes":
+            return {argument.name.value: value_from_ast_untyped(argument.value, variables)
+                    for argument in selection.arguments}
+        if selection.selection_set is not None:
+            arguments = _episodes_arguments(selection, variables)
+            if arguments is not None:
+                return arguments
+    return None
+
+
+class FakePodchaser:
+    """Answers episode listing queries like Podchaser, from a fixed back catalog."""
+
+    def __init__(self, count: int = 250):
+        newest = datetime.date(2024, 12, 31)
+        self.episodes = [
+            {
+                "id": str(i),
+                "guid": f"guid-{i}",
+                "title": f"Episode {count - i}" + (" interview" if i % 10 == 0 else ""),
+                "airDate": f"{newest - datetime.timedelta(days=i)} 10:00:00",
+                "audioUrl": None if i % 7 == 3 else f"https://cdn.example.com/{i}.mp3",
+            }
+            for i in range(count)
+        ]
+        self.requests = []
+
+    def execute(self, document, variable_values=None):
+        arguments = _episodes_arguments(document.definitions[0], variable_values or {})
+        self.requests.append(arguments)
+        air_date = (arguments.get("filters") or {}).get("airDate") or {}
+        episodes = [
+            episode for episode in self.episodes
+            if air_date.get("from", "") <= episode["airDate"][:10] <= air_date.get("to", "9999")
+        ]
+        first, page = arguments["first"], arguments["page"]
+        return {"podcast": {"episodes": {
+            "paginatorInfo": {"currentPage": page, "hasMorePages": (page + 1) * first < len(episodes),
+                              "lastPage": max(math.ceil(len(episodes) / first) - 1, 0), "total": len(episodes)},
+            "data": episodes[page * first:(page + 1) * first],
+        }}}
+
+
+class FakeSession:
+    """The async gql session counterpart of `FakePodchaser`."""
+
+    def __init__(self, client: FakePodchaser):
+        self.client = client
+
+    async def execute(self, document, variable_values=None):
+        return self.client.execute(document, variable_values)
+
+
+def test_first_sync_stops_at_max_episodes(tmp_path):
+    client = FakePodchaser()
+    catalog = EpisodeCatalog(tmp_path / "episodes.sqlite3")
+    catalog.sync(client, PODCAST_ID, max_episodes=1)
+
+    assert len(client.requests) == 1
+    assert [episode["id"] for episode in catalog.episodes(PODCAST_ID, 1)] == ["0"]
+
+
+def test_older_episodes_are_backfilled_when_needed(tmp_path):
+    client = FakePodchaser()
+    catalog = EpisodeCatalog(tmp_path / "episodes.sqlite3")
+    catalog.sync(client, PODCAST_ID, max_episodes=2)
+    catalog.sync(client, PODCAST_ID, max_episodes=2)
+    assert len(client.requests) == 2
+
+    catalog.sync(client, PODCAST_ID, max_episodes=150)
+    wanted = [episode for episode in client.episodes if episode["audioUrl"]][:150]
+    assert catalog.episodes(PODCAST_ID, 150) == wanted
+
+    # Every tenth episode is an interview; reaching 21 of them with audio needs the oldest ones.
+    catalog.sync(client, PODCAST_ID, max_episodes=21, episode_filter="INTERVIEW")
+    interviews = [str(i) for i in range(0, 250, 10) if i % 7 != 3]
+    assert [episode["id"] for episode in catalog.episodes(PODCAST_ID, 21, "interview")] == interviews
+
+
+def test_sync_without_limit_stores_everything(tmp_path):
+    client = FakePodchaser()
+    catalog = EpisodeCatalog(tmp_path / "episodes.sqlite3")
+    catalog.sync(client, PODCAST_ID, max_episodes=5)
+    catalog.sync(client, PODCAST_ID)
+
+    assert len(catalog.episodes(PODCAST_ID, require_audio=False)) == len(client.episodes)
+    requests = len(client.requests)
+    catalog.sync(client, PODCAST_ID, max_episodes=len(client.episodes))
+    # The back catalog is complete, so only new episodes are asked for.
+    assert len(client.requests) == requests + 1
+
+
+def test_new_episodes_are_added_on_top(tmp_path):
+    client = FakePodchaser()
+    catalog = EpisodeCatalog(tmp_path / "episodes.sqlite3")
+    catalog.sync(client, PODCAST_ID, max_episodes=3)
+    client.episodes.insert(0, {"id": "new", "guid": "guid-new", "title": "Brand new",
+                               "airDate": "2025-01-01 10:00:00", "audioUrl": "https://cdn.example.com/new.mp3"})
+
+    assert catalog.sync(client, PODCAST_ID, max_episodes=3) == 1
+    assert client.requests[-1]["filters"] == {"airDate": {"from": "2024-12-31"}}
+    assert [episode["id"] for episode in catalog.episodes(PODCAST_ID, 3)] == ["new", "0", "1"]
+
+
+def test_sync_async_stops_at_max_episodes(tmp_path):
+    client = FakePodchaser()
+    catalog = EpisodeCatalog(tmp_path / "episodes.sqlite3")
+    asyncio.run(catalog.sync_async(FakeSession(client), PODCAST_ID, max_episodes=1))
+    asyncio.run(catalog.sync_async(FakeSession(client), PODCAST_ID, max_episodes=120))
+
+    assert len(catalog.episodes(PODCAST_ID, 120)) == 120
@@ -0,0 +1,63 @@
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from podcast_transcription.local_backend import TEST_MODEL_NAME, LocalModel
+from podcast_transcription.modal_client import SAMPLE_RATE, whisper_model_id
+from podcast_transcription.output_formats import read_transcription
+from podcast_transcription.pipeline import PodcastTranscriptionPipeline
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+
+CLIP_SECONDS = 45
+
+
+@pytest.fixture(scope="module")
+def clip(tmp_path_factory):
+    """A 45 s mono WAV: a tone with some noise, long enough for two windows."""
+    t = np.arange(CLIP_SECONDS * SAMPLE_RATE) / SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(len(t))
+    path = tmp_path_factory.mktemp("audio") / "clip.wav"
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((audio * 32767).astype("<i2").tobytes())
+    return path
+
+
+def test_local_model_transcribes_offline(clip):
+    with LocalModel(TEST_MODEL_NAME, workers=1) as model:
+        result = model.transcribe(str(clip), language="en")
+
+    assert result is not None
+    assert result["chunks"]
+    previous_end = 0.0
+    for start, end, text in result["chunks"]:
+        assert isinstance(text, str)
+        assert previous_end <= start <= end
+        previous_end = end
+
+
+def test_pipeline_runs_test_model_on_local_backend(clip, tmp_path):
+    pipeline = PodcastTranscriptionPipeline(output_dir=str(tmp_path), output_format="jsonl",
+                                            model=TEST_MODEL_NAME, backend="local")
+    episode = {"id": "clip", "title": "Clip", "airDate": "2024-01-01 00:00:00",
+               "audioUrl": str(clip), "guid": "clip-guid"}
+    try:
+        transcription_data = pipeline.transcribe_episode(episode)
+    finally:
+        pipeline.local_model(TEST_MODEL_NAME).close()
+
+    assert transcription_data is not None
+    assert transcription_data["model"] == whisper_model_id(TEST_MODEL_NAME)
+    assert pipeline.is_cached(episode)
+    saved = read_transcription(pipeline.save_transcription(transcription_data, "Local Show"))
+    assert saved["transcription_chunks"] == transcription_data["transcription"]["chunks"]
+
@@ -0,0 +1,17 @@
+import threading
+
+from podcast_transcription.modal_client import iter_locked
+
+
+def test_iter_locked_holds_the_lock_only_while_advancing():
+    lock = threading.Lock()
+
+    def windows():
+        for i in range(3):
+            assert lock.locked()
+            yield i
+
+    for window in iter_locked(lock, windows()):
+        assert not lock.locked()
+    assert window == 2
+    assert not lock.locked()
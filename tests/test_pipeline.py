@@ -0,0 +1,37 @@
+import pytest
+
+from podcast_transcription.config import select_model
+from podcast_transcription.local_backend import DEFAULT_LOCAL_MODEL_NAME, TEST_MODEL_NAME
+from podcast_transcription.pipeline import PodcastTranscriptionPipeline
+
+
+def test_auto_model_uses_stated_length(tmp_path):
+    pipeline = PodcastTranscriptionPipeline(output_dir=str(tmp_path), model="auto")
+    # No audioUrl: sizing the file would fail, so the stated length must be used.
+    assert pipeline.model_for({"title": "Short", "guid": "short", "length": 60}) == "large-v3"
+    assert pipeline.model_for({"title": "Long", "guid": "long", "length": 3 * 3600}) != "large-v3"
+
+
+def test_model_defaults_per_backend(tmp_path):
+    assert PodcastTranscriptionPipeline(output_dir=str(tmp_path)).model == "large-v3"
+    local = PodcastTranscriptionPipeline(output_dir=str(tmp_path), backend="local")
+    assert local.model == DEFAULT_LOCAL_MODEL_NAME
+
+
+def test_test_model_is_local_only(tmp_path):
+    local = PodcastTranscriptionPipeline(output_dir=str(tmp_path), backend="local", model=TEST_MODEL_NAME)
+    assert local.model == TEST_MODEL_NAME
+    with pytest.raises(ValueError, match=TEST_MODEL_NAME):
+        PodcastTranscriptionPipeline(output_dir=str(tmp_path), model=TEST_MODEL_NAME)
+
+
+def test_auto_model_warns_when_budget_cannot_be_met(caplog):
+    with caplog.at_level("WARNING"):
+        model = select_model(3 * 3600, latency_budget=60, language=None)
+    assert model.name in ("large", "large-v3")
+    assert "latency budget" in caplog.text
+
+
+def test_cache_dir_holds_episode_catalog(tmp_path):
+    pipeline = PodcastTranscriptionPipeline(output_dir=str(tmp_path / "out"), cache_dir=str(tmp_path / "cache"))
+    assert pipeline.catalog.path == tmp_path / "cache" / "episodes.sqlite3"
@@ -0,0 +1,38 @@
+from podcast_transcription.podcast_discovery import _episode_cursor, _read_pages
+
+
+def _page(first: int, count: int, total: int, size: int) -> dict:
+    episodes = [{"id": str(i), "title": f"Episode {i}", "audioUrl": f"https://cdn.example.com/{i}.mp3"}
+                for i in range(first, min(first + count, total))]
+    return {"paginatorInfo": {"hasMorePages": first + size < total, "total": total}, "data": episodes}
+
+
+def test_cursor_stops_at_max_episodes_within_a_page():
+    cursor = _episode_cursor(max_episodes=3, episode_filter=None, search_term=None, require_audio=True)
+    assert cursor.pages == (0,)
+
+    episodes, cursor = _read_pages(cursor, [_page(0, cursor.page_size, 500, cursor.page_size)])
+    assert [episode["id"] for episode in episodes] == ["0", "1", "2"]
+    assert cursor.pages == ()
+
+
+def test_cursor_requests_what_is_still_needed():
+    cursor = _episode_cursor(max_episodes=250, episode_filter=None, search_term=None, require_audio=True)
+    episodes, cursor = _read_pages(cursor, [_page(0, 100, 500, 100)])
+    assert len(episodes) == 100
+    assert cursor.pages == (1, 2)
+
+    episodes, cursor = _read_pages(cursor, [_page(100, 100, 500, 100), _page(200, 100, 500, 100)])
+    assert len(episodes) == 150
+    assert cursor.pages == ()
+
+
+def test_scanning_cursor_uses_full_pages_until_the_last():
+    cursor = _episode_cursor(max_episodes=5, episode_filter="nothing", search_term=None, require_audio=True)
+    assert cursor.page_size == 100
+
+    episodes, cursor = _read_pages(cursor, [_page(0, 100, 150, 100)])
+    assert episodes == []
+    assert cursor.pages == (1,)
+    episodes, cursor = _read_pages(cursor, [_page(100, 100, 150, 100)])
+    assert cursor.pages == ()
@@ -0,0 +1,139 @@
+import http.server
+import io
+import shutil
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+from podcast_transcription.modal_client import SAMPLE_RATE
+from podcast_transcription.rss_discovery import NotAFeedError, fetch_feed, resolve_feed_url
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+  <channel>
+    <title>Fixture Show</title>
+    <link>http://example.com/</link>
+    <description>A feed served from localhost.</description>
+    <item>
+      <title>Good Two</title>
+      <guid>good-2</guid>
+      <pubDate>Tue, 02 Jan 2024 00:00:00 +0000</pubDate>
+      <itunes:duration>00:05</itunes:duration>
+      <enclosure url="{base}/audio/good-2.wav" type="audio/wav" length="0"/>
+    </item>
+    <item>
+      <title>Gone</title>
+      <guid>gone</guid>
+      <pubDate>Mon, 01 Jan 2024 12:00:00 +0000</pubDate>
+      <enclosure url="{base}/audio/gone.wav" type="audio/wav" length="0"/>
+    </item>
+    <item>
+      <title>No Audio</title>
+      <guid>no-audio</guid>
+      <pubDate>Mon, 01 Jan 2024 06:00:00 +0000</pubDate>
+    </item>
+    <item>
+      <title>Good One</title>
+      <guid>good-1</guid>
+      <pubDate>Mon, 01 Jan 2024 00:00:00 +0000</pubDate>
+      <itunes:duration>5</itunes:duration>
+      <enclosure url="{base}/audio/good-1.wav" type="audio/wav" length="0"/>
+    </item>
+  </channel>
+</rss>
+"""
+
+SHOW_PAGE = "<!DOCTYPE html><html><head><title>Fixture Show</title></head><body><p>Listen now</p></body></html>"
+
+
+def _wav_bytes(seconds: int = 5) -> bytes:
+    t = np.arange(seconds * SAMPLE_RATE) / SAMPLE_RATE
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((audio * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="module")
+def feed_server():
+    """Base URL of a localhost server with a fixture feed, a show page and its audio."""
+    audio = _wav_bytes()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            base = f"http://{self.headers['Host']}"
+            routes = {
+                "/feed.xml": ("application/rss+xml", FEED.format(base=base).encode("utf-8")),
+                "/show": ("text/html", SHOW_PAGE.encode("utf-8")),
+                "/audio/good-1.wav": ("audio/wav", audio),
+                "/audio/good-2.wav": ("audio/wav", audio),
+            }
+            if self.path not in routes:
+                self.send_error(404)
+                return
+            content_type, body = routes[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_feed_keeps_items_with_enclosures(feed_server):
+    podcast, episodes = fetch_feed(f"{feed_server}/feed.xml")
+
+    assert podcast.title == "Fixture Show"
+    assert podcast.id == f"{feed_server}/feed.xml"
+    # The item without an enclosure is skipped; a broken enclosure is only found when downloading.
+    assert [episode.title for episode in episodes] == ["Good Two", "Gone", "Good One"]
+    assert [episode.duration for episode in episodes] == [5, None, 5]
+
+
+def test_fetch_feed_stops_at_max_episodes(feed_server):
+    _, episodes = fetch_feed(f"{feed_server}/feed.xml", max_episodes=1)
+    assert [episode.title for episode in episodes] == ["Good Two"]
+
+
+def test_web_page_is_not_a_feed(feed_server):
+    with pytest.raises(NotAFeedError, match="is not an RSS feed"):
+        fetch_feed(f"{feed_server}/show")
+
+
+def test_only_apple_pages_are_resolved(feed_server):
+    assert resolve_feed_url(f"{feed_server}/feed.xml") == f"{feed_server}/feed.xml"
+    with pytest.raises(NotAFeedError, match="no show id"):
+        resolve_feed_url("https://podcasts.apple.com/us/podcast/some-show")
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_pipeline_transcribes_feed_and_skips_broken_episode(feed_server, tmp_path):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from podcast_transcription.local_backend import TEST_MODEL_NAME
+    from podcast_transcription.pipeline import PodcastTranscriptionPipeline
+
+    pipeline = PodcastTranscriptionPipeline(output_dir=str(tmp_path), output_format="jsonl",
+                                            model=TEST_MODEL_NAME, backend="local")
+    try:
+        saved = pipeline.process_podcast(f"{feed_server}/feed.xml", max_episodes=5)
+    finally:
+        pipeline.local_model(TEST_MODEL_NAME).close()
+
+    assert len(saved) == 2
+    assert all(path.exists() for path in saved)
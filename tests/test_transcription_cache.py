@@ -0,0 +1,61 @@
+from podcast_transcription.transcription_cache import TranscriptionCache
+
+MODEL_ID = "openai/whisper-large-v3"
+
+
+def test_put_and_get(tmp_path):
+    cache = TranscriptionCache(tmp_path)
+    result = {"text": "hello world", "chunks": [[0.0, 1.0, " hello world"]]}
+    cache.put("abc", MODEL_ID, "en", result)
+
+    assert cache.contains("abc", MODEL_ID, "en")
+    assert not cache.contains("abc", MODEL_ID, "de")
+    assert TranscriptionCache(tmp_path).get("abc", MODEL_ID, "en") == result
+
+
+def test_streamed_entry_appears_on_close(tmp_path):
+    cache = TranscriptionCache(tmp_path)
+    writer = cache.open_entry("abc", MODEL_ID, "en")
+    writer.append_chunks([[0.0, 1.0, " hello"]])
+    writer.append_chunks([[1.0, 2.0, " world"], [2.0, 3.0, " \"again\""]])
+    assert not cache.contains("abc", MODEL_ID, "en")
+    writer.close()
+
+    assert TranscriptionCache(tmp_path).get("abc", MODEL_ID, "en") == {
+        "chunks": [[0.0, 1.0, " hello"], [1.0, 2.0, " world"], [2.0, 3.0, " \"again\""]],
+        "text": "hello world \"again\"",
+    }
+
+
+def test_aborted_entry_leaves_nothing_behind(tmp_path):
+    cache = TranscriptionCache(tmp_path)
+    writer = cache.open_entry("abc", MODEL_ID, "en")
+    writer.append_chunks([[0.0, 1.0, " partial"]])
+    writer.abort()
+
+    assert not cache.contains("abc", MODEL_ID, "en")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["index.jsonl"]
+
+
+def test_put_appends_to_the_index(tmp_path):
+    cache = TranscriptionCache(tmp_path)
+    for i in range(3):
+        cache.put(f"guid{i}", MODEL_ID, "en", {"text": "hi", "chunks": []})
+    cache.put("guid0", MODEL_ID, "en", {"text": "again", "chunks": []})
+
+    assert len(cache.index_path.read_text(encoding="utf-8").splitlines()) == 4
+    reloaded = TranscriptionCache(tmp_path)
+    assert all(reloaded.contains(f"guid{i}", MODEL_ID, "en") for i in range(3))
+    assert reloaded.get("guid0", MODEL_ID, "en")["text"] == "again"
+
+
+def test_index_is_rebuilt_from_entries(tmp_path):
+    cache = TranscriptionCache(tmp_path)
+    cache.put("abc", MODEL_ID, "en", {"text": "hi", "chunks": []})
+    # A line cut short by a crash.
+    with open(cache.index_path, "a", encoding="utf-8") as f:
+        f.write('{"key": "tru')
+    assert TranscriptionCache(tmp_path).contains("abc", MODEL_ID, "en")
+
+    cache.index_path.unlink()
+    assert TranscriptionCache(tmp_path).contains("abc", MODEL_ID, "en")
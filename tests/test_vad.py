@@ -0,0 +1,22 @@
+import numpy as np
+
+from podcast_transcription.modal_client import SAMPLE_RATE, speech_regions
+
+
+def test_speech_between_silences_is_found():
+    rng = np.random.default_rng(0)
+    pcm = np.zeros(30 * SAMPLE_RATE, dtype=np.float16)
+    pcm[10 * SAMPLE_RATE:20 * SAMPLE_RATE] = (0.3 * rng.standard_normal(10 * SAMPLE_RATE)).astype(np.float16)
+    ((start, end),) = speech_regions(pcm)
+    assert 9 * SAMPLE_RATE < start <= 10 * SAMPLE_RATE
+    assert 20 * SAMPLE_RATE <= end < 21 * SAMPLE_RATE
+
+
+def test_constant_level_audio_is_kept_whole():
+    rng = np.random.default_rng(0)
+    pcm = (0.3 * rng.standard_normal(30 * SAMPLE_RATE)).astype(np.float16)
+    assert speech_regions(pcm) == [(0, len(pcm))]
+
+
+def test_silence_has_no_speech():
+    assert speech_regions(np.zeros(30 * SAMPLE_RATE, dtype=np.float16)) == []